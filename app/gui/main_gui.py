@@ -3,19 +3,16 @@ import json
 import os
 import pathlib
 
-from PyQt6.QtCore import QThread
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QFileDialog, QDialog, QTextEdit, QComboBox, QSpinBox, QCheckBox, QPushButton, QLineEdit, QMessageBox
 )
 from PyQt6 import QtGui, QtCore
 
-from gui.process import ProcessWorker
+from gui.process import WarmProcessWorker
 from gui.ui_window import Ui_MainWindow
 from gui.mini_popup import Ui_dialog
 from gui.popup import Ui_Dialog
 
-import importlib.util
-
 # ---------- Helper for relative path ---------------------------------
 class ResourceHelper:
     @staticmethod
@@ -40,6 +37,7 @@ class ConfirmationPopup(QDialog, Ui_Dialog):
         self.confirm_callback = confirm_callback
 
         te: QTextEdit = self.findChild(QTextEdit, "textEdit_popup")
+        self.text_edit = te
         if te:
             te.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
             te.setFont(QtGui.QFont("Consolas", 10))
@@ -58,6 +56,11 @@ class ConfirmationPopup(QDialog, Ui_Dialog):
         self.btn_send.clicked.connect(self.send_data)
         self.btn_cancel.clicked.connect(self.reject)
 
+    # Append the dry-run summary below the inputs once the worker has computed it
+    def show_diff(self, text: str):
+        if self.text_edit:
+            self.text_edit.append("\n" + text)
+
     def send_data(self):
         self.confirm_callback()
         self.accept()
@@ -70,7 +73,7 @@ class MyApp(QMainWindow, Ui_MainWindow):
     else:
         base_path = os.path.dirname(__file__)
 
-    SCRIPT_MAIN = (pathlib.Path(base_path) / '../logic/main_logic.py').resolve().as_posix()
+    SCRIPT_WORKER = (pathlib.Path(base_path) / '../logic/worker.py').resolve().as_posix()
 
     def __init__(self): 
         super().__init__()
@@ -81,53 +84,82 @@ class MyApp(QMainWindow, Ui_MainWindow):
         self.pushButton_Performance.setCheckable(True)
         self.pushButton_3rdParty.setCheckable(True)
 
-        # Initialize the UI
-        self.stackedWidget.setCurrentWidget(self.page_1)
-        self.comboBox_week.addItems([f"W{i}" for i in range(6)])
-        self.textEdit_log.setReadOnly(True)
+        # Only page 1 is built up front; the others are built the first time they are shown
+        self.page_builders = {
+            "page_2": self.build_weekly_page,
+            "page_3": self.build_process_page,
+            "page_4": self.build_3rdparty_page,
+        }
 
-        # Connect buttons to their respective methods
-        self.btn_summary.clicked.connect(self.browse_summary_file)
-        self.btn_final.clicked.connect(self.browse_final_file)
-        self.pushButton_submit.clicked.connect(self.collect_and_confirm)
+        # Connect the sidebar buttons to their pages
         self.pushButton_Home.clicked.connect(lambda: self.switch_page(self.page_1, self.pushButton_Home))
         self.pushButton_Performance.clicked.connect(lambda: self.switch_page(self.page_2, self.pushButton_Performance))
         self.pushButton_3rdParty.clicked.connect(lambda: self.switch_page(self.page_4, self.pushButton_3rdParty))
-        self.pushButton_process.clicked.connect(self.run_main_program)
-        self.pushButton_end.clicked.connect(self.end_process)  # Connect "End" button
-
-        # 3rd Party Buttons
-        self.pushButton_Raw3rdParty.clicked.connect(self.browse_raw_file)
-        self.pushButton_Draft3rdParty.clicked.connect(self.browse_draft_file)
-        self.pushButton_Start3rdParty.clicked.connect(self.program_3rdParty)
-        self.lineEdit_Raw3rdParty.textChanged.connect(self.update_start_button_state)
-        self.lineEdit_Draft3rdParty.textChanged.connect(self.update_start_button_state)
 
         self.summary_file = ""
         self.final_file = ""
         self.output_data = {}
+        # Detected month blocks beyond the six spinbox rows (month 7, 8, ...)
+        self.extra_months = {}
+
+        # Long-lived logic process, so its imports are done before the first run. Started
+        # from the event loop, once the window is up, so it does not compete with the first paint
+        self.worker = WarmProcessWorker(self.SCRIPT_WORKER, self)
+        self.worker.log.connect(self.append_log)
+        self.worker.error.connect(self.append_error)
+        self.worker.finished.connect(self.on_finished)
+        self.worker.blocks.connect(self.prefill_month_blocks)
+        QtCore.QTimer.singleShot(0, self.worker.start)
 
-        # Threading for process
-        self.thread: QThread | None = None
-        self.worker: ProcessWorker | None = None
+        # Ensure the Home button is checked and the corresponding page is active
+        self.switch_page(self.page_1, self.pushButton_Home)
+
+    # Build a page (widgets and connections) unless it has been built already
+    def ensure_page(self, page):
+        builder = self.page_builders.pop(page.objectName(), None)
+        if builder:
+            builder()
+
+    # Page 2: weekly report inputs
+    def build_weekly_page(self):
+        self.setupPage2()
+        self.comboBox_week.addItems([f"W{i}" for i in range(6)])
+
+        self.btn_summary.clicked.connect(self.browse_summary_file)
+        self.btn_final.clicked.connect(self.browse_final_file)
+        self.pushButton_submit.clicked.connect(self.collect_and_confirm)
 
         # Connect checkbox to SpinBox for month 4
         self.checkBox_enableMonth4.toggled.connect(self.toggle_month4_spinboxes)
         self.toggle_month4_spinboxes()
 
-        # Connect checkbox to SpinBox for month 4
+        # Connect checkbox to SpinBox for month 5
         self.checkBox_enableMonth5.toggled.connect(self.toggle_month5_spinboxes)
         self.toggle_month5_spinboxes()
 
-        # Connect checkbox to SpinBox for month 4
+        # Connect checkbox to SpinBox for month 6
         self.checkBox_enableMonth6.toggled.connect(self.toggle_month6_spinboxes)
         self.toggle_month6_spinboxes()
 
-        # Ensure the Home button is checked and the corresponding page is active
-        self.switch_page(self.page_1, self.pushButton_Home)
+    # Page 3: run and log
+    def build_process_page(self):
+        self.setupPage3()
+        self.textEdit_log.setReadOnly(True)
+        self.pushButton_process.clicked.connect(self.run_main_program)
+        self.pushButton_end.clicked.connect(self.end_process)  # Connect "End" button
+
+    # Page 4: 3rd party
+    def build_3rdparty_page(self):
+        self.setupPage4()
+        self.pushButton_Raw3rdParty.clicked.connect(self.browse_raw_file)
+        self.pushButton_Draft3rdParty.clicked.connect(self.browse_draft_file)
+        self.pushButton_Start3rdParty.clicked.connect(self.program_3rdParty)
+        self.lineEdit_Raw3rdParty.textChanged.connect(self.update_start_button_state)
+        self.lineEdit_Draft3rdParty.textChanged.connect(self.update_start_button_state)
 
     def switch_page(self, page, button):
-        # Set the current widget to the specified page
+        # Build the page on its first show, then set it as the current widget
+        self.ensure_page(page)
         self.stackedWidget.setCurrentWidget(page)
 
         # Set only the clicked button checked, disable others
@@ -167,6 +199,27 @@ class MyApp(QMainWindow, Ui_MainWindow):
         if path:
             self.summary_file = path
             self.lineEdit_summary.setText(path)
+            self.extra_months = {}
+            # Header rows and row counts are detected from the sheet and prefilled
+            self.worker.detect(path)
+
+    # Prefill header row / data count spinboxes with the detected month blocks
+    def prefill_month_blocks(self, blocks: list):
+        self.ensure_page(self.page_2)
+        for month in range(1, 7):
+            block = blocks[month - 1] if month <= len(blocks) else None
+            if month >= 4:
+                getattr(self, f"checkBox_enableMonth{month}").setChecked(block is not None)
+            if block is not None:
+                getattr(self, f"spinBox_headerMonth{month}").setValue(block["header"])
+                getattr(self, f"spinBox_dataCountMonth{month}").setValue(block["count"])
+        # Blocks past the sixth have no spinboxes; they are passed on to the run as detected
+        self.extra_months = {}
+        for month, block in enumerate(blocks[6:], start=7):
+            self.extra_months[f"header_month{month}"] = block["header"]
+            self.extra_months[f"data_count_month{month}"] = block["count"]
+        if self.extra_months:
+            self.append_log(f"{len(blocks)} month blocks detected; months 7-{len(blocks)} are taken as detected.")
 
     # Browse final output file
     def browse_final_file(self):
@@ -193,13 +246,25 @@ class MyApp(QMainWindow, Ui_MainWindow):
                 "data_count_month4": int(self.spinBox_dataCountMonth4.value()) if self.checkBox_enableMonth4.isChecked() else 0,
                 "data_count_month5": int(self.spinBox_dataCountMonth5.value()) if self.checkBox_enableMonth5.isChecked() else 0,
                 "data_count_month6": int(self.spinBox_dataCountMonth6.value()) if self.checkBox_enableMonth6.isChecked() else 0,
-                "selected_week": self.comboBox_week.currentText()
+                "selected_week": self.comboBox_week.currentText(),
+                **self.extra_months,
             }
         except ValueError:
             self.textEdit_log.append("Numeric input is incomplete.")
             return
 
-        ConfirmationPopup(self.new_output_data, self.save_to_json_and_goto_page3).exec()
+        popup = ConfirmationPopup(self.new_output_data, self.save_to_json_and_goto_page3)
+        # What the run would change is computed read-only while the popup is open
+        if not self.worker.busy:
+            self.worker.diff.connect(popup.show_diff)
+            self.worker.dry_run(self.new_output_data)
+        popup.exec()
+        # A dry run still running belongs to this popup only
+        self.worker.cancel_dry_run()
+        try:
+            self.worker.diff.disconnect(popup.show_diff)
+        except TypeError:
+            pass
 
     # Save inputs to JSON file and change to page 3
     def save_to_json_and_goto_page3(self):
@@ -210,16 +275,20 @@ class MyApp(QMainWindow, Ui_MainWindow):
         except FileNotFoundError:
             existing_data = {}
 
+        # Months 7+ of an earlier summary file must not carry over to this one
+        for key in [key for key in existing_data if key.startswith(("header_month", "data_count_month"))]:
+            del existing_data[key]
         existing_data.update(self.new_output_data)
 
         with open(json_file_path, "w") as fp:
             json.dump(existing_data, fp, indent=4)
 
+        self.ensure_page(self.page_3)
         self.stackedWidget.setCurrentWidget(self.page_3)
 
-    # Run main logic script in a separate thread
+    # Run main logic in the warm worker process
     def run_main_program(self):
-        if self.thread and self.thread.isRunning():
+        if self.worker.busy:
             self.textEdit_log.append("Process is still running.")
             return
 
@@ -227,29 +296,21 @@ class MyApp(QMainWindow, Ui_MainWindow):
         self.pushButton_process.setEnabled(False)
         self.pushButton_end.setEnabled(False)
 
-        self.thread = QThread(self)
-        self.worker = ProcessWorker(self.SCRIPT_MAIN)
-        self.worker.moveToThread(self.thread)
-
-        self.thread.started.connect(self.worker.run)
-        self.worker.log.connect(self.append_log)
-        self.worker.error.connect(self.append_error)
-        self.worker.finished.connect(self.on_finished)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.thread.finished.connect(self.thread.deleteLater)
-
-        self.thread.start()
+        self.worker.run(ResourceHelper.get_path('../config/inputan.json'))
 
     # Append normal log message
     def append_log(self, txt: str):
+        self.ensure_page(self.page_3)
         self.textEdit_log.append(txt)
 
     # Append error log message
     def append_error(self, txt: str):
+        self.ensure_page(self.page_3)
         self.textEdit_log.append(f"<span style='color:red'>{txt}</span>")
 
     # Called when background process finished
     def on_finished(self, exit_code: int):
+        self.ensure_page(self.page_3)
         status_text = "Normal" if exit_code == 0 else "Error"
         self.textEdit_log.append(f"\nFinished (exit code {exit_code}, status {status_text}).")
         
@@ -259,7 +320,11 @@ class MyApp(QMainWindow, Ui_MainWindow):
         
         self.pushButton_process.setEnabled(True)
         self.pushButton_end.setEnabled(True)
-        self.thread.quit()
+
+    # Stop the worker process together with the window
+    def closeEvent(self, event):
+        self.worker.stop()
+        super().closeEvent(event)
 
     # End button handler: clear SSO form and go home
     def end_process(self):
@@ -289,6 +354,8 @@ class MyApp(QMainWindow, Ui_MainWindow):
 
     # ================ Third Party Integration ============
     def program_3rdParty(self):
+        import importlib.util  # Only needed once the 3rd party logic runs
+
         try:
             # Determine base path depending on frozen state
             if getattr(sys, 'frozen', False):
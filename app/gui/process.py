@@ -1,61 +1,150 @@
 # process.py
-from PyQt6.QtCore import QObject, pyqtSignal
-import subprocess
+from PyQt6.QtCore import QObject, QProcess, pyqtSignal
+import json
 import sys
 
-class ProcessWorker(QObject):
+class WarmProcessWorker(QObject):
     """
-    Runs the script at script_path as an external process, forwarding stdout/stderr
-    lines to PyQt signals for real-time output handling.
+    Keeps one logic worker process (logic/worker.py) alive for the whole GUI
+    session and sends it run requests over its stdin pipe.
+
+    The worker imports the logic modules once, so only the first run pays for
+    the interpreter start-up and imports. Log lines and step progress stream
+    back as JSON lines; if the process dies it is started again, and a run
+    that was in progress is reported as failed.
     """
-    log = pyqtSignal(str)       # Signal emitted for each line of output from the process
-    error = pyqtSignal(str)     # Signal emitted if an internal error occurs in this worker
-    finished = pyqtSignal(int)  # Signal emitted when process finishes, including exit code
+    log = pyqtSignal(str)            # Signal emitted for each log line of the current run
+    error = pyqtSignal(str)          # Signal emitted for error output or a worker crash
+    progress = pyqtSignal(str, str)  # Signal emitted when a step starts/finishes: (step, state)
+    finished = pyqtSignal(int)       # Signal emitted when a run finishes, including exit code
+    ready = pyqtSignal()             # Signal emitted once the worker has imported the logic modules
+    blocks = pyqtSignal(list)        # Signal emitted with the month blocks detected in a summary file
+    diff = pyqtSignal(str)           # Signal emitted with the dry-run summary of a config
 
-    def __init__(self, script_path: str):
+    def __init__(self, script_path: str, parent=None):
         """
-        Initialize the worker with the script path to execute.
+        Initialize the worker; call start() to launch the process.
 
         Args:
-            script_path (str): Path to the Python script to run.
+            script_path (str): Path to the worker script (logic/worker.py).
         """
-        super().__init__()
+        super().__init__(parent)
         self.script_path = script_path
+        self.process: QProcess | None = None
+        self.busy = False
+        self._request_id = 0
+        self._dry_run_id = None  # Only the answer to the latest dry run is emitted
+        self._stopping = False
+        self._buffer = b""
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.state() != QProcess.ProcessState.NotRunning
+
+    def start(self):
+        """Launch the worker process unless it is already running."""
+        if self.is_alive():
+            return
+        self._buffer = b""
+        self.process = QProcess(self)
+        self.process.readyReadStandardOutput.connect(self._read_stdout)
+        self.process.readyReadStandardError.connect(self._read_stderr)
+        self.process.finished.connect(self._on_process_finished)
+        self.process.start(sys.executable, ["-u", self.script_path])
+        self.process.waitForStarted(5000)
+
+    def run(self, config_path: str):
+        """
+        Ask the worker to run the pipeline with the given config file.
+
+        The process is (re)started first if it is not running.
+        """
+        if self.busy:
+            self.error.emit("Process is still running.")
+            return
+        self.start()
+        self._request_id += 1
+        request = {"id": self._request_id, "command": "run", "config": config_path}
+        self.busy = True
+        self.process.write((json.dumps(request) + "\n").encode("utf-8"))
+
+    def detect(self, summary_file: str):
+        """Ask the worker for the month blocks of a summary file (answered through `blocks`)."""
+        self.start()
+        self._request_id += 1
+        request = {"id": self._request_id, "command": "detect", "summary_file": summary_file}
+        self.process.write((json.dumps(request) + "\n").encode("utf-8"))
 
-    def run(self):
+    def dry_run(self, config: dict):
         """
-        Execute the script as a subprocess, emitting output lines and error notifications.
+        Ask the worker what a run with `config` would change (answered through `diff`).
 
-        The standard output and error streams are combined and emitted line by line
-        through the `log` signal. If an exception is caught, `error` is emitted.
-        Finally, the `finished` signal is emitted with the process's exit code.
+        Answers to earlier dry runs that are still on their way are dropped.
         """
+        self.start()
+        self._request_id += 1
+        self._dry_run_id = self._request_id
+        request = {"id": self._request_id, "command": "dry_run", "config": config}
+        self.process.write((json.dumps(request) + "\n").encode("utf-8"))
+
+    def cancel_dry_run(self):
+        """Drop the answer to the pending dry run, e.g. once its popup is closed."""
+        self._dry_run_id = None
+
+    def stop(self):
+        """Shut the worker down, killing it if it does not exit in time."""
+        if not self.is_alive():
+            return
+        self._stopping = True
+        self.process.write(b'{"command": "shutdown"}\n')
+        self.process.closeWriteChannel()
+        if not self.process.waitForFinished(3000):
+            self.process.kill()
+            self.process.waitForFinished(1000)
+
+    def _read_stdout(self):
+        self._buffer += bytes(self.process.readAllStandardOutput())
+        *lines, self._buffer = self._buffer.split(b"\n")
+        for line in lines:
+            self._handle_line(line.decode("utf-8", errors="replace").rstrip())
+
+    def _read_stderr(self):
+        # Output that escaped the protocol, e.g. a crash during import
+        text = bytes(self.process.readAllStandardError()).decode("utf-8", errors="replace")
+        for line in text.splitlines():
+            self.error.emit(line)
+
+    def _handle_line(self, line: str):
         try:
-            # Launch the subprocess to run the specified Python script
-            proc = subprocess.Popen(
-                [sys.executable, self.script_path],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-            )
-
-            # Read the subprocess output line by line and emit it via the log signal
-            for line in proc.stdout:
-                self.log.emit(line.rstrip())
-
-            # Close the subprocess's stdout pipe
-            proc.stdout.close()
-
-            # Wait for subprocess completion
-            proc.wait()
-
-            # Emit the exit code when the process finishes
-            self.finished.emit(proc.returncode)
-
-        except Exception as e:
-            # Emit error signal if an exception occurs during execution
-            self.error.emit(str(e))
-
-            # Use -1 as exit code in case of error
-            self.finished.emit(-1)
\ No newline at end of file
+            message = json.loads(line)
+        except json.JSONDecodeError:
+            self.log.emit(line)
+            return
+
+        kind = message.get("type")
+        if kind == "log":
+            self.log.emit(message["text"])
+        elif kind == "error":
+            self.error.emit(message["text"])
+        elif kind == "progress":
+            self.progress.emit(message["step"], message["state"])
+        elif kind == "done":
+            self.busy = False
+            self.finished.emit(int(message["exit_code"]))
+        elif kind == "blocks":
+            self.blocks.emit(message["blocks"])
+        elif kind == "diff":
+            if message.get("id") is not None and message.get("id") == self._dry_run_id:
+                self._dry_run_id = None
+                self.diff.emit(message["text"])
+        elif kind == "ready":
+            self.ready.emit()
+
+    def _on_process_finished(self, exit_code: int, exit_status):
+        if self._stopping:
+            return
+        if self.busy:
+            # The run never reported back: fail it and start a fresh worker for the next one
+            self.busy = False
+            self.error.emit(f"Worker process stopped unexpectedly (exit code {exit_code}); restarting it.")
+            self.finished.emit(-1)
+        self.start()
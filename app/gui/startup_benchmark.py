@@ -0,0 +1,95 @@
+"""
+Startup benchmark of the GUI: time to first paint of the main window.
+
+Starts the app several times with DRAFT_STARTUP_PROBE set; main.py then
+writes its startup timings once the main window has painted, builds the
+deferred pages (timing each) and closes. From the app folder:
+
+    python gui/startup_benchmark.py --runs 5
+    python gui/startup_benchmark.py --exe "dist/Automation System.exe"
+
+Reported per metric (median and best of the runs, in ms):
+    launch_to_paint  process launch -> first paint (includes interpreter / exe startup)
+    qt_import        main.py start -> PyQt6 imported
+    splash           main.py start -> splash painted
+    gui_import       main.py start -> gui.main_gui imported
+    window           main.py start -> MyApp built
+    first_paint      main.py start -> first paint of the main window
+    page_N_build     building a deferred page on its first show
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must match main.PROBE_ENV (not imported: that would load Qt into the benchmark)
+PROBE_ENV = "DRAFT_STARTUP_PROBE"
+
+def run_once(command: list[str], timeout: float = 120) -> dict:
+    """
+    Start the app once and return its startup timings in ms.
+
+    Raises:
+        RuntimeError: If the app exits without writing the probe file, or
+            reports that its main window never painted.
+    """
+    handle, probe_path = tempfile.mkstemp(prefix="startup_", suffix=".json")
+    os.close(handle)
+    os.remove(probe_path)
+    try:
+        launched = time.time()
+        completed = subprocess.run(command, cwd=APP_DIR, env={**os.environ, PROBE_ENV: probe_path},
+                                   capture_output=True, text=True, timeout=timeout)
+        if not os.path.exists(probe_path):
+            raise RuntimeError(f"No startup timings written (exit code {completed.returncode}):\n{completed.stderr}")
+        with open(probe_path, encoding="utf-8") as f:
+            timings = json.load(f)
+    finally:
+        if os.path.exists(probe_path):
+            os.remove(probe_path)
+    if not timings.pop("paint_seen"):
+        raise RuntimeError("The main window never painted; the probe gave up after its timeout.")
+    timings["launch_to_paint_ms"] = round((timings.pop("first_paint_epoch") - launched) * 1000, 1)
+    return timings
+
+def summarize(runs: list[dict]) -> dict[str, dict]:
+    """Median and best of every metric over the runs."""
+    return {
+        name: {"median": round(statistics.median(run[name] for run in runs), 1),
+               "best": min(run[name] for run in runs)}
+        for name in runs[0]
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the GUI time to first paint.")
+    parser.add_argument("--runs", type=int, default=5, help="app starts to measure (default 5)")
+    parser.add_argument("--exe", default=None, help="frozen build to start instead of 'python main.py'")
+    parser.add_argument("--json", dest="json_out", default=None, help="also write the runs and summary to this file")
+    args = parser.parse_args(argv)
+
+    command = [args.exe] if args.exe else [sys.executable, os.path.join(APP_DIR, "main.py")]
+    runs = []
+    for number in range(1, args.runs + 1):
+        runs.append(run_once(command))
+        print(f"run {number}: first paint {runs[-1]['launch_to_paint_ms']:.0f} ms after launch")
+
+    summary = summarize(runs)
+    width = max(len(name) for name in summary)
+    print(f"\n{'metric'.ljust(width)} {'median':>9} {'best':>9}")
+    for name, values in summary.items():
+        print(f"{name.ljust(width)} {values['median']:>9.1f} {values['best']:>9.1f}")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"command": command, "runs": runs, "summary": summary}, f, indent=1)
+
+if __name__ == "__main__":
+    main()
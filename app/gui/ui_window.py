@@ -65,11 +65,91 @@ class Ui_MainWindow(object):
         self.label_2.raise_()
         self.label.raise_()
         self.stackedWidget.addWidget(self.page_1)
+        # Pages 2-4 start empty; MyApp fills each with setupPage<N>() the first
+        # time it is shown, so the window paints after building only page 1
+        self.page_2 = QtWidgets.QWidget()
+        self.page_2.setObjectName("page_2")
+        self.stackedWidget.addWidget(self.page_2)
+        self.page_3 = QtWidgets.QWidget()
+        self.page_3.setObjectName("page_3")
+        self.stackedWidget.addWidget(self.page_3)
+        self.page_4 = QtWidgets.QWidget()
+        self.page_4.setEnabled(True)
+        self.page_4.setObjectName("page_4")
+        self.stackedWidget.addWidget(self.page_4)
+        self.label_8 = QtWidgets.QLabel(parent=self.centralwidget)
+        self.label_8.setGeometry(QtCore.QRect(70, 20, 61, 31))
+        self.label_8.setText("")
+        self.label_8.setPixmap(QtGui.QPixmap(ResourceHelper.get_path('../assets/ITM_logo.png')))
+        self.label_8.setScaledContents(True)
+        self.label_8.setObjectName("label_8")
+        self.label_10 = QtWidgets.QLabel(parent=self.centralwidget)
+        self.label_10.setGeometry(QtCore.QRect(0, 60, 211, 21))
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(9)
+        font.setBold(True)
+        self.label_10.setFont(font)
+        self.label_10.setFocusPolicy(QtCore.Qt.FocusPolicy.NoFocus)
+        self.label_10.setAutoFillBackground(False)
+        self.label_10.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.label_10.setObjectName("label_10")
+        self.pushButton_Home = QtWidgets.QPushButton(parent=self.centralwidget)
+        self.pushButton_Home.setEnabled(True)
+        self.pushButton_Home.setGeometry(QtCore.QRect(10, 140, 191, 41))
+        self.pushButton_Home.setMaximumSize(QtCore.QSize(100000, 16777215))
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(12)
+        font.setBold(True)
+        font.setKerning(True)
+        self.pushButton_Home.setFont(font)
+        self.pushButton_Home.setAutoFillBackground(False)
+        self.pushButton_Home.setCheckable(True)
+        self.pushButton_Home.setChecked(False)
+        self.pushButton_Home.setAutoRepeat(False)
+        self.pushButton_Home.setObjectName("pushButton_Home")
+        self.pushButton_Performance = QtWidgets.QPushButton(parent=self.centralwidget)
+        self.pushButton_Performance.setEnabled(True)
+        self.pushButton_Performance.setGeometry(QtCore.QRect(10, 200, 191, 41))
+        self.pushButton_Performance.setMaximumSize(QtCore.QSize(100000, 16777215))
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(12)
+        font.setBold(True)
+        font.setKerning(True)
+        self.pushButton_Performance.setFont(font)
+        self.pushButton_Performance.setObjectName("pushButton_Performance")
+        self.pushButton_3rdParty = QtWidgets.QPushButton(parent=self.centralwidget)
+        self.pushButton_3rdParty.setEnabled(True)
+        self.pushButton_3rdParty.setGeometry(QtCore.QRect(10, 260, 191, 41))
+        self.pushButton_3rdParty.setMaximumSize(QtCore.QSize(100000, 16777215))
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(12)
+        font.setBold(True)
+        font.setKerning(True)
+        self.pushButton_3rdParty.setFont(font)
+        self.pushButton_3rdParty.setObjectName("pushButton_3rdParty")
+        self.line = QtWidgets.QFrame(parent=self.centralwidget)
+        self.line.setGeometry(QtCore.QRect(180, 10, 61, 461))
+        self.line.setLineWidth(1)
+        self.line.setFrameShape(QtWidgets.QFrame.Shape.VLine)
+        self.line.setFrameShadow(QtWidgets.QFrame.Shadow.Sunken)
+        self.line.setObjectName("line")
+        MainWindow.setCentralWidget(self.centralwidget)
+        self.statusbar = QtWidgets.QStatusBar(parent=MainWindow)
+        self.statusbar.setObjectName("statusbar")
+        MainWindow.setStatusBar(self.statusbar)
+
+        self.retranslateUi(MainWindow)
+        self.stackedWidget.setCurrentIndex(0)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def setupPage2(self):
         # ================================
         # 📌 PAGE 2 : Weekly Report
         # ================================
-        self.page_2 = QtWidgets.QWidget()
-        self.page_2.setObjectName("page_2")
 
         # Judul halaman
         self.label_4 = QtWidgets.QLabel(parent=self.page_2)
@@ -470,10 +550,9 @@ class Ui_MainWindow(object):
                                    QtCore.Qt.AlignmentFlag.AlignVCenter)
         self.label_30.setObjectName("label_30")
 
-        # Add page_2 ke stackedWidget
-        self.stackedWidget.addWidget(self.page_2)
-        self.page_3 = QtWidgets.QWidget()
-        self.page_3.setObjectName("page_3")
+        self.retranslatePage2()
+
+    def setupPage3(self):
         self.pushButton_process = QtWidgets.QPushButton(parent=self.page_3)
         self.pushButton_process.setEnabled(True)
         self.pushButton_process.setGeometry(QtCore.QRect(230, 60, 171, 101))
@@ -508,10 +587,10 @@ class Ui_MainWindow(object):
         font.setBold(True)
         self.pushButton_end.setFont(font)
         self.pushButton_end.setObjectName("pushButton_end")
-        self.stackedWidget.addWidget(self.page_3)
-        self.page_4 = QtWidgets.QWidget()
-        self.page_4.setEnabled(True)
-        self.page_4.setObjectName("page_4")
+
+        self.retranslatePage3()
+
+    def setupPage4(self):
         self.lineEdit_Raw3rdParty = QtWidgets.QLineEdit(parent=self.page_4)
         self.lineEdit_Raw3rdParty.setGeometry(QtCore.QRect(150, 190, 331, 31))
         self.lineEdit_Raw3rdParty.setObjectName("lineEdit_Raw3rdParty")
@@ -579,81 +658,21 @@ class Ui_MainWindow(object):
         font.setBold(True)
         self.pushButton_Start3rdParty.setFont(font)
         self.pushButton_Start3rdParty.setObjectName("pushButton_Start3rdParty")
-        self.stackedWidget.addWidget(self.page_4)
-        self.label_8 = QtWidgets.QLabel(parent=self.centralwidget)
-        self.label_8.setGeometry(QtCore.QRect(70, 20, 61, 31))
-        self.label_8.setText("")
-        self.label_8.setPixmap(QtGui.QPixmap(ResourceHelper.get_path('../assets/ITM_logo.png')))
-        self.label_8.setScaledContents(True)
-        self.label_8.setObjectName("label_8")
-        self.label_10 = QtWidgets.QLabel(parent=self.centralwidget)
-        self.label_10.setGeometry(QtCore.QRect(0, 60, 211, 21))
-        font = QtGui.QFont()
-        font.setFamily("Arial")
-        font.setPointSize(9)
-        font.setBold(True)
-        self.label_10.setFont(font)
-        self.label_10.setFocusPolicy(QtCore.Qt.FocusPolicy.NoFocus)
-        self.label_10.setAutoFillBackground(False)
-        self.label_10.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-        self.label_10.setObjectName("label_10")
-        self.pushButton_Home = QtWidgets.QPushButton(parent=self.centralwidget)
-        self.pushButton_Home.setEnabled(True)
-        self.pushButton_Home.setGeometry(QtCore.QRect(10, 140, 191, 41))
-        self.pushButton_Home.setMaximumSize(QtCore.QSize(100000, 16777215))
-        font = QtGui.QFont()
-        font.setFamily("Arial")
-        font.setPointSize(12)
-        font.setBold(True)
-        font.setKerning(True)
-        self.pushButton_Home.setFont(font)
-        self.pushButton_Home.setAutoFillBackground(False)
-        self.pushButton_Home.setCheckable(True)
-        self.pushButton_Home.setChecked(False)
-        self.pushButton_Home.setAutoRepeat(False)
-        self.pushButton_Home.setObjectName("pushButton_Home")
-        self.pushButton_Performance = QtWidgets.QPushButton(parent=self.centralwidget)
-        self.pushButton_Performance.setEnabled(True)
-        self.pushButton_Performance.setGeometry(QtCore.QRect(10, 200, 191, 41))
-        self.pushButton_Performance.setMaximumSize(QtCore.QSize(100000, 16777215))
-        font = QtGui.QFont()
-        font.setFamily("Arial")
-        font.setPointSize(12)
-        font.setBold(True)
-        font.setKerning(True)
-        self.pushButton_Performance.setFont(font)
-        self.pushButton_Performance.setObjectName("pushButton_Performance")
-        self.pushButton_3rdParty = QtWidgets.QPushButton(parent=self.centralwidget)
-        self.pushButton_3rdParty.setEnabled(True)
-        self.pushButton_3rdParty.setGeometry(QtCore.QRect(10, 260, 191, 41))
-        self.pushButton_3rdParty.setMaximumSize(QtCore.QSize(100000, 16777215))
-        font = QtGui.QFont()
-        font.setFamily("Arial")
-        font.setPointSize(12)
-        font.setBold(True)
-        font.setKerning(True)
-        self.pushButton_3rdParty.setFont(font)
-        self.pushButton_3rdParty.setObjectName("pushButton_3rdParty")
-        self.line = QtWidgets.QFrame(parent=self.centralwidget)
-        self.line.setGeometry(QtCore.QRect(180, 10, 61, 461))
-        self.line.setLineWidth(1)
-        self.line.setFrameShape(QtWidgets.QFrame.Shape.VLine)
-        self.line.setFrameShadow(QtWidgets.QFrame.Shadow.Sunken)
-        self.line.setObjectName("line")
-        MainWindow.setCentralWidget(self.centralwidget)
-        self.statusbar = QtWidgets.QStatusBar(parent=MainWindow)
-        self.statusbar.setObjectName("statusbar")
-        MainWindow.setStatusBar(self.statusbar)
 
-        self.retranslateUi(MainWindow)
-        self.stackedWidget.setCurrentIndex(2)
-        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+        self.retranslatePage4()
 
     def retranslateUi(self, MainWindow):
         _translate = QtCore.QCoreApplication.translate
         MainWindow.setWindowTitle(_translate("MainWindow", "Automation System"))
         self.label_3.setText(_translate("MainWindow", "Welcome to the Automation System"))
         self.label_2.setText(_translate("MainWindow", "PT Indo Tambangraya Megah Tbk"))
+        self.label_10.setText(_translate("MainWindow", "PT Indo Tambangraya Megah Tbk"))
+        self.pushButton_Home.setText(_translate("MainWindow", "Home"))
+        self.pushButton_Performance.setText(_translate("MainWindow", "Weekly Report"))
+        self.pushButton_3rdParty.setText(_translate("MainWindow", "3rd Party"))
+
+    def retranslatePage2(self):
+        _translate = QtCore.QCoreApplication.translate
         self.label_4.setText(_translate("MainWindow", "Complete the Required Data for Weekly Report"))
         self.label_5.setText(_translate("MainWindow", "Summary File"))
         self.label_6.setText(_translate("MainWindow", "Final File"))
@@ -673,21 +692,23 @@ class Ui_MainWindow(object):
         self.label_21.setText(_translate("MainWindow", "Month 2"))
         self.label_22.setText(_translate("MainWindow", "Month 3"))
         self.label_23.setText(_translate("MainWindow", "Month 4"))
+        self.label_27.setText(_translate("MainWindow", "Month 5"))
+        self.label_28.setText(_translate("MainWindow", "Header"))
+        self.label_29.setText(_translate("MainWindow", "Data Count"))
+        self.label_30.setText(_translate("MainWindow", "Month 6"))
+        self.label_31.setText(_translate("MainWindow", "Header"))
+        self.label_32.setText(_translate("MainWindow", "Data Count"))
+
+    def retranslatePage3(self):
+        _translate = QtCore.QCoreApplication.translate
         self.label_24.setText(_translate("MainWindow", "Start Automation Process"))
         self.pushButton_end.setText(_translate("MainWindow", "End"))
+
+    def retranslatePage4(self):
+        _translate = QtCore.QCoreApplication.translate
         self.pushButton_Raw3rdParty.setText(_translate("MainWindow", "Select File"))
         self.label_17.setText(_translate("MainWindow", "Draft File"))
         self.pushButton_Draft3rdParty.setText(_translate("MainWindow", "Select File"))
         self.label_25.setText(_translate("MainWindow", "Raw File"))
         self.label_26.setText(_translate("MainWindow", "Complete the Required Data for 3rd Party"))
-        self.label_27.setText(_translate("MainWindow", "Month 5"))
-        self.label_28.setText(_translate("MainWindow", "Header"))
-        self.label_29.setText(_translate("MainWindow", "Data Count"))
-        self.label_30.setText(_translate("MainWindow", "Month 6"))
-        self.label_31.setText(_translate("MainWindow", "Header"))
-        self.label_32.setText(_translate("MainWindow", "Data Count"))
-        self.pushButton_Start3rdParty.setText(_translate("MainWindow", "Start Process"))
-        self.label_10.setText(_translate("MainWindow", "PT Indo Tambangraya Megah Tbk"))
-        self.pushButton_Home.setText(_translate("MainWindow", "Home"))
-        self.pushButton_Performance.setText(_translate("MainWindow", "Weekly Report"))
-        self.pushButton_3rdParty.setText(_translate("MainWindow", "3rd Party"))
\ No newline at end of file
+        self.pushButton_Start3rdParty.setText(_translate("MainWindow", "Start Process"))
\ No newline at end of file
@@ -1,74 +1,254 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
 from openpyxl import load_workbook
+from openpyxl.utils.cell import column_index_from_string, coordinate_from_string
+
+# The GUI loads this file by path: make the sibling logic modules importable
+LOGIC_DIR = os.path.dirname(os.path.abspath(__file__))
+if LOGIC_DIR not in sys.path:
+    sys.path.insert(0, LOGIC_DIR)
+
+from column_writer import same_value, write_cell
+from run_log import get_logger
+from sheet_reader import read_block
+from workbook_io import save_workbook
+
+log = get_logger("3rd_party")
+
+class ResourceHelper:
+    @staticmethod
+    def get_path(relative_path: str) -> Path:
+        """
+        Get the absolute path of a file relative to the current script's directory.
+
+        Args:
+            relative_path (str): The relative path to the file.
+
+        Returns:
+            Path: The absolute path to the file.
+        """
+        base_path = Path(__file__).parent
+        return base_path / relative_path
+
+# Which raw cells fill which Draft cells
+MAPPING_PATH = ResourceHelper.get_path('../config/third_party_mapping.json')
+
+# Mapping file layout this module understands
+MAPPING_VERSION = 1
+
+def load_mapping(path=MAPPING_PATH) -> dict:
+    """
+    Read and check the 3rd-party mapping config.
+
+    Keys: version, source_sheet, target_sheet, plan_columns and
+    actual_columns (raw columns, month by month), target_column_plan,
+    target_column_actual, and rows: [{"source_row", "target_start_row"}].
+    Each raw row fills one target cell per month, from target_start_row down.
+
+    Raises:
+        ValueError: If the file has another version or the columns do not pair up.
+    """
+    mapping = json.loads(Path(path).read_text(encoding="utf-8"))
+    if mapping.get("version") != MAPPING_VERSION:
+        raise ValueError(f"{path}: mapping version {mapping.get('version')!r}, expected {MAPPING_VERSION}")
+    if len(mapping["plan_columns"]) != len(mapping["actual_columns"]):
+        raise ValueError(f"{path}: plan_columns and actual_columns differ in length")
+    return mapping
+
+def source_range(mapping: dict) -> tuple[int, int, int, int]:
+    """(first row, last row, first column, last column) of the raw cells the mapping reads."""
+    rows = [item['source_row'] for item in mapping['rows']]
+    columns = [column_index_from_string(column) for column in mapping['plan_columns'] + mapping['actual_columns']]
+    return min(rows), max(rows), min(columns), max(columns)
+
+def target_range(mapping: dict) -> tuple[int, int, int, int]:
+    """(first row, last row, first column, last column) of the Draft cells the mapping fills."""
+    months = len(mapping['plan_columns'])
+    rows = [item['target_start_row'] for item in mapping['rows']]
+    columns = [column_index_from_string(mapping['target_column_plan']), column_index_from_string(mapping['target_column_actual'])]
+    return min(rows), max(rows) + months - 1, min(columns), max(columns)
+
+def cell_pairs(mapping: dict):
+    """Yield (Draft coordinate, raw row, raw column index) for every cell the mapping fills."""
+    for target_column, source_columns in ((mapping['target_column_plan'], mapping['plan_columns']),
+                                          (mapping['target_column_actual'], mapping['actual_columns'])):
+        for item in mapping['rows']:
+            target_row = item['target_start_row']  # Start row for target sheet
+            for col_a in source_columns:
+                yield f"{target_column}{target_row}", item['source_row'], column_index_from_string(col_a)
+                target_row += 1  # Move to the next row in target
+
+def map_block(block: list[list], mapping: dict, skip_empty: bool = False) -> dict[str, object]:
+    """
+    Turn the raw Plan/Actual values into the Draft cells they fill.
+
+    Args:
+        block (list[list]): Values of source_range(mapping), row by row.
+        mapping (dict): See load_mapping().
+        skip_empty (bool): Leave out the cells whose raw value is empty instead of filling 0.
+
+    Returns:
+        dict: {Draft coordinate: value}; a missing value becomes 0 unless skip_empty.
+    """
+    first_row, _, first_column, _ = source_range(mapping)
+    cells = {}
+    for coordinate, source_row, source_column in cell_pairs(mapping):
+        column_data = block[source_row - first_row][source_column - first_column]
+        if column_data is None:
+            if skip_empty:
+                continue
+            column_data = 0  # The data, or 0 if the source cell is empty
+        cells[coordinate] = column_data
+    return cells
+
+def extract_cells(file_a_path, sheet_a=None, mapping=None) -> dict[str, object]:
+    """
+    Read the Plan and Actual data of a raw file as Draft cells.
 
-def move_data(file_a_path, file_b_path, sheet_a, sheet_b):
+    Only the mapped range is read, read-only, as the values Excel cached.
+    """
+    mapping = mapping or load_mapping()
+    return map_block(read_block(file_a_path, sheet_a or mapping['source_sheet'], *source_range(mapping)), mapping)
+
+def diff_cells(file_b_path, sheet_b, cells: dict[str, object], mapping: dict) -> dict[str, object]:
+    """
+    The extracted cells whose value differs from what the Draft holds.
+
+    The Draft is read read-only over the mapped range, so an unchanged week
+    costs no workbook load. A cell holding a formula without a cached value
+    reads as empty and therefore counts as changed.
+    """
+    first_row, last_row, first_column, last_column = target_range(mapping)
+    current = read_block(file_b_path, sheet_b, first_row, last_row, first_column, last_column)
+    changed = {}
+    for coordinate, value in cells.items():
+        column, row = coordinate_from_string(coordinate)
+        if not same_value(current[row - first_row][column_index_from_string(column) - first_column], value):
+            changed[coordinate] = value
+    return changed
+
+def apply_cells(ws_b, cells: dict[str, object]) -> int:
+    """Write extracted cells into the Draft sheet; returns the number of cells that changed."""
+    changed = 0
+    for coordinate, value in cells.items():
+        column, row = coordinate_from_string(coordinate)
+        changed += write_cell(ws_b, row, column_index_from_string(column), value)
+    return changed
+
+def update_draft(file_b_path, sheet_b, cells: dict[str, object], mapping: dict) -> int:
+    """
+    Write the cells that changed into a Draft and save it; nothing is
+    loaded or saved when no cell changed.
+
+    Returns:
+        int: Number of cells written.
+    """
+    changed = diff_cells(file_b_path, sheet_b, cells, mapping)
+    if not changed:
+        log.info(f"'{os.path.basename(file_b_path)}' is up to date, not saved.")
+        return 0
+    wb_b = load_workbook(file_b_path)
+    apply_cells(wb_b[sheet_b], changed)
+    save_workbook(wb_b, file_b_path)
+    log.info(f"{len(changed)} of {len(cells)} cell(s) changed in '{os.path.basename(file_b_path)}'.")
+    return len(changed)
+
+def move_data(file_a_path, file_b_path, sheet_a=None, sheet_b=None, mapping=None):
     """
     Move Plan and Actual data from file A to file B with flexible settings.
-    If a value is missing, it will be replaced with 0.
+    If a value is missing, it will be replaced with 0. Only the cells whose
+    value changed are written; file B is not saved when none did.
 
     Args:
         file_a_path (str): Path to the source Excel file (file A).
         file_b_path (str): Path to the destination Excel file (file B).
-        sheet_a (str): Sheet name in file A to read data from.
-        sheet_b (str): Sheet name in file B to write data to.
+        sheet_a (str): Sheet name in file A to read data from (mapping default when None).
+        sheet_b (str): Sheet name in file B to write data to (mapping default when None).
+        mapping (dict): See load_mapping(); read from MAPPING_PATH when None.
+
+    Returns:
+        int: Number of cells written to file B.
     """
+    mapping = mapping or load_mapping()
+    # Read the mapped Plan/Actual values of file A (read-only, file A is never written)
+    cells = extract_cells(file_a_path, sheet_a, mapping)
+    return update_draft(file_b_path, sheet_b or mapping['target_sheet'], cells, mapping)
 
-    # Open workbook A and select the sheet to read data from
-    wb_a = load_workbook(file_a_path)
-    ws_a = wb_a[sheet_a]
+def move_data_batch(raw_files, draft_files, sheet_a=None, sheet_b=None, workers=None, mapping=None) -> dict:
+    """
+    Apply several raw update files to one or more Drafts.
 
-    # Open workbook B and select the sheet to write data to
-    wb_b = load_workbook(file_b_path)
-    ws_b = wb_b[sheet_b]
-
-    # === General configuration mapping source rows to target start rows ===
-    plans_and_actuals = [
-        {'source_row_plan': 5, 'target_start_row': 3},
-        {'source_row_plan': 6, 'target_start_row': 15},
-        {'source_row_plan': 7, 'target_start_row': 27},
-        {'source_row_plan': 8, 'target_start_row': 39},
-        {'source_row_plan': 9, 'target_start_row': 51},
-        {'source_row_plan': 10, 'target_start_row': 63},
-        {'source_row_plan': 11, 'target_start_row': 75},
-        {'source_row_plan': 12, 'target_start_row': 87},
-        {'source_row_plan': 13, 'target_start_row': 111},
-        {'source_row_plan': 14, 'target_start_row': 99},
-        {'source_row_plan': 15, 'target_start_row': 123},
-        {'source_row_plan': 16, 'target_start_row': 135},
-        {'source_row_plan': 17, 'target_start_row': 147},
-        {'source_row_plan': 18, 'target_start_row': 159},
-        {'source_row_plan': 19, 'target_start_row': 171},
-        {'source_row_plan': 20, 'target_start_row': 183},
-        {'source_row_plan': 21, 'target_start_row': 219},
-        {'source_row_plan': 22, 'target_start_row': 195},
-        {'source_row_plan': 24, 'target_start_row': 243},
-        {'source_row_plan': 25, 'target_start_row': 207},
-    ]
-
-    # Columns in file A that contain Plan and Actual data, alternating columns
-    columns_in_a_plan = ['D', 'F', 'H', 'J', 'L', 'N', 'P', 'R', 'T', 'V', 'X', 'Z']
-    columns_in_a_actual = ['E', 'G', 'I', 'K', 'M', 'O', 'Q', 'S', 'U', 'W', 'Y', 'AA']
-
-    # Target columns in file B for Plan and Actual respectively
-    target_column_plan = 'E'
-    target_column_actual = 'F'
-
-    # === Processing PLAN data: copying from source rows and columns to target cells ===
-    for item in plans_and_actuals:
-        target_row = item['target_start_row']  # Start row for target sheet
-        for col_a in columns_in_a_plan:
-            # Read the data from the source cell
-            column_data = ws_a[f"{col_a}{item['source_row_plan']}"].value
-            # Write the data or 0 if data is None to the target cell
-            ws_b[f"{target_column_plan}{target_row}"] = column_data if column_data is not None else 0
-            target_row += 1  # Move to the next row in target
-
-    # === Processing ACTUAL data similarly ===
-    for item in plans_and_actuals:
-        target_row = item['target_start_row']
-        for col_a in columns_in_a_actual:
-            column_data = ws_a[f"{col_a}{item['source_row_plan']}"].value
-            ws_b[f"{target_column_actual}{target_row}"] = column_data if column_data is not None else 0
-            target_row += 1
-
-    # Save the updated workbook B to persist changes
-    wb_b.save(file_b_path)
\ No newline at end of file
+    The raw files are read in parallel worker processes (read-only, mapped
+    range only) and merged in the order given, so for a cell both files
+    fill, the later file wins; an empty cell of a later file keeps the value
+    of an earlier one, and a cell no file fills becomes 0. Every Draft then gets only the cells that
+    changed, in one save, or no save at all when none did.
+
+    Args:
+        raw_files (list[str]): Raw 3rd-party update files.
+        draft_files (list[str]): Drafts to update.
+        sheet_a (str): Sheet of the raw files (mapping default when None).
+        sheet_b (str): Sheet of the Drafts (mapping default when None).
+        workers (int | None): Worker processes; one per CPU when None, 1 reads in-process.
+        mapping (dict): See load_mapping(); read from MAPPING_PATH when None.
+
+    Returns:
+        dict: Counts and timings of the batch.
+    """
+    started = time.perf_counter()
+    mapping = mapping or load_mapping()
+    sheet_a = sheet_a or mapping['source_sheet']
+    sheet_b = sheet_b or mapping['target_sheet']
+    bounds = source_range(mapping)
+    workers = min(workers or os.cpu_count() or 1, len(raw_files))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            blocks = list(pool.map(read_block, raw_files, [sheet_a] * len(raw_files), *([bound] * len(raw_files) for bound in bounds)))
+    else:
+        blocks = [read_block(raw_file, sheet_a, *bounds) for raw_file in raw_files]
+    # Only the cells a file fills override the earlier files; a cell no file fills becomes 0
+    cells = dict.fromkeys((coordinate for coordinate, _, _ in cell_pairs(mapping)), 0)
+    for block in blocks:
+        cells.update(map_block(block, mapping, skip_empty=True))
+    extract_seconds = time.perf_counter() - started
+    log.info(f"{len(raw_files)} raw file(s) read in {extract_seconds:.2f}s ({workers} process(es))")
+
+    written = saved = 0
+    for draft_file in draft_files:
+        changed = update_draft(draft_file, sheet_b, cells, mapping)
+        written += changed
+        saved += bool(changed)
+
+    return {
+        "raw_files": len(raw_files),
+        "drafts": len(draft_files),
+        "saved": saved,
+        "cells": written,
+        "workers": workers,
+        "extract_s": round(extract_seconds, 3),
+        "total_s": round(time.perf_counter() - started, 3),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply 3rd-party raw update files to one or more Drafts.")
+    parser.add_argument("raw_files", nargs="+", help="raw update workbooks, applied in this order")
+    parser.add_argument("--draft", action="append", required=True, help="Draft workbook to update (repeatable)")
+    parser.add_argument("--mapping", default=str(MAPPING_PATH), help="mapping config (default config/third_party_mapping.json)")
+    parser.add_argument("--sheet-raw", default=None, help="sheet of the raw files (default from the mapping)")
+    parser.add_argument("--sheet-draft", default=None, help="sheet of the Drafts (default from the mapping)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes reading raw files (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    stats = move_data_batch(args.raw_files, args.draft, args.sheet_raw, args.sheet_draft, args.workers,
+                            load_mapping(args.mapping))
+    log.info(f"{stats['cells']} cell(s) written, {stats['saved']} of {stats['drafts']} Draft(s) saved "
+             f"in {stats['total_s']:.2f}s")
+
+if __name__ == "__main__":
+    main()
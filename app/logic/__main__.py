@@ -0,0 +1,10 @@
+# python -m logic (from the app folder) runs the headless pipeline CLI
+import os
+import sys
+
+# The logic modules import each other by bare name
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cli import main
+
+sys.exit(main())
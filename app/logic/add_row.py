@@ -7,6 +7,14 @@ import json
 from pathlib import Path
 import os
 
+from column_writer import mark_written
+from month_engine import month_specs
+from run_report import count_cells
+from run_log import get_logger
+from workbook_io import save_workbook
+
+log = get_logger("add_row")
+
 class ResourceHelper:
     @staticmethod
     def get_path(relative_path: str) -> Path:
@@ -26,124 +34,202 @@ class ResourceHelper:
 # ────────────────── Reading Configuration from JSON ────────────────────────
 CFG_PATH = ResourceHelper.get_path('../config/inputan.json')
 
-# Load configuration data from JSON file with UTF-8 encoding
-cfg = json.loads(CFG_PATH.read_text(encoding="utf-8"))
-
-# Extract target Excel file path from the configuration
-file_path = cfg["final_file"]
-
-# Mapping sheet names to tuples of (number of data rows expected, table name in Excel)
-data_counts_and_tables: dict[str, tuple[int, str]] = {
-    "ITM Summary": (cfg["data_count_month1"], "TableOngoing"),
-    "Month 1":     (cfg["data_count_month1"], "TableMonth1"),
-    "Month 2":     (cfg["data_count_month2"], "TableMonth2"),
-    "Month 3":     (cfg["data_count_month3"], "TableMonth3"),
-    "Month 4":     (cfg["data_count_month4"], "TableMonth4"),
-    "Month 5":     (cfg["data_count_month5"], "TableMonth5"),
-    "Month 6":     (cfg["data_count_month6"], "TableMonth6"),
-}
-
-# Load the Excel workbook specified in the configuration
-wb = load_workbook(file_path)
-
-# Iterate over all sheets listed in the mapping dictionary
-for sheet_name, (data_count, table_name) in data_counts_and_tables.items():
-
-    # Skip this sheet if data count is zero (means no update needed)
-    if data_count == 0:
-        print(f"Skip '{sheet_name}', data does not change.")
-        continue
-
-    # Access the worksheet object by sheet name
-    ws = wb[sheet_name]
-
-    # Locate the desired table object by matching the table name
-    table = next((tbl for tbl in ws.tables.values() if tbl.name == table_name), None)
-    if table is None:
-        # If the table is not found, report and skip this sheet
-        print(f"Table '{table_name}' not found in sheet '{sheet_name}'.")
-        continue
-
-    # Parse the table reference range (e.g. 'A3:F20') into start and end coordinates
-    start_cell, end_cell = table.ref.split(":")
-
-    # Extract starting row number (adding 1 to skip header row in table)
-    start_row = int(re.match(r"[A-Za-z]+(\d+)", start_cell).group(1)) + 1
-
-    # Extract ending column as an index number (1-based)
-    end_col = column_index_from_string(re.match(r"([A-Za-z]+)", end_cell).group())
-
-    # Extract ending row number of the existing table range
-    end_row = int(re.match(r"[A-Za-z]+(\d+)", end_cell).group(1))
-
-    # Calculate the current number of data rows inside the table (excluding header)
-    current_rows = end_row - start_row + 1
-
-    # Initialize variable to track new last row of the table after modification
-    new_end_row = end_row
-
-    # ── Add Rows if needed to match desired data count ────────────────────────
-    if current_rows < data_count:
-        rows_to_add = data_count - current_rows  # Number of rows to add
-
-        # For each row to add
-        for i in range(rows_to_add):
-            # For each column in the table
-            for col_idx in range(1, end_col + 1):
-                # Reference the last existing row cell to copy style from
-                source_cell = ws.cell(end_row, col_idx)
-                # Target cell for the new row
-                target_cell = ws.cell(end_row + 1 + i, col_idx)
-                target_cell.value = None  # Initialize new cell value to None
-
-                # Copy the cell style properties if source cell has any style
-                if source_cell.has_style:
-                    target_cell._style = copy.copy(source_cell._style)
-                    target_cell.number_format = source_cell.number_format
-                    target_cell.font = copy.copy(source_cell.font)
-                    target_cell.border = copy.copy(source_cell.border)
-                    target_cell.fill = copy.copy(source_cell.fill)
-                    target_cell.alignment = copy.copy(source_cell.alignment)
-
-        # Update the new last row number of the table
-        new_end_row = end_row + rows_to_add
-        print(f"{rows_to_add} line(s) added in '{sheet_name}' (until row {new_end_row}).")
+# RowTemplate and truncate_table work on openpyxl internals (ws._cells,
+# cell._style, ws._current_row); requirements.txt pins the openpyxl version
+# tests/test_add_row.py checks them against.
+
+class RowTemplate:
+    """
+    Style ids of one table row, stamped onto any number of new rows.
+
+    A cell's style is an array of indexes into the workbook's shared font,
+    border, fill, number format and alignment tables. Copying that array
+    gives the new cell the same style as the source cell without creating
+    (and hashing back into those tables) new style objects, so a row costs
+    one small array copy per styled column.
+    """
+
+    def __init__(self, ws, row: int, end_col: int):
+        self.ws = ws
+        # One style array per column (None for unstyled cells), captured once
+        self.styles = []
+        for col_idx in range(1, end_col + 1):
+            cell = ws._cells.get((row, col_idx))
+            self.styles.append(cell._style if cell is not None and cell.has_style else None)
+
+    def stamp(self, first_row: int, count: int) -> int:
+        """
+        Create `count` empty rows from `first_row` on with the template's styles.
 
-    # ── Remove Rows if excess to match desired data count ────────────────────
-    elif current_rows > data_count:
-        rows_to_remove = current_rows - data_count  # Number of rows to remove
+        Returns:
+            int: Number of cells written.
+        """
+        ws = self.ws
+        for row in range(first_row, first_row + count):
+            for col_idx, style in enumerate(self.styles, start=1):
+                target_cell = ws.cell(row, col_idx)
+                target_cell.value = None  # Initialize new cell value to None
+                if style is not None:
+                    # Each cell owns its array: setting e.g. .font later edits it in place
+                    target_cell._style = copy.copy(style)
+        return count * len(self.styles)
+
+
+def truncate_table(ws, first_row: int, last_row: int, end_col: int) -> int:
+    """
+    Remove the cells of table rows first_row..last_row (columns 1..end_col)
+    without moving any other cell of the sheet.
+
+    ws.delete_rows() shifts every cell below the cut, which is slow on sheets
+    with content below the tables and moves that content. Here only the
+    excess table cells are dropped; the sheet dimension then shrinks with
+    them, so later reads and saves do not scan phantom empty rows.
+
+    Returns:
+        int: Number of cells removed.
+    """
+    cells = ws._cells
+    removed = 0
+    for row in range(first_row, last_row + 1):
+        for col_idx in range(1, end_col + 1):
+            if cells.pop((row, col_idx), None) is not None:
+                removed += 1
+
+    # Rows left without any cell keep no height/format record either
+    used_rows = {row for row, _ in cells}
+    for row in range(first_row, last_row + 1):
+        if row not in used_rows:
+            ws.row_dimensions.pop(row, None)
+
+    # ws.append() continues after the last row that still has cells
+    ws._current_row = ws.max_row if cells else 0
+    return removed
+
+
+def table_counts(cfg: dict) -> dict[str, tuple[int, str]]:
+    """
+    Map every report sheet to (number of data rows expected, table name in Excel).
+
+    Args:
+        cfg (dict): Run configuration (same keys as config/inputan.json).
+    """
+    data_counts_and_tables: dict[str, tuple[int, str]] = {
+        "ITM Summary": (cfg["data_count_month1"], "TableOngoing"),
+    }
+    for spec in month_specs(cfg):
+        data_counts_and_tables[spec["sheet"]] = (cfg[spec["count_key"]], spec["table"])
+    return data_counts_and_tables
+
+
+def process(wb, cfg: dict) -> None:
+    """
+    Resize every report table in an already loaded Draft workbook so that it
+    holds exactly the configured number of data rows.
+
+    Args:
+        wb: The Draft workbook (openpyxl Workbook) shared by the pipeline.
+        cfg (dict): Run configuration (same keys as config/inputan.json).
+    """
+    # Iterate over all sheets listed in the mapping dictionary
+    for sheet_name, (data_count, table_name) in table_counts(cfg).items():
+
+        # Skip this sheet if data count is zero (means no update needed)
+        if data_count == 0:
+            log.info(f"Skip '{sheet_name}', data does not change.")
+            continue
+
+        # Access the worksheet object by sheet name
+        ws = wb[sheet_name]
+
+        # Locate the desired table object by matching the table name
+        table = next((tbl for tbl in ws.tables.values() if tbl.name == table_name), None)
+        if table is None:
+            # If the table is not found, report and skip this sheet
+            log.warning(f"Table '{table_name}' not found in sheet '{sheet_name}'.")
+            continue
+
+        # Parse the table reference range (e.g. 'A3:F20') into start and end coordinates
+        start_cell, end_cell = table.ref.split(":")
+
+        # Extract starting row number (adding 1 to skip header row in table)
+        start_row = int(re.match(r"[A-Za-z]+(\d+)", start_cell).group(1)) + 1
+
+        # Extract ending column as an index number (1-based)
+        end_col = column_index_from_string(re.match(r"([A-Za-z]+)", end_cell).group())
+
+        # Extract ending row number of the existing table range
+        end_row = int(re.match(r"[A-Za-z]+(\d+)", end_cell).group(1))
+
+        # Calculate the current number of data rows inside the table (excluding header)
+        current_rows = end_row - start_row + 1
+
+        # Initialize variable to track new last row of the table after modification
+        new_end_row = end_row
+
+        # ── Add Rows if needed to match desired data count ────────────────────────
+        if current_rows < data_count:
+            rows_to_add = data_count - current_rows  # Number of rows to add
+
+            # New rows take the style of the last existing row
+            cells = RowTemplate(ws, end_row, end_col).stamp(end_row + 1, rows_to_add)
+
+            # Update the new last row number of the table
+            new_end_row = end_row + rows_to_add
+            count_cells(written=cells)
+            log.info(f"{rows_to_add} line(s) added in '{sheet_name}' (until row {new_end_row}).")
+
+        # ── Remove Rows if excess to match desired data count ────────────────────
+        elif current_rows > data_count:
+            rows_to_remove = current_rows - data_count  # Number of rows to remove
+
+            # # Update the new last row number of the table
+            new_end_row = start_row + data_count - 1
+
+            if cfg.get("shrink_mode", "truncate") == "delete":
+                # Former behaviour: delete the rows, shifting everything below them up
+                ws.delete_rows(new_end_row + 1, rows_to_remove)
+                for row in ws.iter_rows(min_row=new_end_row+1, max_row=end_row, max_col=end_col):
+                    for cell in row:
+                        cell.value = None
+            else:
+                # Clear the excess table rows in place; nothing else moves
+                truncate_table(ws, new_end_row + 1, end_row, end_col)
+            count_cells(written=rows_to_remove * end_col)
+            log.info(f"{rows_to_remove} line(s) removed from '{sheet_name}'.")
+
+        # ── If current rows already matches desired data count ───────────────────
+        else:
+            log.info(f"'{sheet_name}' is up to date with {data_count} line(s).")
 
-        # Delete excess rows from the bottom of the table's data section
-        ws.delete_rows(end_row - rows_to_remove + 1, rows_to_remove)
+        # Resizing the table changes what its structured and range references cover
+        if current_rows != data_count:
+            mark_written(ws)
 
-        # # Update the new last row number of the table
-        new_end_row = start_row + data_count - 1
+        # Update the table reference to reflect the changed data range
+        table.ref = f"{start_cell}:{ws.cell(row=new_end_row, column=end_col).coordinate}"
 
-        # Kosongkan baris sisa setelah batas data
-        for row in ws.iter_rows(min_row=new_end_row+1, max_row=end_row, max_col=end_col):
-            for cell in row:
-                cell.value = None
-        print(f"{rows_to_remove} line(s) removed from '{sheet_name}'.")
 
-    # ── If current rows already matches desired data count ───────────────────
-    else:
-        print(f"'{sheet_name}' is up to date with {data_count} line(s).")
+def main():
+    """Standalone entry point: load the Draft, resize its tables and save it."""
+    # Load configuration data from JSON file with UTF-8 encoding
+    cfg = json.loads(CFG_PATH.read_text(encoding="utf-8"))
 
-    # Update the table reference to reflect the changed data range
-    table.ref = f"{start_cell}:{ws.cell(row=new_end_row, column=end_col).coordinate}"
+    # Extract target Excel file path from the configuration
+    file_path = cfg["final_file"]
 
-# Save all changes back to the Excel file
-wb.save(file_path)
+    # Load the Excel workbook specified in the configuration
+    wb = load_workbook(file_path)
+    process(wb, cfg)
 
-# Close the workbook explicitly to free any resources
-wb.close()
+    # Save the changes back to the Excel file (skipped when no table was resized)
+    saved = save_workbook(wb, file_path)
 
-print("The file was successfully customized and resaved.")
+    # Close the workbook explicitly to free any resources
+    wb.close()
 
-def main():
-    # Main entry point; intentionally left empty when run as a module
-    pass
+    if saved:
+        log.info("The file was successfully customized and resaved.")
 
 # If this script is executed directly, call main()
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,190 @@
+"""
+Run the full pipeline for many (summary, Draft) report sets at once.
+
+The manifest is a JSON file:
+
+    {
+        "defaults": {"selected_week": "W4", "export_dir": "E:/export"},
+        "sets": [
+            {"name": "ITM", "summary_file": "...", "final_file": "..."},
+            {"name": "BU-2", "summary_file": "...", "final_file": "...", "selected_week": "W3"}
+        ]
+    }
+
+Every set is a run config (same keys as config/inputan.json) laid over the
+defaults; month rows are detected from the summary when not given. Sets run
+in a process pool sized to the cores, each in a fresh worker process with its
+own log file, and a failing set does not stop the others.
+
+    python batch_runner.py manifest.json [--workers N] [--log-dir DIR]
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import re
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+# The logic modules import each other by bare name (also inside the worker processes)
+LOGIC_DIR = os.path.dirname(os.path.abspath(__file__))
+if LOGIC_DIR not in sys.path:
+    sys.path.insert(0, LOGIC_DIR)
+
+from run_log import get_logger
+
+log = get_logger("batch_runner")
+
+# Written to the log folder after every batch
+REPORT_NAME = "batch_report.json"
+
+def load_manifest(path: str) -> list[dict]:
+    """
+    Read a manifest and return one named run config per set.
+
+    Raises:
+        ValueError: If a set lacks summary_file/final_file or names repeat.
+    """
+    manifest = json.loads(Path(path).read_text(encoding="utf-8"))
+    defaults = manifest.get("defaults", {})
+    sets = []
+    for index, entry in enumerate(manifest.get("sets", []), start=1):
+        config = {**defaults, **entry}
+        config.setdefault("name", Path(config.get("final_file", f"set{index}")).stem)
+        missing = [key for key in ("summary_file", "final_file", "selected_week") if not config.get(key)]
+        if missing:
+            raise ValueError(f"Set {config['name']!r}: missing {', '.join(missing)}")
+        sets.append(config)
+
+    names = [config["name"] for config in sets]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Set names must be unique: {', '.join(duplicates)}")
+    return sets
+
+def _log_name(name: str) -> str:
+    return re.sub(r'[^\w.-]+', "_", name) + ".log"
+
+def run_set(config: dict, log_path: str) -> dict:
+    """
+    Run the pipeline for one set, logging to its own file.
+
+    Runs inside a worker process. Errors are caught and reported in the
+    result, so one broken set does not affect the batch.
+
+    Returns:
+        dict: name, status ('ok' or 'failed'), exit code, error, elapsed
+        seconds and log file.
+    """
+    import main_logic
+
+    config = dict(config)
+    name = config.pop("name")
+    # The sets already use every core; a month pool per set would oversubscribe them
+    config.setdefault("month_workers", 1)
+
+    started = time.perf_counter()
+    error = None
+    with open(log_path, "w", encoding="utf-8") as log_file, \
+            contextlib.redirect_stdout(log_file), contextlib.redirect_stderr(log_file):
+        try:
+            exit_code = main_logic.run(config)
+        except Exception as e:
+            traceback.print_exc()
+            exit_code, error = 1, f"{type(e).__name__}: {e}"
+    return {
+        "name": name,
+        "status": "ok" if exit_code == 0 else "failed",
+        "exit_code": exit_code,
+        "error": error,
+        "elapsed_s": round(time.perf_counter() - started, 3),
+        "log": log_path,
+    }
+
+def run_batch(sets: list[dict], log_dir: str, workers: int | None = None) -> dict:
+    """
+    Run every set in a process pool and write the aggregate report.
+
+    Args:
+        sets (list[dict]): Named run configs (see load_manifest()).
+        log_dir (str): Folder for the per-set logs and batch_report.json.
+        workers (int | None): Worker processes; one per core (at most one per set) when None.
+
+    Returns:
+        dict: The batch report: per-set results in manifest order and totals.
+    """
+    folder = Path(log_dir)
+    folder.mkdir(parents=True, exist_ok=True)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(sets)))
+    # A fresh process per set: no module state carries over from one set to the next
+    isolation = {"max_tasks_per_child": 1} if sys.version_info >= (3, 11) else {}
+
+    started = time.perf_counter()
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, **isolation) as pool:
+        futures = {
+            pool.submit(run_set, config, str(folder / _log_name(config["name"]))): config["name"]
+            for config in sets
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker process itself died (e.g. out of memory)
+                result = {"name": name, "status": "failed", "exit_code": -1, "error": f"{type(e).__name__}: {e}",
+                          "elapsed_s": None, "log": str(folder / _log_name(name))}
+            results[name] = result
+            log.info(f"[{result['status']}] {name} ({result['elapsed_s']}s)")
+
+    wall = time.perf_counter() - started
+    ordered = [results[config["name"]] for config in sets]
+    busy = sum(result["elapsed_s"] or 0 for result in ordered)
+    report = {
+        "sets": ordered,
+        "workers": workers,
+        "ok": sum(result["status"] == "ok" for result in ordered),
+        "failed": sum(result["status"] != "ok" for result in ordered),
+        "wall_s": round(wall, 3),
+        "sum_s": round(busy, 3),
+        "concurrency": round(busy / wall, 2) if wall else None,
+    }
+    (folder / REPORT_NAME).write_text(json.dumps(report, indent=1), encoding="utf-8")
+    return report
+
+def report_table(report: dict) -> list[str]:
+    """The batch report as aligned text lines."""
+    width = max([len(result["name"]) for result in report["sets"]] + [4])
+    lines = [f"{'Set'.ljust(width)} {'Status':<7} {'Time s':>8}  Log", "-" * (width + 30)]
+    for result in report["sets"]:
+        elapsed = f"{result['elapsed_s']:.2f}" if result["elapsed_s"] is not None else "-"
+        lines.append(f"{result['name'].ljust(width)} {result['status']:<7} {elapsed:>8}  {result['log']}")
+        if result["error"]:
+            lines.append(f"{''.ljust(width)} {result['error']}")
+    lines.append("-" * (width + 30))
+    lines.append(f"{report['ok']} ok, {report['failed']} failed on {report['workers']} worker(s): "
+                 f"{report['wall_s']:.2f}s wall, {report['sum_s']:.2f}s of set time ({report['concurrency']}x concurrency)")
+    return lines
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the weekly report pipeline for many report sets.")
+    parser.add_argument("manifest", help="manifest JSON with the report sets")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--log-dir", default=None, help="per-set logs and batch report (default: <manifest>_logs)")
+    args = parser.parse_args(argv)
+
+    sets = load_manifest(args.manifest)
+    manifest = Path(args.manifest)
+    log_dir = args.log_dir or str(manifest.with_name(f"{manifest.stem}_logs"))
+    report = run_batch(sets, log_dir, args.workers)
+    for line in report_table(report):
+        log.info(line)
+    return 0 if report["failed"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
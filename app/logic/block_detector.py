@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from run_log import get_logger
+from sheet_reader import SparseSheetReader
+from summary_reader import SUMMARY_SHEET
+
+log = get_logger("block_detector")
+
+# Header cells that start every month block, in adjacent columns
+HEADER_SIGNATURE = ("No.", "Month", "Company", "Name of Vessel")
+
+# Columns scanned for the signature (the blocks start in the first columns)
+SCAN_COLUMNS = 12
+
+# Bump when detection changes, so cached results are recomputed
+DETECTOR_VERSION = 1
+
+# Results kept in the cache file (most recent first)
+CACHE_LIMIT = 20
+
+# Months the GUI and the month engine always have; detected blocks beyond them add months 7, 8, ...
+DEFAULT_MONTHS = 6
+
+class ResourceHelper:
+    @staticmethod
+    def get_path(relative_path: str) -> Path:
+        """
+        Get the absolute path of a file relative to the current script's directory.
+
+        Args:
+            relative_path (str): The relative path to the file.
+
+        Returns:
+            Path: The absolute path to the file.
+        """
+        base_path = Path(__file__).parent
+        return base_path / relative_path
+
+# Detected blocks per summary file content hash
+CACHE_PATH = ResourceHelper.get_path('../config/summary_blocks.json')
+
+def file_hash(path: str) -> str:
+    """SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _text(value) -> str | None:
+    return value.strip() if isinstance(value, str) else None
+
+def _is_data_row(number, vessel) -> bool:
+    """A block row holds a shipment when it is numbered or names a vessel."""
+    if isinstance(number, (int, float)) and not isinstance(number, bool):
+        return True
+    return bool(_text(vessel))
+
+def scan_blocks(summary_file: str, sheet_name: str = SUMMARY_SHEET) -> list[dict]:
+    """
+    Find every month block of the summary sheet.
+
+    A block starts with a header row holding HEADER_SIGNATURE in adjacent
+    columns; its data rows are the following rows that are numbered or name
+    a vessel, up to the first row that is neither or the next header row.
+
+    Returns:
+        list[dict]: {"header": 0-based header row (same meaning as the
+        header_monthN config keys), "count": data rows}, in sheet order.
+    """
+    with SparseSheetReader(summary_file, sheet_name) as reader:
+        columns, rows = reader.columns(list(range(1, SCAN_COLUMNS + 1)))
+
+    width = len(HEADER_SIGNATURE)
+
+    def signature_column(row: int) -> int | None:
+        """0-based column where the header signature starts in a row, if any."""
+        cells = [_text(columns[column][row]) for column in range(1, SCAN_COLUMNS + 1)]
+        return next(
+            (index for index in range(SCAN_COLUMNS - width + 1) if tuple(cells[index:index + width]) == HEADER_SIGNATURE),
+            None,
+        )
+
+    blocks = []
+    row = 0
+    while row < rows:
+        start = signature_column(row)
+        if start is None:
+            row += 1
+            continue
+
+        number_column, vessel_column = start + 1, start + 1 + HEADER_SIGNATURE.index("Name of Vessel")
+        count = 0
+        while row + 1 + count < rows:
+            data_row = row + 1 + count
+            if not _is_data_row(columns[number_column][data_row], columns[vessel_column][data_row]):
+                break
+            if signature_column(data_row) is not None:
+                break
+            count += 1
+        # Sheet row is row + 1; the pandas-style header index is one less
+        blocks.append({"header": row, "count": count})
+        row += 1 + count
+    return blocks
+
+def _load_cache() -> dict:
+    try:
+        cache = json.loads(CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return cache if cache.get("version") == DETECTOR_VERSION else {}
+
+def _save_cache(cache: dict) -> None:
+    cache["version"] = DETECTOR_VERSION
+    cache["files"] = dict(list(cache.get("files", {}).items())[:CACHE_LIMIT])
+    temp_path = CACHE_PATH.with_name(CACHE_PATH.name + ".tmp")
+    try:
+        temp_path.write_text(json.dumps(cache, indent=1), encoding="utf-8")
+        os.replace(temp_path, CACHE_PATH)
+    except OSError as e:
+        log.warning(f"Block cache could not be written: {e}")
+
+def detect_blocks(summary_file: str, sheet_name: str = SUMMARY_SHEET) -> list[dict]:
+    """
+    Month blocks of a summary file, cached by the file's content hash.
+
+    Returns:
+        list[dict]: See scan_blocks().
+    """
+    key = f"{file_hash(summary_file)}:{sheet_name}"
+    cache = _load_cache()
+    files = cache.get("files", {})
+    if key in files:
+        log.debug(f"Month blocks of '{summary_file}' taken from the cache")
+        return files[key]["blocks"]
+
+    blocks = scan_blocks(summary_file, sheet_name)
+    log.info(f"{len(blocks)} month block(s) found in '{Path(summary_file).name}': "
+             + ", ".join(f"header {block['header']} ({block['count']} rows)" for block in blocks))
+    cache["files"] = {key: {"file": Path(summary_file).name, "blocks": blocks}, **files}
+    _save_cache(cache)
+    return blocks
+
+def config_values(blocks: list[dict], months: int | None = None) -> dict:
+    """
+    header_monthN / data_count_monthN config values for detected blocks.
+
+    Blocks are assigned to months in sheet order. Every block gets a month
+    (at least DEFAULT_MONTHS, more when the sheet has more blocks, which
+    month_engine.month_specs() picks up); months without a block get 0
+    (disabled), like an unchecked month in the GUI.
+    """
+    months = max(months or DEFAULT_MONTHS, len(blocks))
+    values = {}
+    for month in range(1, months + 1):
+        block = blocks[month - 1] if month <= len(blocks) else {"header": 0, "count": 0}
+        values[f"header_month{month}"] = block["header"]
+        values[f"data_count_month{month}"] = block["count"]
+    return values
+
+def fill_config(json_data: dict) -> bool:
+    """
+    Detect the month blocks when the config has no header_month1 / data_count_month1.
+
+    Returns:
+        bool: True when the config was filled in.
+    """
+    if "header_month1" in json_data and "data_count_month1" in json_data:
+        return False
+    json_data.update(config_values(detect_blocks(json_data["summary_file"])))
+    return True
@@ -0,0 +1,108 @@
+"""
+Headless command line for the Draft pipeline.
+
+Runs the same steps as the GUI without Qt and without touching
+config/inputan.json: every run gets its own config, built from an optional
+config file plus the command line options. From the app folder:
+
+    python -m logic --summary "26 January R2_Margin.xlsx" --draft Draft_weeklyReport.xlsx --week W4
+    python -m logic --config overnight.json --steps add_row,months
+    python -m logic --config overnight.json --dry-run
+
+Header rows and data counts are detected from the summary sheet when neither
+the config file nor --headers/--counts give them.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import sys
+from pathlib import Path
+
+# Keys every run needs (config key -> option), from the config file or the options
+REQUIRED_KEYS = {"summary_file": "--summary", "final_file": "--draft", "selected_week": "--week"}
+
+# Same order as main_logic.STEPS (not imported, so --help stays instant)
+STEPS = ("add_row", "copy_data", "ongoing_month", "months", "export")
+
+def _int_list(text: str) -> list[int]:
+    try:
+        return [int(value) for value in text.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated whole numbers, got {text!r}")
+
+def _step_list(text: str) -> list[str]:
+    return [step.strip() for step in text.split(",") if step.strip()]
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m logic", description="Update a weekly report Draft from a summary file.")
+    parser.add_argument("--config", help="run config JSON (same keys as config/inputan.json); options override it")
+    parser.add_argument("--summary", dest="summary_file", help="summary workbook")
+    parser.add_argument("--draft", dest="final_file", help="Draft workbook to update")
+    parser.add_argument("--week", dest="selected_week", help="report week, e.g. W4")
+    parser.add_argument("--headers", type=_int_list, help="header rows of months 1..N, e.g. 132,260,388,516,643,0")
+    parser.add_argument("--counts", type=_int_list, help="data rows of months 1..N, e.g. 37,40,46,38,3,0")
+    parser.add_argument("--steps", type=_step_list, help=f"comma-separated subset of: {','.join(STEPS)}")
+    parser.add_argument("--export-dir", dest="export_dir", help="also export the tables as partitioned Parquet/CSV here")
+    parser.add_argument("--export-format", dest="export_format", choices=["auto", "parquet", "csv"])
+    parser.add_argument("--log-level", dest="log_level", help="console log level (default INFO)")
+    parser.add_argument("--full", action="store_true", help="rewrite every row, ignoring the fingerprints of the last run")
+    parser.add_argument("--dry-run", action="store_true", help="only report what the run would change")
+    return parser
+
+def build_config(args: argparse.Namespace, parser: argparse.ArgumentParser) -> dict:
+    """The run config: the --config file (if any) with the options applied on top."""
+    config = json.loads(Path(args.config).read_text(encoding="utf-8")) if args.config else {}
+    for key in ("summary_file", "final_file", "selected_week", "export_dir", "export_format", "log_level"):
+        value = getattr(args, key)
+        if value is not None:
+            config[key] = value
+    if args.steps:
+        unknown = [step for step in args.steps if step not in STEPS]
+        if unknown:
+            parser.error(f"unknown step(s): {', '.join(unknown)}")
+        config["steps"] = args.steps
+    if args.full:
+        config["incremental"] = False
+
+    if (args.headers is None) != (args.counts is None):
+        parser.error("--headers and --counts go together")
+    if args.headers is not None:
+        if len(args.headers) != len(args.counts):
+            parser.error("--headers and --counts need one value per month each")
+        for month, (header, count) in enumerate(zip(args.headers, args.counts), start=1):
+            config[f"header_month{month}"] = header
+            config[f"data_count_month{month}"] = count
+
+    missing = [option for key, option in REQUIRED_KEYS.items() if not config.get(key)]
+    if missing:
+        parser.error(f"missing {', '.join(missing)} (or the same keys in --config)")
+    return config
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    config = build_config(args, parser)
+
+    # Ensure stdout is in UTF-8 (in case of non-ASCII characters)
+    if sys.stdout.encoding.lower() != "utf-8":
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
+
+    if args.dry_run:
+        import block_detector
+        import dry_run
+        from run_log import setup_from_config
+
+        setup_from_config(config)
+        block_detector.fill_config(config)
+        diff = dry_run.dry_run(config)
+        print(dry_run.format_diff(diff))
+        return 1 if diff["errors"] else 0
+
+    import main_logic
+
+    return main_logic.run(config)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import weakref
+from typing import Iterable
+
+import pandas as pd
+from openpyxl.utils import column_index_from_string
+
+from run_log import get_tracer, tracing
+from run_report import count_cells
+
+# Cells the pipeline wrote, per workbook: {sheet title: {column index: rows}}.
+# A None column marks the whole sheet, e.g. after rows were inserted or deleted
+_written: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+def mark_written(ws, column: int | None = None, rows: Iterable[int] = ()) -> None:
+    """
+    Record that cells of a worksheet were written.
+
+    Args:
+        ws: openpyxl worksheet.
+        column (int | None): Column index; None marks the whole sheet.
+        rows (Iterable[int]): Sheet rows written in that column.
+    """
+    sheet = _written.setdefault(ws.parent, {}).setdefault(ws.title, {})
+    if column is None:
+        sheet[None] = set()
+    else:
+        sheet.setdefault(column, set()).update(rows)
+
+def written_cells(wb) -> dict[str, dict[int | None, set[int]]]:
+    """Return the cells recorded by mark_written() for a workbook."""
+    return _written.get(wb, {})
+
+def same_value(old, new) -> bool:
+    """
+    Whether a cell holding `old` already holds `new`.
+
+    Like ==, except that a boolean never equals a number: True == 1 in
+    Python, but TRUE and 1 are different cell values in Excel. An int and a
+    float of equal value stay equal, as the file cannot tell them apart
+    (openpyxl saves 5.0 as 5 and reads it back as an int).
+    """
+    return old == new and isinstance(old, bool) == isinstance(new, bool)
+
+def write_cell(ws, row: int, column: int, value) -> bool:
+    """
+    Write one cell unless it already holds the value.
+
+    Returns:
+        bool: True when the cell changed (and was recorded by mark_written()).
+    """
+    cell = ws.cell(row=row, column=column)
+    if same_value(cell.value, value):
+        return False
+    cell.value = value
+    mark_written(ws, column, [row])
+    return True
+
+def python_values(values) -> list:
+    """
+    Convert a column of values to plain Python objects in one pass.
+
+    NaN, NaT and None become None (an empty cell), numpy numbers become int
+    or float and datetime64 values become Timestamps.
+
+    Args:
+        values: Series, numpy array or list.
+
+    Returns:
+        list: One Python value per input value.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values, dtype=object)
+    return series.astype(object).where(series.notna(), None).tolist()
+
+def write_columns(ws, start_row: int, columns: dict, rows: Iterable[int] | None = None) -> int:
+    """
+    Write a block of columns into a worksheet.
+
+    Column letters are resolved to indexes once per column and the values are
+    converted once per column, instead of parsing an 'A12' coordinate and
+    converting a scalar for every cell. Cells that already hold their value
+    are left alone, so only actual changes are recorded by mark_written().
+
+    Args:
+        ws: openpyxl worksheet.
+        start_row (int): Sheet row of the first value of every column.
+        columns (dict): Column letter -> values (Series, array or list).
+        rows (Iterable[int] | None): Row offsets (0 = start_row) to write;
+            every value when None.
+
+    Returns:
+        int: Number of cells whose value changed.
+    """
+    offsets = None if rows is None else sorted(rows)
+    trace = tracing()
+    written = 0
+    for excel_column, values in columns.items():
+        column = column_index_from_string(excel_column)
+        values = python_values(values)
+        targets = range(len(values)) if offsets is None else offsets
+        changed = []
+        for offset in targets:
+            cell = ws.cell(row=start_row + offset, column=column)
+            if not same_value(cell.value, values[offset]):
+                cell.value = values[offset]
+                changed.append(offset)
+        if changed:
+            mark_written(ws, column, (start_row + offset for offset in changed))
+        if trace:
+            _trace_cells(ws.title, excel_column, start_row, changed, values)
+        written += len(changed)
+    count_cells(written=written)
+    return written
+
+def _trace_cells(sheet: str, excel_column: str, start_row: int, offsets, values: list) -> None:
+    """Record every written cell in the debug trace file."""
+    tracer = get_tracer()
+    for offset in offsets:
+        tracer.debug("%s!%s%d = %r", sheet, excel_column, start_row + offset, values[offset])
@@ -1,6 +1,13 @@
 from openpyxl import load_workbook
 import json
 import os
+import time
+
+from column_writer import write_cell
+from run_log import get_logger, get_tracer, step_summary, tracing
+from run_report import count_cells, io_timer
+from sheet_reader import SparseSheetReader
+from workbook_io import save_workbook
 
 class ResourceHelper:
     @staticmethod
@@ -21,22 +28,10 @@ class ResourceHelper:
 # Get the path to the JSON configuration file
 file_path_json = ResourceHelper.get_path('../config/inputan.json')
 
-# Read the JSON configuration file
-with open(file_path_json, 'r') as file:
-    json_data = json.load(file)
+log = get_logger("copy_data")
 
-# Extract source and output file paths from the JSON data
-source_file = json_data["summary_file"]
-output_file = json_data["final_file"]
 sheet_name = 'ITM Summary'  # Specify the sheet name to work with
 
-# Get the header row and maximum number of data rows to copy
-header_row = json_data["header_month1"]
-max_row = json_data["data_count_month1"]
-
-# Get the selected week for data extraction
-selected_week = json_data["selected_week"]
-
 # Mapping of columns for Penalty data based on the selected week
 week_column_map_penalty = {
     'W0': 'AKC', 'W1': 'AKC', 'W2': 'AKC', 'W3': 'AKC', 'W4': 'AKC', 'W5': 'AKC'
@@ -48,17 +43,22 @@ week_column_map_demurrage = {
 }
 
 # Function to copy weekly data to the output worksheet
-def copy_column_data(ws_src, ws_out, week_key, col_map, col_output_index, label):
+def copy_column_data(ws_src, ws_out, week_key, col_map, col_output_index, label, header_row, max_row):
     """
     Copy data from the source worksheet to the output worksheet based on the selected week.
 
     Args:
-        ws_src: Source worksheet object.
+        ws_src: Source sheet reader (SparseSheetReader).
         ws_out: Output worksheet object.
         week_key (str): The key representing the selected week.
         col_map (dict): Mapping of week keys to column letters.
         col_output_index (int): The column index in the output worksheet to copy data to.
         label (str): A label for logging purposes.
+        header_row (int): Header row of the ongoing month block (pandas-style, 0-based).
+        max_row (int): Number of data rows to copy.
+
+    Returns:
+        int: Number of cells whose value changed.
     """
     # Validate if the week key exists in the column mapping
     if week_key not in col_map:
@@ -68,32 +68,42 @@ def copy_column_data(ws_src, ws_out, week_key, col_map, col_output_index, label)
     col_letter = col_map[week_key]
     
     # Validate the header to ensure it matches the expected week key
-    header_check = ws_src[f"{col_letter}{header_row + 1}"].value
+    header_check = ws_src.value(f"{col_letter}{header_row + 1}")
     if header_check != week_key:
         raise ValueError(f"{label}: Validation failed. Cell contents {col_letter}{header_row + 1} = '{header_check}', should be '{week_key}'")
     
     # Copy data from the source worksheet to the output worksheet
     start_row = header_row + 2  # Start copying data from the row after the header
-    for i in range(max_row):
-        value = ws_src[f"{col_letter}{start_row + i}"].value  # Get the value from the source cell
+    trace = tracing()
+    copied = 0
+    values = ws_src.column(col_letter, start_row, start_row + max_row - 1)  # Only this column's cells are parsed
+    for i, value in enumerate(values):
         if value is not None:  # Only copy non-empty values
-            ws_out.cell(row=4 + i, column=col_output_index).value = value  # Write to the output cell
+            copied += write_cell(ws_out, 4 + i, col_output_index, value)  # Write to the output cell (if it changed)
+            if trace:
+                get_tracer().debug("%s %s%d -> column %d row %d = %r", label, col_letter, start_row + i, col_output_index, 4 + i, value)
     
-    print(f"{label} Week '{week_key}' (column {col_letter}) successfully copied to the index column {col_output_index}.")
+    log.info(f"{label} Week '{week_key}' (column {col_letter}) successfully copied to the index column {col_output_index}.")
+    return copied
 
 # Function to copy total values and convert them to negative
-def copy_total_value(ws_src, ws_out, week_key, col_map, output_col_index, label, source_type):
+def copy_total_value(ws_src, ws_out, week_key, col_map, output_col_index, label, source_type, header_row, max_row):
     """
     Copy total values from the source worksheet to the output worksheet and convert them to negative.
 
     Args:
-        ws_src: Source worksheet object.
+        ws_src: Source sheet reader (SparseSheetReader).
         ws_out: Output worksheet object.
         week_key (str): The key representing the selected week.
         col_map (dict): Mapping of week keys to column letters.
         output_col_index (int): The column index in the output worksheet to copy the total value to.
         label (str): A label for logging purposes.
         source_type (str): Either 'boct' or 'mahakam' to determine which row index to use.
+        header_row (int): Header row of the ongoing month block (pandas-style, 0-based).
+        max_row (int): Number of data rows in the ongoing month block.
+
+    Returns:
+        int: Number of cells whose value changed (0 or 1).
     """
     # Validate if the week key exists in the column mapping
     if week_key not in col_map:
@@ -111,7 +121,8 @@ def copy_total_value(ws_src, ws_out, week_key, col_map, output_col_index, label,
         raise ValueError(f"{label}: source_type must be 'boct' or 'mahakam'.")
 
     # Read the value from the source worksheet
-    value = ws_src[f"{col_letter}{row_index}"].value
+    value = ws_src.value(f"{col_letter}{row_index}")
+    copied = 0
 
     # Check if the value is a string with parentheses, indicating a negative number
     if isinstance(value, str) and value.startswith("(") and value.endswith(")"):
@@ -120,64 +131,99 @@ def copy_total_value(ws_src, ws_out, week_key, col_map, output_col_index, label,
             # Attempt to convert the cleaned value to a float
             # Note: This will raise an error if the value contains a comma
             formatted_value = -round(abs(float(cleaned_value)), 2)
-            ws_out.cell(row=4, column=output_col_index).value = formatted_value
-            print(f"{label} from {col_letter}{row_index} = '{value}' copied as '{formatted_value}' to the index column {output_col_index}.")
+            copied = int(write_cell(ws_out, 4, output_col_index, formatted_value))
+            log.info(f"{label} from {col_letter}{row_index} = '{value}' copied as '{formatted_value}' to the index column {output_col_index}.")
         except ValueError:
             # Value is not a valid number
-            print(f"{label} from {col_letter}{row_index} not copied because the value in parentheses is not a valid number: '{value}'")
+            log.warning(f"{label} from {col_letter}{row_index} not copied because the value in parentheses is not a valid number: '{value}'")
 
     # If the value is an integer or float, copy it as-is
     elif isinstance(value, (int, float)):
         formatted_value = round(value, 2)
-        ws_out.cell(row=4, column=output_col_index).value = formatted_value
-        print(f"{label} from {col_letter}{row_index} = '{value}' copied as '{formatted_value}' to the index column {output_col_index}.")
+        copied = int(write_cell(ws_out, 4, output_col_index, formatted_value))
+        log.info(f"{label} from {col_letter}{row_index} = '{value}' copied as '{formatted_value}' to the index column {output_col_index}.")
 
     # If the value is a string without parentheses, try to convert it to a float and copy it
     elif isinstance(value, str):
         try:
             # Note: This will also raise an error if the string uses a comma instead of a dot
             formatted_value = round(float(value), 2)
-            ws_out.cell(row=4, column=output_col_index).value = formatted_value
-            print(f"{label} from {col_letter}{row_index} = '{value}' copied as '{formatted_value}' to the index column {output_col_index}.")
+            copied = int(write_cell(ws_out, 4, output_col_index, formatted_value))
+            log.info(f"{label} from {col_letter}{row_index} = '{value}' copied as '{formatted_value}' to the index column {output_col_index}.")
         except ValueError:
-            print(f"{label} from {col_letter}{row_index} not copied because the value is not a valid number: '{value}'")
+            log.warning(f"{label} from {col_letter}{row_index} not copied because the value is not a valid number: '{value}'")
 
     # If the value is neither numeric nor a numeric string, it will not be copied
     else:
-        print(f"{label} from {col_letter}{row_index} not copied because the value is not a number: '{value}'")
+        log.warning(f"{label} from {col_letter}{row_index} not copied because the value is not a number: '{value}'")
 
+    return copied
 
-# Main Function to perform copying operations
-def main():
-    print("Start the Excel file customization process...")
-    
-    # Load the source and output Excel workbooks
-    wb_source = load_workbook(source_file, data_only=True)
-    ws_source = wb_source[sheet_name]
-    wb_output = load_workbook(output_file)
+
+def process(wb_output, json_data):
+    """
+    Copy the weekly Penalty and Demurrage figures from the summary file into
+    the 'ITM Summary' sheet of an already loaded Draft workbook.
+
+    Args:
+        wb_output: The Draft workbook (openpyxl Workbook) shared by the pipeline.
+        json_data (dict): Run configuration (same keys as config/inputan.json).
+    """
+    log.info("Start the Excel file customization process...")
+    started = time.perf_counter()
+
+    # Get the header row and maximum number of data rows to copy
+    header_row = json_data["header_month1"]
+    max_row = json_data["data_count_month1"]
+
+    # Get the selected week for data extraction
+    selected_week = json_data["selected_week"]
+
+    # Only the week columns and total cells of the summary are read (cached values),
+    # instead of loading the whole summary workbook
+    with io_timer("load"):
+        ws_source = SparseSheetReader(json_data["summary_file"], sheet_name)
     ws_output = wb_output[sheet_name]
+    block = dict(header_row=header_row, max_row=max_row)
+    cells = 0
 
-    # Copy weekly Penalty data to column 81 (CC)
-    copy_column_data(ws_source, ws_output, selected_week, week_column_map_penalty, 81, "Penalty")
+    # Closed even when a header check fails: the warm worker would otherwise keep the summary file locked
+    with ws_source:
+        # Copy weekly Penalty data to column 81 (CC)
+        cells += copy_column_data(ws_source, ws_output, selected_week, week_column_map_penalty, 81, "Penalty", **block)
 
-    # Copy weekly Demurrage data to column 89 (CK)
-    copy_column_data(ws_source, ws_output, selected_week, week_column_map_demurrage, 89, "Demurrage")
+        # Copy weekly Demurrage data to column 89 (CK)
+        cells += copy_column_data(ws_source, ws_output, selected_week, week_column_map_demurrage, 89, "Demurrage", **block)
 
-    # Copy total Penalty BOCT to column 94 (CP)
-    copy_total_value(ws_source, ws_output, selected_week, week_column_map_penalty, 94, "Penalty BOCT", source_type="boct")
+        # Copy total Penalty BOCT to column 94 (CP)
+        cells += copy_total_value(ws_source, ws_output, selected_week, week_column_map_penalty, 94, "Penalty BOCT", source_type="boct", **block)
 
-    # Copy total Penalty Mahakam to column 95 (CQ)
-    copy_total_value(ws_source, ws_output, selected_week, week_column_map_penalty, 95, "Penalty Mahakam", source_type="mahakam")
+        # Copy total Penalty Mahakam to column 95 (CQ)
+        cells += copy_total_value(ws_source, ws_output, selected_week, week_column_map_penalty, 95, "Penalty Mahakam", source_type="mahakam", **block)
 
-    # Copy total Demurrage BOCT to column 96 (CR)
-    copy_total_value(ws_source, ws_output, selected_week, week_column_map_demurrage, 96, "Demurrage BOCT", source_type="boct")
+        # Copy total Demurrage BOCT to column 96 (CR)
+        cells += copy_total_value(ws_source, ws_output, selected_week, week_column_map_demurrage, 96, "Demurrage BOCT", source_type="boct", **block)
 
-    # Copy total Demurrage Mahakam to column 97 (CS)
-    copy_total_value(ws_source, ws_output, selected_week, week_column_map_demurrage, 97, "Demurrage Mahakam", source_type="mahakam")
+        # Copy total Demurrage Mahakam to column 97 (CS)
+        cells += copy_total_value(ws_source, ws_output, selected_week, week_column_map_demurrage, 97, "Demurrage Mahakam", source_type="mahakam", **block)
+
+    count_cells(read=ws_source.cells_read, written=cells)
+    log.debug(f"{ws_source.bytes_read // 1024} KB of summary sheet XML read.")
+    step_summary(log, "Penalty & demurrage", max_row, cells, started)
+
+# Main Function to perform copying operations as a standalone script
+def main():
+    # Read the JSON configuration file
+    with open(file_path_json, 'r') as file:
+        json_data = json.load(file)
+
+    output_file = json_data["final_file"]
+    wb_output = load_workbook(output_file)
+    process(wb_output, json_data)
 
-    # Save the output workbook with the applied changes
-    wb_output.save(output_file)
-    print("Output file is saved successfully.")
+    # Save the output workbook with the applied changes (skipped when none changed)
+    if save_workbook(wb_output, output_file):
+        log.info("Output file is saved successfully.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# Month abbreviations of the 'd.Mmm' labels (index 1 = Jan). Fixed English
+# names, so the labels do not depend on the locale strftime('%b') would use
+MONTH_ABBR = np.array(
+    [None, 'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'],
+    dtype=object,
+)
+
+# Years outside this range come from numbers misread as dates (e.g. 1970)
+MIN_YEAR = 1990
+MAX_YEAR = 2100
+
+def _as_objects(values) -> pd.Series:
+    """Return values as an object Series with a 0-based index."""
+    return pd.Series(values).reset_index(drop=True).astype(object)
+
+def _text(values: pd.Series) -> pd.Series:
+    """Stripped text of the string cells of a column, NaN for every other cell."""
+    is_text = values.map(lambda value: isinstance(value, str))
+    if not is_text.any():
+        return pd.Series(np.nan, index=values.index, dtype=object)
+    return values.where(is_text).str.strip()
+
+def _real_dates(values: pd.Series) -> pd.Series:
+    """Parse the non-text values of a column (datetimes, Timestamps) at once."""
+    text = _text(values)
+    others = values[text.isna() & values.notna()]
+    if others.empty:
+        return pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    parsed = pd.to_datetime(others, errors="coerce")
+    return parsed.reindex(values.index)
+
+def infer_year(*columns, default: int | None = None) -> int:
+    """
+    Guess the year of 'dd/mm' strings from the real dates around them.
+
+    The most common year among the datetime cells of the given columns is
+    used; when there is none the default (current year if omitted) is returned.
+
+    Args:
+        *columns: Summary columns holding dates (Series or lists).
+        default (int | None): Year to fall back to.
+
+    Returns:
+        int: The inferred year.
+    """
+    years = []
+    for column in columns:
+        parsed = _real_dates(_as_objects(column)).dropna()
+        year = parsed.dt.year
+        years.append(year[(year >= MIN_YEAR) & (year <= MAX_YEAR)])
+
+    years = pd.concat(years) if years else pd.Series(dtype="int64")
+    if years.empty:
+        return default if default is not None else date.today().year
+    return int(years.mode().iloc[0])
+
+def parse_dates(values, year: int | None = None) -> pd.Series:
+    """
+    Parse a whole summary column into datetimes in one pass.
+
+    'dd/mm' strings get the given year, other strings and real datetimes are
+    parsed as they are; anything unparseable (NaN, text, 'dd/mm/yyyy') is NaT.
+
+    Args:
+        values: Summary column (Series or list).
+        year (int | None): Year of the 'dd/mm' strings, inferred when omitted.
+
+    Returns:
+        pd.Series: datetime64 Series with a 0-based index.
+    """
+    values = _as_objects(values)
+    if year is None:
+        year = infer_year(values)
+
+    result = _real_dates(values)
+    text = _text(values)
+
+    # 'dd/mm' strings: split the whole column and assemble the dates at once
+    slashed = text.str.contains('/', na=False, regex=False)
+    if slashed.any():
+        parts = text[slashed].str.split('/', n=1, expand=True)
+        result[slashed] = pd.to_datetime(
+            pd.DataFrame({
+                "year": year,
+                "month": pd.to_numeric(parts[1], errors="coerce"),
+                "day": pd.to_numeric(parts[0], errors="coerce"),
+            }),
+            errors="coerce",
+        )
+
+    # Any other text, e.g. '2025-09-05'
+    other_text = text.notna() & (text != '') & ~slashed
+    if other_text.any():
+        result[other_text] = pd.to_datetime(text[other_text], errors="coerce", format="mixed")
+
+    return result
+
+def format_day_month(values, year: int | None = None) -> np.ndarray:
+    """
+    Build the 'd.Mmm' labels (e.g. 5.Sep) of a whole summary column.
+
+    Args:
+        values: Summary column (Series or list).
+        year (int | None): Year of the 'dd/mm' strings, inferred when omitted.
+
+    Returns:
+        np.ndarray: Object array with one label per value, None where the
+        value is not a date.
+    """
+    dates = parse_dates(values, year)
+    labels = np.full(len(dates), None, dtype=object)
+    valid = dates.notna().to_numpy()
+    if valid.any():
+        found = dates[valid]
+        days = found.dt.day.astype(str).to_numpy(dtype=object)
+        labels[valid] = days + '.' + MONTH_ABBR[found.dt.month.to_numpy()]
+    return labels
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import re
+import time
+import zipfile
+
+import add_row
+import copy_data
+import month_engine
+import ongoing_month
+from column_writer import same_value
+from run_log import get_logger
+from sheet_reader import SparseSheetReader
+from summary_reader import SummaryReader
+from xml_patcher import XlsxPackage
+
+log = get_logger("dry_run")
+
+_TABLE_REF_RE = re.compile(r'<table\b[^>]*?\bref="([^"]+)"')
+_REF_ROWS_RE = re.compile(r'^[A-Z]+(\d+):[A-Z]+(\d+)$')
+
+class ShadowCell:
+    """A Draft cell as the steps see it: the saved value until a step assigns one."""
+
+    __slots__ = ("sheet", "row", "column")
+
+    def __init__(self, sheet: "ShadowSheet", row: int, column: int):
+        self.sheet = sheet
+        self.row = row
+        self.column = column
+
+    @property
+    def value(self):
+        key = (self.row, self.column)
+        if key in self.sheet.changes:
+            return self.sheet.changes[key]
+        return self.sheet.original(self.row, self.column)
+
+    @value.setter
+    def value(self, value) -> None:
+        key = (self.row, self.column)
+        if same_value(self.sheet.original(self.row, self.column), value):
+            self.sheet.changes.pop(key, None)
+        else:
+            self.sheet.changes[key] = value
+
+class ShadowSheet:
+    """
+    Read-only stand-in for a Draft worksheet.
+
+    Saved values come from the sheet XML, one parsed row at a time; values
+    the steps assign are kept aside in `changes` (only those that differ).
+    """
+
+    def __init__(self, parent: "ShadowWorkbook", title: str):
+        self.parent = parent
+        self.title = title
+        self.changes: dict[tuple[int, int], object] = {}
+        self._reader = SparseSheetReader(parent.path, title)
+        self._rows: dict[int, dict[int, object]] = {}
+
+    def original(self, row: int, column: int):
+        if row not in self._rows:
+            self._rows[row] = self._reader.row(row)
+        return self._rows[row].get(column)
+
+    def cell(self, row: int, column: int) -> ShadowCell:
+        return ShadowCell(self, row, column)
+
+    def close(self) -> None:
+        self._reader.close()
+
+class ShadowWorkbook:
+    """Just enough of an openpyxl workbook for the copy and month steps to run against."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.sheets: dict[str, ShadowSheet] = {}
+
+    def __getitem__(self, title: str) -> ShadowSheet:
+        if title not in self.sheets:
+            self.sheets[title] = ShadowSheet(self, title)
+        return self.sheets[title]
+
+    def close(self) -> None:
+        for sheet in self.sheets.values():
+            sheet.close()
+
+def table_resizes(final_file: str, json_data: dict) -> list[dict]:
+    """
+    Tables add_row would resize, read from the table parts of the Draft.
+
+    Returns:
+        list[dict]: {"sheet", "table", "rows_before", "rows_after"} per table
+        whose data row count would change.
+    """
+    resizes = []
+    with zipfile.ZipFile(final_file) as archive:
+        tables = XlsxPackage(archive).tables
+        for sheet_name, (data_count, table_name) in add_row.table_counts(json_data).items():
+            if data_count == 0 or table_name not in tables:
+                continue
+            ref = _TABLE_REF_RE.search(archive.read(tables[table_name][1]).decode("utf-8")).group(1)
+            first_row, last_row = map(int, _REF_ROWS_RE.match(ref.replace("$", "")).groups())
+            rows_before = last_row - first_row  # The first row of the ref is the header
+            if rows_before != data_count:
+                resizes.append({"sheet": sheet_name, "table": table_name,
+                                "rows_before": rows_before, "rows_after": data_count})
+    return resizes
+
+def dry_run(json_data: dict) -> dict:
+    """
+    Compute what a run would change in the Draft, without writing it.
+
+    The Draft is never loaded into openpyxl: table sizes come from the table
+    parts and the copy and month steps run against a ShadowWorkbook, which
+    parses only the Draft rows they touch. A cell counts as changed when the
+    value a step writes differs from the value saved in the Draft (for a
+    formula cell, its cached value). Every row is compared, whatever the
+    fingerprints of the last run say.
+
+    Args:
+        json_data (dict): Run configuration (same keys as config/inputan.json).
+
+    Returns:
+        dict: {"sheets": {sheet: changed cells}, "tables": table_resizes(),
+        "cells": total changed cells, "errors": [messages of failed steps],
+        "elapsed_s": seconds}.
+    """
+    started = time.perf_counter()
+    final_file = json_data["final_file"]
+    errors = []
+
+    tables = table_resizes(final_file, json_data)
+    wb = ShadowWorkbook(final_file)
+    summary_columns = {*ongoing_month.summary_columns(), *month_engine.summary_columns()}
+    summary = SummaryReader(json_data["summary_file"], columns=summary_columns)
+    steps = [
+        ("Penalty & demurrage", copy_data.process, (wb, json_data)),
+        ("Ongoing month", ongoing_month.process, (wb, json_data, summary)),
+        ("Months", month_engine.process, (wb, json_data, summary)),
+    ]
+    try:
+        for label, func, args in steps:
+            try:
+                func(*args)
+            except Exception as e:
+                # A bad header row or count shows up here instead of half-way through a real run
+                errors.append(f"{label}: {e}")
+                log.warning(f"Dry run: {label} failed: {e}")
+    finally:
+        summary.close()
+        wb.close()
+
+    sheets = {title: len(sheet.changes) for title, sheet in wb.sheets.items() if sheet.changes}
+    return {
+        "sheets": sheets,
+        "tables": tables,
+        "cells": sum(sheets.values()),
+        "errors": errors,
+        "elapsed_s": round(time.perf_counter() - started, 3),
+    }
+
+def format_diff(diff: dict) -> str:
+    """Describe a dry_run() result in a few lines for the confirmation popup."""
+    lines = [f"Dry run ({diff['elapsed_s']:.1f}s): {diff['cells']:,} cell(s) would change"]
+    resizes = {table["sheet"]: table for table in diff["tables"]}
+    titles = list(diff["sheets"]) + [sheet for sheet in resizes if sheet not in diff["sheets"]]
+    width = max((len(title) for title in titles), default=0)
+    for title in titles:
+        line = f"  {title.ljust(width)} : {diff['sheets'].get(title, 0):,} cell(s)"
+        if title in resizes:
+            table = resizes[title]
+            line += f", {table['table']} {table['rows_before']} -> {table['rows_after']} rows"
+        lines.append(line)
+    if not titles and not diff["errors"]:
+        lines.append("  The Draft is already up to date.")
+    for error in diff["errors"]:
+        lines.append(f"  ERROR {error}")
+    return "\n".join(lines)
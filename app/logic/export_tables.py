@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import re
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+from openpyxl.utils import column_index_from_string
+
+from run_log import get_logger
+from sheet_reader import SparseSheetReader
+from summary_reader import infer_types
+from workbook_io import atomic_path
+from xml_patcher import XlsxPackage
+
+log = get_logger("export_tables")
+
+# Bump when the partition layout or hashing changes, so every partition is rewritten
+EXPORT_VERSION = 1
+
+# Kept in the export folder: content hash of every partition file written
+MANIFEST_NAME = "_export_manifest.json"
+
+# Report tables of the weekly Draft, exported under their own names
+_REPORT_TABLE_RE = re.compile(r'^(TableOngoing|TableMonth\d+)$')
+
+# Sheets whose (single) table is exported under a fixed name
+SHEET_EXPORTS = {"3rd Party": "ThirdParty"}
+
+# Column giving the month partition of a row, first match wins
+MONTH_COLUMNS = ("Month", "Bulan")
+
+_TABLE_REF_RE = re.compile(r'<table\b[^>]*?\bref="([^"]+)"')
+_REF_RE = re.compile(r'^([A-Z]+)(\d+):([A-Z]+)(\d+)$')
+_UNSAFE_RE = r'[\\/:*?"<>|=]'
+
+def export_targets(draft_file: str) -> dict[str, tuple[str, str]]:
+    """
+    Tables of a Draft that are exported.
+
+    Returns:
+        dict: {export name: (sheet name, table ref such as 'A3:CK40')}.
+    """
+    targets = {}
+    with zipfile.ZipFile(draft_file) as archive:
+        for table_name, (sheet_name, part) in XlsxPackage(archive).tables.items():
+            if _REPORT_TABLE_RE.match(table_name):
+                name = table_name
+            elif sheet_name in SHEET_EXPORTS:
+                name = SHEET_EXPORTS[sheet_name]
+            else:
+                continue
+            ref = _TABLE_REF_RE.search(archive.read(part).decode("utf-8")).group(1)
+            targets[name] = (sheet_name, ref.replace("$", ""))
+    return targets
+
+def read_table(draft_file: str, sheet_name: str, ref: str) -> pd.DataFrame:
+    """
+    Cached values of an Excel table as a typed DataFrame (header row as column names).
+
+    Columns are typed like read_excel would: numbers, datetimes, and text
+    (columns mixing text and numbers become text).
+    """
+    first_letter, first_row, last_letter, last_row = _REF_RE.match(ref).groups()
+    first_row, last_row = int(first_row), int(last_row)
+    first_column, last_column = column_index_from_string(first_letter), column_index_from_string(last_letter)
+    with SparseSheetReader(draft_file, sheet_name) as reader:
+        values, _ = reader.columns(list(range(first_column, last_column + 1)), last_row)
+
+    data = {}
+    for offset, column in enumerate(range(first_column, last_column + 1)):
+        header = values[column][first_row - 1]
+        name = str(header).strip() if header is not None else f"Column{offset + 1}"
+        data[name] = values[column][first_row:last_row]
+    frame = infer_types(pd.DataFrame(data, dtype=object))
+    for column in frame.columns[frame.dtypes == object]:
+        frame[column] = frame[column].astype("string")
+    return frame
+
+def month_keys(frame: pd.DataFrame) -> pd.Series:
+    """
+    Month partition of every row: 'YYYY-MM' for a date month column, the
+    (folder-safe) text otherwise, and 'unknown' for rows without a month.
+    """
+    column = next((name for name in MONTH_COLUMNS if name in frame.columns), None)
+    if column is None:
+        return pd.Series("unknown", index=frame.index)
+    months = frame[column]
+    if pd.api.types.is_datetime64_any_dtype(months):
+        return months.dt.strftime("%Y-%m").fillna("unknown")
+    keys = months.astype("string").str.strip().str.replace(_UNSAFE_RE, "_", regex=True)
+    return keys.mask(keys == "").fillna("unknown")
+
+def frame_hash(frame: pd.DataFrame) -> str:
+    """Hash of a partition's content, column names and dtypes included."""
+    digest = hashlib.sha256(json.dumps([[str(name), str(dtype)] for name, dtype in frame.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+def resolve_format(file_format: str) -> str:
+    """'parquet' or 'csv'; 'auto' picks Parquet when pyarrow is installed."""
+    if file_format == "auto":
+        return "parquet" if importlib.util.find_spec("pyarrow") else "csv"
+    if file_format not in ("parquet", "csv"):
+        raise ValueError(f"Unknown export format: {file_format!r}")
+    return file_format
+
+def _write_partition(frame: pd.DataFrame, path: Path, file_format: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with atomic_path(str(path)) as temp_path:
+        if file_format == "parquet":
+            frame.to_parquet(temp_path, index=False)
+        else:
+            frame.to_csv(temp_path, index=False, encoding="utf-8", date_format="%Y-%m-%d %H:%M:%S")
+
+def _load_manifest(out_dir: Path) -> dict:
+    try:
+        manifest = json.loads((out_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return manifest.get("partitions", {}) if manifest.get("version") == EXPORT_VERSION else {}
+
+def _save_manifest(out_dir: Path, partitions: dict) -> None:
+    with atomic_path(str(out_dir / MANIFEST_NAME)) as temp_path:
+        Path(temp_path).write_text(json.dumps({"version": EXPORT_VERSION, "partitions": partitions}, indent=1),
+                                   encoding="utf-8")
+
+def export_workbook(draft_file: str, out_dir: str, week: str | None = None, file_format: str = "auto") -> dict:
+    """
+    Export the report tables of a Draft as partitioned Parquet or CSV files.
+
+    Every table is split by month (from its Month/Bulan column) and, when a
+    week is given, filed under that report week:
+
+        <out_dir>/<table>/week=W4/month=2025-01/part.parquet
+
+    so Power BI can read the folder as an incrementally refreshable source.
+    A partition whose content hash matches the manifest is not rewritten;
+    partitions of the same table and week that no longer have rows are removed.
+
+    Args:
+        draft_file (str): Saved Draft (or 3rd-party Draft) workbook.
+        out_dir (str): Export folder.
+        week (str | None): Report week (selected_week), or None for no week level.
+        file_format (str): 'parquet', 'csv' or 'auto'.
+
+    Returns:
+        dict: Partitions written, unchanged and removed, and the format used.
+    """
+    file_format = resolve_format(file_format)
+    extension = "parquet" if file_format == "parquet" else "csv"
+    out = Path(out_dir)
+    manifest = _load_manifest(out)
+    stats = {"format": file_format, "tables": 0, "written": 0, "unchanged": 0, "removed": 0}
+
+    for name, (sheet_name, ref) in export_targets(draft_file).items():
+        frame = read_table(draft_file, sheet_name, ref)
+        scope = f"{name}/week={week}/" if week else f"{name}/"
+        current = set()
+        for month, partition in frame.groupby(month_keys(frame), sort=True):
+            key = f"{scope}month={month}/part.{extension}"
+            current.add(key)
+            digest = frame_hash(partition.reset_index(drop=True))
+            if manifest.get(key) == digest and (out / key).exists():
+                stats["unchanged"] += 1
+                continue
+            _write_partition(partition, out / key, file_format)
+            manifest[key] = digest
+            stats["written"] += 1
+
+        # Months that lost all their rows since the last export of this table and week
+        for key in [key for key in manifest if key.startswith(scope) and key not in current
+                    and (week or "/week=" not in key)]:
+            path = out / key
+            if path.exists():
+                path.unlink()
+                if not any(path.parent.iterdir()):
+                    path.parent.rmdir()
+            del manifest[key]
+            stats["removed"] += 1
+        stats["tables"] += 1
+
+    out.mkdir(parents=True, exist_ok=True)
+    _save_manifest(out, manifest)
+    log.info(f"{stats['tables']} table(s) exported as {file_format} to '{out}': {stats['written']} partition(s) "
+             f"written, {stats['unchanged']} unchanged, {stats['removed']} removed.")
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the Draft tables as partitioned Parquet/CSV files.")
+    parser.add_argument("draft_file", help="Draft workbook (weekly report or 3rd party)")
+    parser.add_argument("out_dir", help="export folder")
+    parser.add_argument("--week", default=None, help="report week partition, e.g. W4")
+    parser.add_argument("--format", dest="file_format", default="auto", choices=["auto", "parquet", "csv"])
+    args = parser.parse_args(argv)
+    export_workbook(args.draft_file, args.out_dir, args.week, args.file_format)
+
+if __name__ == "__main__":
+    main()
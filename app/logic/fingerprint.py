@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from run_log import get_logger
+
+log = get_logger("fingerprint")
+
+# Bump when the hashing scheme or the values it hashes change, so old sidecars
+# are ignored (2: summary columns hashed with the dtypes SummaryReader declares)
+FINGERPRINT_VERSION = 2
+
+def sidecar_path(draft_path: str) -> Path:
+    """Return the fingerprint file stored next to a Draft workbook."""
+    draft = Path(draft_path)
+    return draft.with_name(f"{draft.stem}.fingerprints.json")
+
+def _draft_stamp(draft_path: str) -> dict:
+    """Size and modification time identifying the Draft the hashes describe."""
+    stat = os.stat(draft_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+def row_hashes_from_columns(columns: dict[str, list], rows: int) -> list[str]:
+    """
+    Hash every row of a column block ({column letter: values}).
+
+    Used for month patches, so a row hash covers the values that will be
+    written, derived columns (No Mahakam, Type of Shipment) included.
+    """
+    letters = sorted(columns)
+    hashes = []
+    for offset in range(rows):
+        row = tuple(repr(columns[letter][offset]) for letter in letters)
+        hashes.append(hashlib.blake2b(repr(row).encode("utf-8"), digest_size=8).hexdigest())
+    return hashes
+
+def row_hashes_from_frame(frame: pd.DataFrame) -> list[str]:
+    """Hash every row of a DataFrame (vectorised, index ignored)."""
+    if frame.empty:
+        return []
+    return [format(value, "016x") for value in pd.util.hash_pandas_object(frame, index=False)]
+
+class FingerprintStore:
+    """
+    Per-row content hashes of what the pipeline last wrote to each Draft sheet.
+
+    The hashes live in '<draft>.fingerprints.json' next to the Draft. They are
+    trusted only while the Draft still has the size and modification time
+    recorded after the last successful run; otherwise every row counts as
+    changed and the run is a full one.
+    """
+
+    def __init__(self, draft_path: str, targets: dict | None = None):
+        self.draft_path = draft_path
+        self.targets: dict[str, list[str]] = targets or {}
+
+    @classmethod
+    def load(cls, draft_path: str) -> "FingerprintStore":
+        """Load the sidecar of a Draft, or start empty when it is missing or stale."""
+        path = sidecar_path(draft_path)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return cls(draft_path)
+
+        if data.get("version") != FINGERPRINT_VERSION or data.get("draft") != _draft_stamp(draft_path):
+            log.info("Fingerprints do not match the Draft file, running a full update.")
+            return cls(draft_path)
+        return cls(draft_path, data.get("targets", {}))
+
+    def changed_rows(self, target: str, hashes: list[str]) -> set[int]:
+        """
+        Return the row offsets whose hash differs from the last run.
+
+        Args:
+            target (str): Draft sheet the rows are written to.
+            hashes (list[str]): Hash of every row that is about to be written.
+        """
+        previous = self.targets.get(target, [])
+        return {
+            offset for offset, value in enumerate(hashes)
+            if offset >= len(previous) or previous[offset] != value
+        }
+
+    def update(self, target: str, hashes: list[str]) -> None:
+        """Record the row hashes written to a target sheet."""
+        self.targets[target] = list(hashes)
+
+    def save(self) -> None:
+        """Write the sidecar, stamped with the Draft as it is on disk now."""
+        data = {
+            "version": FINGERPRINT_VERSION,
+            "draft": _draft_stamp(self.draft_path),
+            "targets": self.targets,
+        }
+        sidecar_path(self.draft_path).write_text(json.dumps(data, indent=1), encoding="utf-8")
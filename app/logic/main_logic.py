@@ -3,31 +3,185 @@ import sys
 import io
 import json
 import os
+import time
 from pathlib import Path
 
+from openpyxl import load_workbook
+
 # Importing various modules for processing different steps
 import add_row
+import block_detector
 import copy_data
+import export_tables
 import ongoing_month
-import month_1
-import month_2
-import month_3
-import month_4
-import month_5
-import month_6
-import save  # Import the save module for saving the final output
-
-def run_step(func, label: str) -> None:
+import month_engine
+import run_report
+import recalc  # Formula recalculation that replaces the Excel autosave
+from column_writer import written_cells
+from fingerprint import FingerprintStore
+from run_log import get_logger, setup_from_config
+from summary_reader import SummaryReader
+from workbook_io import save_workbook
+
+log = get_logger("main_logic")
+
+# Draft steps in pipeline order; the "steps" config key selects a subset
+STEPS = ("add_row", "copy_data", "ongoing_month", "months", "export")
+
+def selected_steps(json_data: dict) -> set[str]:
+    """
+    Steps a run executes: every step unless the config lists some in "steps".
+
+    Raises:
+        ValueError: If "steps" names an unknown step.
+    """
+    steps = json_data.get("steps") or STEPS
+    unknown = [step for step in steps if step not in STEPS]
+    if unknown:
+        raise ValueError(f"Unknown step(s) {unknown}; choose from {list(STEPS)}")
+    return set(steps)
+
+def run_step(func, label: str, *args):
     """
-    Run a specified function and print the status.
+    Run a specified function and log its status and elapsed time.
 
     Args:
-        func: The function to run (should have a main() method).
+        func: The function to run (a step's process() or main() function).
         label (str): A label for logging purposes to indicate which step is being executed.
+        *args: Arguments forwarded to the function (e.g. the shared workbook and config).
+
+    Returns:
+        Whatever the function returns.
+    """
+    # The extra fields let a listener (the GUI worker) report step progress
+    log.info(f"Running {label}...", extra={"step": label, "state": "started"})
+    started = time.perf_counter()
+    with run_report.step(label):  # Timing, memory and cell counts for the run report
+        result = func(*args)  # Call the step function with the shared arguments
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    log.info(
+        f"{label} success ({elapsed_ms:.0f} ms).",  # Indicate that the step was successful
+        extra={"step": label, "state": "finished", "elapsed_ms": round(elapsed_ms)},
+    )
+    return result
+
+def summary_columns() -> set[str]:
+    """Names of every summary column the ongoing month and month steps map."""
+    return {*ongoing_month.summary_columns(), *month_engine.summary_columns()}
+
+def run_pipeline(json_data: dict) -> None:
+    """
+    Run every Draft step against a single in-memory workbook.
+
+    The Draft is loaded once, passed to each step's process() function and
+    saved once at the end, instead of every step loading and saving it again.
+    The save is atomic and skipped when no step changed anything.
+    Unless "incremental" is false in the config, rows whose content did not
+    change since the last run (per the fingerprint sidecar) are not rewritten.
+    Every step is measured into a run report saved next to the Draft. With
+    "export_dir" set, the tables are also exported for Power BI
+    (see export_tables.export_workbook). "steps" limits the run to some
+    of STEPS.
+
+    Args:
+        json_data (dict): Run configuration (same keys as config/inputan.json).
+    """
+    final_file = json_data["final_file"]
+    steps = selected_steps(json_data)
+
+    with run_report.run(final_file, json_data):
+        # Load the Draft workbook once for the whole pipeline
+        started = time.perf_counter()
+        with run_report.step("Load Draft"), run_report.io_timer("load"):
+            wb = load_workbook(final_file)
+            run_report.count_cells(read=sum(len(ws._cells) for ws in wb.worksheets))
+            # Formula values Excel cached last time, kept for formulas the run does not affect
+            cached = recalc.read_cached_values(final_file)
+        load_seconds = time.perf_counter() - started
+        log.info(f"Draft workbook loaded in {load_seconds:.2f}s")
+
+        # The 'ITM Summary' sheet is parsed once, only in the mapped columns, and shared by every month step
+        with SummaryReader(json_data["summary_file"], columns=summary_columns()) as summary:
+            # Row fingerprints of the last run decide which months and rows are rewritten
+            fingerprints = FingerprintStore.load(final_file) if json_data.get("incremental", True) else None
+
+            steps_run = 0
+            if "add_row" in steps:
+                run_step(add_row.process,       "Process add_row", wb, json_data)  # Add rows to the Excel file
+                steps_run += 1
+            if "copy_data" in steps:
+                run_step(copy_data.process,     "Process penalty & demurrage", wb, json_data)  # Copy penalty and demurrage data
+                steps_run += 1
+            # Process ongoing month data
+            if "ongoing_month" in steps:
+                steps_run += run_step(ongoing_month.process, "Process ongoing month", wb, json_data, summary, fingerprints)
+
+            # Months 1-N: patches of every month with data are computed together and merged
+            if "months" in steps:
+                steps_run += run_step(month_engine.process, "Process months", wb, json_data, summary, fingerprints)
+
+        # Save the Draft workbook once, after every step has written into it;
+        # a run that changed nothing leaves the file as it was
+        started = time.perf_counter()
+        # Excel recomputes every formula on open, whatever the recalculation below covers
+        wb.calculation.fullCalcOnLoad = True
+        with run_report.step("Save Draft"), run_report.io_timer("save"):
+            saved = save_workbook(wb, final_file)
+        save_seconds = time.perf_counter() - started
+        if saved:
+            log.info(f"Draft workbook saved in {save_seconds:.2f}s")
+
+            # openpyxl saves formulas without values: recompute the affected ones and
+            # store every formula's value in the file, so no Excel instance is needed
+            run_step(recalculate_draft, "Recalculate formulas", wb, final_file, cached)
+        wb.close()
+
+        # Optional columnar copy of the tables for Power BI; unchanged partitions stay as they are
+        if json_data.get("export_dir") and "export" in steps:
+            run_step(export_tables.export_workbook, "Export tables", final_file, json_data["export_dir"],
+                     json_data.get("selected_week"), json_data.get("export_format", "auto"))
+
+        # Only a successfully saved Draft gets new fingerprints
+        if fingerprints is not None:
+            fingerprints.save()
+
+        report_io_savings(steps_run, load_seconds, save_seconds)
+        log.info(f"Summary sheet parsed {summary.parse_count} time(s) for all month steps")
+
+def recalculate_draft(wb, final_file: str, cached: dict) -> None:
+    """
+    Store formula values in the saved Draft.
+
+    Args:
+        wb: The Draft workbook as it was just saved.
+        final_file (str): Path of the saved Draft.
+        cached (dict): Formula values cached in the Draft before the run.
+    """
+    stats = recalc.recalculate(wb, final_file, cached, written_cells(wb))
+    log.info(
+        f"{stats['formulas']} formula(s): {stats['recomputed']} recomputed, "
+        f"{stats['formulas'] - stats['recomputed']} kept their cached value."
+    )
+
+def report_io_savings(steps_run: int, load_seconds: float, save_seconds: float) -> None:
+    """
+    Print how much time the former per-step load/save cycles would have cost.
+
+    Before the single-load pipeline every step loaded and saved the Draft on
+    its own, so that cost is estimated as one measured load/save cycle per step.
+
+    Args:
+        steps_run (int): Number of steps that ran against the Draft.
+        load_seconds (float): Measured time of the single Draft load.
+        save_seconds (float): Measured time of the single Draft save.
     """
-    print(f"Running {label}...")  # Print status before starting the function
-    func.main()  # Call the main method of the specified function
-    print(f"{label} success.", flush=True)  # Indicate that the step was successful
+    cycle = load_seconds + save_seconds
+    legacy = cycle * steps_run
+    log.info(
+        f"Draft I/O: {cycle:.2f}s for one load/save cycle; "
+        f"{steps_run} separate cycles would have cost ~{legacy:.2f}s "
+        f"(~{legacy - cycle:.2f}s saved)."
+    )
 
 class ResourceHelper:
     @staticmethod
@@ -44,43 +198,53 @@ class ResourceHelper:
         # Use pathlib.Path to get the file path
         base_path = Path(__file__).parent
         return base_path / relative_path
-    
+
+def run(json_data: dict) -> int:
+    """
+    Run the whole pipeline for one run config.
+
+    The config is used as given (nothing is read from or written to
+    config/inputan.json), so callers such as the CLI can build one per run.
+
+    Args:
+        json_data (dict): Run configuration (same keys as config/inputan.json).
+
+    Returns:
+        int: Exit code, 0 on success (errors are raised).
+    """
+    # Console level and the optional per-cell trace file come from the config
+    setup_from_config(json_data)
+
+    # A config without month rows gets them detected from the summary sheet
+    if block_detector.fill_config(json_data):
+        log.info("Month blocks detected from the summary file")
+
+    log.info("Starting execution...\n")  # Indicate the start of the execution process
+
+    # Run every Draft step with a single load and a single save
+    run_pipeline(json_data)
+
+    log.info("\nExecution completed.")  # Indicate that the execution has finished
+    log.info("Automation completed successfully!")  # Final success message
+    return 0
+
+def main(cfg_path: str | Path | None = None) -> int:
+    """
+    Read the run config and run the whole pipeline.
+
+    Args:
+        cfg_path (str | Path | None): Config file; config/inputan.json by default.
+
+    Returns:
+        int: Exit code, 0 on success (errors are raised).
+    """
+    # Read configuration from the JSON file
+    cfg_path = Path(cfg_path) if cfg_path else ResourceHelper.get_path('../config/inputan.json')
+    return run(json.loads(cfg_path.read_text(encoding="utf-8")))
+
 if __name__ == "__main__":
     # Ensure stdout is in UTF-8 (in case of non-ASCII characters)
     if sys.stdout.encoding.lower() != "utf-8":
         sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
 
-    # Read configuration from the JSON file
-    cfg_path = ResourceHelper.get_path('../config/inputan.json')
-    json_data = json.loads(cfg_path.read_text(encoding="utf-8"))
-
-    print("Starting execution...\n")  # Indicate the start of the execution process
-
-    # Mandatory steps that must be executed
-    run_step(add_row,       "Process add_row")  # Add rows to the Excel file
-    run_step(copy_data,     "Process penalty & demurrage")  # Copy penalty and demurrage data
-    run_step(ongoing_month, "Process ongoing month")  # Process ongoing month data
-
-    # Conditional steps for processing months 1-4 based on data availability
-    months = [
-        ("data_count_month1", month_1, "Process month 1"),
-        ("data_count_month2", month_2, "Process month 2"),
-        ("data_count_month3", month_3, "Process month 3"),
-        ("data_count_month4", month_4, "Process month 4"),
-        ("data_count_month5", month_5, "Process month 5"),
-        ("data_count_month6", month_6, "Process month 6"),
-    ]
-
-    # Iterate through each month and run the corresponding module if data is available
-    for key, module, label in months:
-        if json_data.get(key, 0) > 0:  # Check if there is data to process for the month
-            run_step(module, label)  # Run the processing function for the month
-        else:
-            print(f"{label} skipped, data does not change")  # Indicate that the step was skipped
-
-    # Finally, run the save step to save the changes made to the Excel file
-    run_step(save, "Autosave Excel draft")  # This calls the main() function in save.py
-
-    print("\nExecution completed.")  # Indicate that the execution has finished
-    print("Automation completed successfully!", flush=True)  # Final success message
-    sys.exit(0)  # Exit the program with a success status
\ No newline at end of file
+    sys.exit(main())  # Exit the program with a success status
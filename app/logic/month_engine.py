@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import openpyxl
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from column_writer import python_values, write_columns
+from fingerprint import row_hashes_from_columns
+from run_log import get_logger, step_summary
+from summary_reader import SummaryReader
+from workbook_io import save_workbook
+
+# Class to help with file path management
+class ResourceHelper:
+    @staticmethod
+    def get_path(relative_path: str) -> str:
+        """
+        Get the absolute path of a file relative to the current script's directory.
+
+        Args:
+            relative_path (str): The relative path to the file.
+
+        Returns:
+            str: The absolute path to the file.
+        """
+        # Get the directory of the current script and join it with the relative path
+        base_path = os.path.dirname(os.path.abspath(__file__))
+        return os.path.join(base_path, relative_path)
+
+# Get the path to the JSON configuration file
+file_path_json = ResourceHelper.get_path('../config/inputan.json')
+
+log = get_logger("month_engine")
+
+# Column Mapping (summary column -> Draft column), shared by every 'Month N' sheet
+columns_to_update = {
+    "No.": "A",
+    "Month": "C",
+    "Company": "D",
+    "Name of Vessel": "F",
+    "Buyer": "G",
+    "End user": "H",
+    "Load Port": "I",
+    "ETA/ATA": "J",
+    "ETB": "K",
+    "ETD": "L",
+    "Total": "BD",
+    "Lay": "BE",
+    "can": "BF",
+    "%": "BG",
+    "Status": "BH",
+
+    "TM (AR)": "BJ",
+    "M (AD)": "BK",
+    "ASH (AD)": "BL",
+    "ASH (AR)": "BM",
+    "TS (AD)": "BN",
+    "TS (AR)": "BO",
+    "CV (AD)": "BP",
+    "CV (AR)": "BQ",
+    "CV (NAR)": "BR"
+}
+
+START_ROW = 4  # The first row of data in every 'Month N' sheet
+
+# Below this many rows in total the months are computed in-process, because
+# starting worker processes costs more than the work itself
+PARALLEL_MIN_ROWS = 2000
+
+def month_spec(month: int) -> dict:
+    """
+    Describe where month N lives in the config and in the Draft.
+
+    Args:
+        month (int): Month number, 1 for the most recent closed month.
+
+    Returns:
+        dict: The header key, data-count key, target sheet, table name and log label.
+    """
+    return {
+        "month": month,
+        "header_key": f"header_month{month}",
+        "count_key": f"data_count_month{month}",
+        "sheet": f"Month {month}",
+        "table": f"TableMonth{month}",
+        "label": f"Process month {month}",
+    }
+
+# Months handled by default; a config with header_month7/data_count_month7
+# (and a 'Month 7' sheet in the Draft) extends the table automatically
+MONTH_SPECS = [month_spec(month) for month in range(1, 7)]
+
+def month_specs(json_data: dict) -> list[dict]:
+    """
+    Return the month specs for a run: the default six plus any further month
+    whose header and data-count keys are present in the config.
+    """
+    specs = list(MONTH_SPECS)
+    month = len(specs) + 1
+    while f"header_month{month}" in json_data and f"data_count_month{month}" in json_data:
+        specs.append(month_spec(month))
+        month += 1
+    return specs
+
+def summary_columns() -> list[str]:
+    """Summary columns the month steps read."""
+    return list(columns_to_update)
+
+def compute_month_patch(spec: dict, data_summary, data_count: int) -> dict:
+    """
+    Work out every cell value one 'Month N' sheet receives, without touching
+    the workbook. The function only depends on its arguments so it can run in
+    a worker process.
+
+    Args:
+        spec (dict): Month spec from month_spec().
+        data_summary (pd.DataFrame): Summary block of the month (stripped column names).
+        data_count (int): Number of data rows to fill.
+
+    Returns:
+        dict: Patch with the target sheet, the first row and a mapping of
+        Draft column letter -> list of values (one per row from START_ROW).
+    """
+    rows = min(len(data_summary), data_count)  # Limit the number of rows being filled
+    columns: dict[str, list] = {}
+    missing = []
+
+    # Copy every mapped summary column into its Draft column
+    for column_name, excel_column in columns_to_update.items():
+        if column_name not in data_summary.columns:
+            missing.append(column_name)
+            continue
+        columns[excel_column] = python_values(data_summary[column_name].iloc[:rows])
+
+    # "No Mahakam" (column B): 0 for BoCT, a running number for every other port
+    load_ports = columns.get(columns_to_update["Load Port"], [None] * rows)
+    no_mahakam = 1
+    numbers = []
+    for load_port in load_ports:
+        if load_port == 'BoCT':
+            numbers.append(0)
+        else:
+            numbers.append(no_mahakam)
+            no_mahakam += 1
+    columns["B"] = numbers
+
+    # "Type of Shipment" (column E) based on the Name of Vessel
+    shipment_types = []
+    for name_of_vessel in columns.get(columns_to_update["Name of Vessel"], [None] * rows):
+        shipment_type = None
+        if isinstance(name_of_vessel, str):
+            name_of_vessel_upper = name_of_vessel.upper()
+            if name_of_vessel_upper.startswith('MV'):
+                shipment_type = 'Vessel'
+            elif name_of_vessel_upper.startswith('BG'):
+                shipment_type = 'Direct Shipment'
+            elif 'DUMP TRUCK' in name_of_vessel_upper:
+                shipment_type = 'Dump Truck'
+        shipment_types.append(shipment_type)
+    columns["E"] = shipment_types
+
+    return {
+        "month": spec["month"],
+        "sheet": spec["sheet"],
+        "start_row": START_ROW,
+        "rows": rows,
+        "columns": columns,
+        "missing": missing,
+    }
+
+def apply_patch(wb, patch: dict, rows: set[int] | None = None) -> int:
+    """
+    Write a computed month patch into the Draft workbook.
+
+    Args:
+        wb: The Draft workbook (openpyxl Workbook).
+        patch (dict): Patch returned by compute_month_patch().
+        rows (set[int] | None): Row offsets to write; all rows when None.
+
+    Returns:
+        int: Number of cells written.
+    """
+    return write_columns(wb[patch["sheet"]], patch["start_row"], patch["columns"], rows)
+
+def _month_job(spec: dict, json_data: dict, summary: SummaryReader) -> tuple:
+    """Build the (spec, summary block, data count) arguments for one month."""
+    data_count = json_data[spec["count_key"]]
+    data_summary = summary.frame(json_data[spec["header_key"]], data_count)
+
+    # Clean up column names by stripping excess whitespace
+    data_summary.columns = data_summary.columns.str.strip()
+
+    # Only ship the mapped columns and needed rows to the worker process
+    wanted = [name for name in columns_to_update if name in data_summary.columns]
+    data_summary = data_summary.loc[:, wanted].iloc[:data_count]
+    return spec, data_summary, data_count
+
+def compute_patches(jobs: list[tuple], workers: int | None = None) -> list[dict]:
+    """
+    Compute the patches of several months, in parallel when it pays off.
+
+    Args:
+        jobs (list[tuple]): (spec, summary block, data count) per month.
+        workers (int | None): Maximum worker processes; 1 forces serial work.
+
+    Returns:
+        list[dict]: Patches in the same order as the jobs.
+    """
+    if workers is None:
+        workers = min(len(jobs), os.cpu_count() or 1)
+    total_rows = sum(data_count for _, _, data_count in jobs)
+
+    if workers <= 1 or len(jobs) <= 1 or total_rows < PARALLEL_MIN_ROWS:
+        return [compute_month_patch(*job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(compute_month_patch, *job) for job in jobs]
+        return [future.result() for future in futures]
+
+def process(wb, json_data, summary=None, fingerprints=None) -> int:
+    """
+    Fill every enabled 'Month N' sheet of an already loaded Draft workbook.
+
+    The cell patches of all enabled months are computed first (in a process
+    pool for large runs) and then merged into the workbook in one serial pass.
+    With a fingerprint store only the rows whose content changed since the
+    last run are written, and unchanged months are skipped entirely.
+
+    Args:
+        wb: The Draft workbook (openpyxl Workbook) shared by the pipeline.
+        json_data (dict): Run configuration (same keys as config/inputan.json).
+        summary (SummaryReader): Shared parse-once reader of the summary file;
+            a private one is created when omitted.
+        fingerprints (FingerprintStore): Row hashes of the last run, or None
+            to write every row.
+
+    Returns:
+        int: Number of months that were written to.
+    """
+    if summary is None:
+        with SummaryReader(json_data["summary_file"], columns=summary_columns()) as summary:
+            return process(wb, json_data, summary, fingerprints)
+
+    jobs = []
+    for spec in month_specs(json_data):
+        # Check if there is data to process for the month
+        if json_data.get(spec["count_key"], 0) > 0:
+            jobs.append(_month_job(spec, json_data, summary))
+        else:
+            log.info(f"{spec['label']} skipped, data does not change")
+
+    patches = compute_patches(jobs, json_data.get("month_workers"))
+
+    # Merge the patches into the workbook one month after the other
+    processed = 0
+    for patch in patches:
+        for column_name in patch["missing"]:
+            log.warning(f"Column '{column_name}' Not Found in file B.")  # Handle missing columns
+
+        rows = None
+        if fingerprints is not None:
+            hashes = row_hashes_from_columns(patch["columns"], patch["rows"])
+            rows = fingerprints.changed_rows(patch["sheet"], hashes)
+            fingerprints.update(patch["sheet"], hashes)
+            if not rows:
+                log.info(f"Month {patch['month']} skipped, rows unchanged since the last run")
+                continue
+
+        started = time.perf_counter()
+        written = apply_patch(wb, patch, rows)
+        row_count = patch["rows"] if rows is None else len(rows)
+        step_summary(log, f"Month {patch['month']} ('{patch['sheet']}')", row_count, written, started)
+        processed += 1
+
+    return processed
+
+# Main function: run the month steps on their own, loading and saving the Draft itself
+def main():
+    log.info("month processing")
+
+    # Read the JSON configuration file
+    with open(file_path_json, 'r') as file:
+        json_data = json.load(file)
+
+    data_final_path = json_data["final_file"]
+
+    # Load the workbook from the final data file, process it and save it back
+    wb = openpyxl.load_workbook(data_final_path)
+    process(wb, json_data)
+    save_workbook(wb, data_final_path)
+    wb.close()
+
+    log.info("The columns have been successfully updated and saved back to the same file... :)")
+
+# Run main function if script executed directly
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,16 @@
 import openpyxl
-import pandas as pd
+import numpy as np
 import json
 import os
+import time
+from openpyxl.utils import column_index_from_string
+
+from column_writer import python_values, write_columns
+from date_format import format_day_month, infer_year
+from fingerprint import row_hashes_from_frame
+from run_log import get_logger, step_summary
+from summary_reader import SummaryReader
+from workbook_io import save_workbook
 
 # Class to help with file path management
 class ResourceHelper:
@@ -13,187 +22,221 @@ class ResourceHelper:
 # Get the path to the JSON configuration file
 file_path_json = ResourceHelper.get_path('../config/inputan.json')
 
-# Read the JSON configuration file
-with open(file_path_json, 'r') as file:
-    json_data = json.load(file)
-
-# ======== Path to Excel files ========
-data_final_path = json_data["final_file"]
-data_summary_path = json_data["summary_file"]
-
-# ======== Load data from file B ========
-data_summary = pd.read_excel(data_summary_path, sheet_name='ITM Summary', header=json_data["header_month1"])
-data_summary.columns = data_summary.columns.str.strip()
-
-# Debug
-print("Column names in file B:", data_summary.columns.tolist())
-
-# ======== Load file A and select the sheet ========
-wb = openpyxl.load_workbook(data_final_path)
-ws = wb['ITM Summary']
+log = get_logger("ongoing_month")
 
 # Mapping Column
 columns_to_update = {
-    'No.': 'A', 
-    'Month': 'C', 
-    'Company': 'D', 
+    'No.': 'A',
+    'Month': 'C',
+    'Company': 'D',
     'Name of Vessel': 'F',
-    'Buyer': 'G', 
-    'End user': 'H', 
+    'Buyer': 'G',
+    'End user': 'H',
     'Load Port': 'I',
     'ETA/ATA': 'J',
-    'ETB': 'L', 
-    'ETD': 'N', 
-    'Total': 'BJ', 
-    'Lay': 'BK', 
+    'ETB': 'L',
+    'ETD': 'N',
+    'Total': 'BJ',
+    'Lay': 'BK',
     'can': 'BM',
-    '%': 'BO', 
-    'Status': 'BP', 
-    'TM (AR)': 'BR', 
+    '%': 'BO',
+    'Status': 'BP',
+    'TM (AR)': 'BR',
     'M (AD)': 'BS',
-    'ASH (AD)': 'BT', 
-    'ASH (AR)': 'BU', 
-    'TS (AD)': 'BV', 
+    'ASH (AD)': 'BT',
+    'ASH (AR)': 'BU',
+    'TS (AD)': 'BV',
     'TS (AR)': 'BW',
-    'CV (AD)': 'BX', 
-    'CV (AR)': 'BY', 
+    'CV (AD)': 'BX',
+    'CV (AR)': 'BY',
     'CV (NAR)': 'BZ'
 }
 
-start_row = 4
-end_row = start_row + json_data["data_count_month1"] - 1
-
-# ======== Fill standard columns ========
-for col_name, excel_col in columns_to_update.items():
-    if col_name not in data_summary.columns:
-        print(f"⚠️ Column '{col_name}' not found in file B.")
-        continue
-
-    for i, value in enumerate(data_summary[col_name].iloc[: end_row - start_row + 1]):
-        ws[f"{excel_col}{start_row + i}"] = value
-
-# ======== Format date function ========
-def convert_to_date_format(date_value):
-    """Convert date ke format 'd.Mmm' (contoh: 5.Sep)."""
-    try:
-        if pd.isna(date_value):
-            return None
-
-        if isinstance(date_value, str):
-            # Format dd/mm
-            if '/' in date_value:
-                day, month = date_value.split('/')
-                date_converted = pd.to_datetime(
-                    f"2024-{month}-{day}", format="%Y-%m-%d", errors="coerce"
-                )
-            else:
-                date_converted = pd.to_datetime(date_value, errors="coerce")
+# Mapping of BoCT product columns (Excel column -> summary column)
+mapping_boCT = {
+    'P': 'IMM-WB.HCV.LS',
+    'Q': 'IMM-WB.MCV.HS',
+    'R': 'IMM-EB.MCV.LS',
+    'S': 'IMM-EB.MCV.MS',
+    'T': 'IMM-EB.MCV.HS',
+    'U': 'TCM.HCV.LS',
+    'V': 'TCM.HCV.HS',
+    'W': 'TCM.LCV.MS.HA',
+    'X': 'BEK.MCV.LS',
+    'Y': 'BEK.HCV.MS',
+    'Z': 'JBG',
+    'AA': 'GPK',
+    'AB': 'TIS',
+
+    #Third Party
+    'AC': 'EBH.HCV',
+    'AE': 'KMIA.MCV.LS',
+    'AF': 'BBE.MCV',
+    'AG': 'MBL.MCV',
+    'AH': 'MBL.56.MCV',
+    'AJ': 'EMJ.MCV',
+    'AL': 'KBM.MCV',
+    'AM': 'IKJ.MCV',
+    'AN': 'MKE.LCV',
+    'AQ': 'KJA.LCV.LS',
+    'AS': 'DMP.LCV',
+    'AT': 'MCM.LCV',
+    'AU': 'BMM.LCV',
+    'AW': 'BBA.LCV',
+    'AX': 'MML.LCV',
+    'BA': 'KPM.LCV',
+    'BB': 'KJM.LCV',
+    'BF': 'BUM.LCV',
+    'BG': 'BISM.LCV',
+}
+
+# Date columns formatted as 'd.Mmm' labels (summary column -> Excel column)
+date_labels = {
+    'ETA/ATA': 'K',
+    'ETB': 'M',
+    'ETD': 'O',
+    'Lay': 'BL',
+    'can': 'BN',
+}
+
+def summary_columns() -> list[str]:
+    """Summary columns this step reads."""
+    return [*columns_to_update, *mapping_boCT.values()]
+
+def _written_column(ws, block, col_name, start_row, rows):
+    """
+    Values of a summary column as written to the Draft; rows past the summary
+    block (or the whole column when the summary lacks it) keep the Draft values.
+    """
+    values = python_values(block[col_name]) if col_name in block.columns else []
+    column = column_index_from_string(columns_to_update[col_name])
+    return values + [ws.cell(row=start_row + i, column=column).value for i in range(len(values), rows)]
+
+def process(wb, json_data, summary=None, fingerprints=None):
+    """
+    Fill the 'ITM Summary' sheet of an already loaded Draft workbook with the
+    ongoing month block of the summary file.
+
+    Args:
+        wb: The Draft workbook (openpyxl Workbook) shared by the pipeline.
+        json_data (dict): Run configuration (same keys as config/inputan.json).
+        summary (SummaryReader): Shared parse-once reader of the summary file;
+            a private one is created when omitted.
+        fingerprints (FingerprintStore): Row hashes of the last run; when none
+            of the ongoing month rows changed the sheet is left untouched.
+
+    Returns:
+        bool: True when the sheet was written, False when it was skipped.
+    """
+    if summary is None:
+        with SummaryReader(json_data["summary_file"], columns=summary_columns()) as summary:
+            return process(wb, json_data, summary, fingerprints)
+
+    # ======== Load data from file B ========
+    # Only the block's rows, so the column types come from the block itself
+    data_summary = summary.frame(json_data["header_month1"], json_data["data_count_month1"])
+    data_summary.columns = data_summary.columns.str.strip()
+
+    # Debug
+    log.debug("Column names in file B: %s", data_summary.columns.tolist())
+
+    start_row = 4
+    end_row = start_row + json_data["data_count_month1"] - 1
+
+    # ======== Skip when the ongoing month rows did not change ========
+    if fingerprints is not None:
+        used = [name for name in [*columns_to_update, *mapping_boCT.values()] if name in data_summary.columns]
+        hashes = row_hashes_from_frame(data_summary[used].iloc[: end_row - start_row + 1])
+        changed = fingerprints.changed_rows('ITM Summary', hashes)
+        fingerprints.update('ITM Summary', hashes)
+        if not changed:
+            log.info("Ongoing month skipped, rows unchanged since the last run")
+            return False
+
+    # ======== Select the sheet of file A ========
+    ws = wb['ITM Summary']
+
+    started = time.perf_counter()
+    rows = end_row - start_row + 1
+    block = data_summary.iloc[:rows]
+    cells = 0
+
+    # ======== Fill standard columns ========
+    standard = {}
+    for col_name, excel_col in columns_to_update.items():
+        if col_name not in data_summary.columns:
+            log.warning(f"Column '{col_name}' not found in file B.")
+            continue
+        standard[excel_col] = block[col_name]
+    cells += write_columns(ws, start_row, standard)
+
+    # ======== Format ETA/ATA, ETB, ETD, Lay and Can ========
+    # Whole columns are parsed at once; 'dd/mm' strings get the year of the real dates
+    date_columns = [name for name in date_labels if name in data_summary.columns]
+    year = infer_year(*(block[name] for name in date_columns))
+    for col_name in date_columns:
+        values = block[col_name]
+        # Empty source cells (None, 0, '') leave the label cell untouched
+        filled = np.flatnonzero(values.astype(object).astype(bool).to_numpy()).tolist()
+        cells += write_columns(ws, start_row, {date_labels[col_name]: format_day_month(values, year)}, filled)
+
+    # Load Port and Name of Vessel as just written (the Draft keeps its own when missing)
+    load_ports = _written_column(ws, block, 'Load Port', start_row, rows)
+    vessel_names = _written_column(ws, block, 'Name of Vessel', start_row, rows)
+
+    # ======== No Mahakam based on Load Port ========
+    no_mahakam = 1
+    numbers = []
+    for load_port in load_ports:
+        if load_port == "BoCT":
+            numbers.append(0)
         else:
-            date_converted = pd.to_datetime(date_value, errors="coerce")
-
-        if pd.isna(date_converted):
-            return None
-        return f"{date_converted.day}.{date_converted.strftime('%b')}"
-    except Exception as e:
-        print(f"⚠️ Error converting '{date_value}': {e}")
-        return None
-
-# ======== Format ETA/ATA, ETB, ETD ========
-for row in range(start_row, end_row + 1):
-    for src_col, tgt_col in zip(['J', 'L', 'N'], ['K', 'M', 'O']):
-        val = ws[f"{src_col}{row}"].value
-        if val:
-            ws[f"{tgt_col}{row}"] = convert_to_date_format(val)
-
-# ======== Format Lay and Can ========
-for row in range(start_row, end_row + 1):
-    for src_col, tgt_col in zip(['BK', 'BM'], ['BL', 'BN']):
-        val = ws[f"{src_col}{row}"].value
-        if val:
-            ws[f"{tgt_col}{row}"] = convert_to_date_format(val)
-
-# ======== No Mahakam based on Load Port ========
-no_mahakam = 1
-for row in range(start_row, end_row + 1):
-    load_port = ws[f"I{row}"].value
-    if load_port == "BoCT":
-        ws[f"B{row}"] = 0
-    else:
-        ws[f"B{row}"] = no_mahakam
-        no_mahakam += 1
-
-# ======== Type of Shipment based on Name of Vessel ========
-for row in range(start_row, end_row + 1):
-    name_vessel = ws[f"F{row}"].value
-    if isinstance(name_vessel, str):
-        vessel_upper = name_vessel.upper()
-        if vessel_upper.startswith("MV"):
-            ws[f"E{row}"] = "Vessel"
-        elif vessel_upper.startswith("BG"):
-            ws[f"E{row}"] = "Direct Shipment"
-        elif "DUMP TRUCK" in vessel_upper:
-            ws[f"E{row}"] = "Dump Truck"
-
-# ======== Fill columns for BoCT only ========
-
-for i, row_data in data_summary.iloc[: end_row - start_row + 1].iterrows():
-    row = start_row + i
-    load_port = ws[f"I{row}"].value
-    if load_port != "BoCT":
-        continue
-
-    mapping_boCT = {
-        'P': 'IMM-WB.HCV.LS',
-        'Q': 'IMM-WB.MCV.HS',
-        'R': 'IMM-EB.MCV.LS',
-        'S': 'IMM-EB.MCV.MS',
-        'T': 'IMM-EB.MCV.HS',
-        'U': 'TCM.HCV.LS',
-        'V': 'TCM.HCV.HS',
-        'W': 'TCM.LCV.MS.HA',
-        'X': 'BEK.MCV.LS',
-        'Y': 'BEK.HCV.MS',
-        'Z': 'JBG',
-        'AA': 'GPK',
-        'AB': 'TIS',
-
-        #Third Party
-        'AC': 'EBH.HCV',
-        'AE': 'KMIA.MCV.LS',
-        'AF': 'BBE.MCV',
-        'AG': 'MBL.MCV',
-        'AH': 'MBL.56.MCV',
-        'AJ': 'EMJ.MCV',
-        'AL': 'KBM.MCV',
-        'AM': 'IKJ.MCV',
-        'AN': 'MKE.LCV',
-        'AQ': 'KJA.LCV.LS',
-        'AS': 'DMP.LCV',
-        'AT': 'MCM.LCV',
-        'AU': 'BMM.LCV',
-        'AW': 'BBA.LCV',
-        'AX': 'MML.LCV',
-        'BA': 'KPM.LCV',
-        'BB': 'KJM.LCV',
-        'BF': 'BUM.LCV',
-        'BG': 'BISM.LCV',
+            numbers.append(no_mahakam)
+            no_mahakam += 1
+    cells += write_columns(ws, start_row, {'B': numbers})
+
+    # ======== Type of Shipment based on Name of Vessel ========
+    shipment_types = [None] * rows
+    for i, name_vessel in enumerate(vessel_names):
+        if isinstance(name_vessel, str):
+            vessel_upper = name_vessel.upper()
+            if vessel_upper.startswith("MV"):
+                shipment_types[i] = "Vessel"
+            elif vessel_upper.startswith("BG"):
+                shipment_types[i] = "Direct Shipment"
+            elif "DUMP TRUCK" in vessel_upper:
+                shipment_types[i] = "Dump Truck"
+    typed = [i for i, shipment_type in enumerate(shipment_types) if shipment_type is not None]
+    cells += write_columns(ws, start_row, {'E': shipment_types}, typed)
+
+    # ======== Fill columns for BoCT only ========
+    boct_rows = [i for i, load_port in enumerate(load_ports) if load_port == "BoCT"]
+    boct_columns = {
+        excel_col: block[col_name]
+        for excel_col, col_name in mapping_boCT.items()
+        if col_name in data_summary.columns
     }
+    cells += write_columns(ws, start_row, boct_columns, boct_rows)
 
-    for excel_col, col_name in mapping_boCT.items():
-        if col_name in data_summary.columns:
-            ws[f"{excel_col}{row}"] = row_data[col_name]
+    step_summary(log, "Ongoing month", rows, cells, started)
+    return True
 
-# ======== Save workbook ========
-wb.save(data_final_path)
-wb.close()
-print("Excel file has been updated and saved.")
+# Main function: run the step on its own, loading and saving the Draft itself
+def main():
+    log.info("ongoing_month processing")
 
-print("The columns have been successfully updated and saved back to the same file... :)")
+    # Read the JSON configuration file
+    with open(file_path_json, 'r') as file:
+        json_data = json.load(file)
 
-# Main function placeholder
-def main():
-    print("ongoing_month processing")
+    # ======== Load file A, process and save workbook ========
+    data_final_path = json_data["final_file"]
+    wb = openpyxl.load_workbook(data_final_path)
+    process(wb, json_data)
+    if save_workbook(wb, data_final_path):
+        log.info("Excel file has been updated and saved.")
+    wb.close()
 
 # Run main if script executed directly
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,630 @@
+from __future__ import annotations
+
+import datetime
+import math
+import re
+import zipfile
+
+from openpyxl import load_workbook
+from openpyxl.formula.tokenizer import Token, Tokenizer
+from openpyxl.utils import column_index_from_string
+from openpyxl.utils.cell import range_boundaries
+from openpyxl.utils.datetime import to_excel
+
+from run_log import get_logger
+from run_report import count_cells, io_timer
+from xml_patcher import XlsxPackage, set_full_calc_on_load, write_package
+
+log = get_logger("recalc")
+
+# A formula cell in sheet XML: attributes, the <f> element and its cached <v>
+_FORMULA_CELL_RE = re.compile(
+    r'<c\b([^>]*?)>(<f\b[^>]*?(?:/>|>.*?</f>))(?:<v>(.*?)</v>|<v\s*/>)?</c>', re.S
+)
+_CELL_REF_RE = re.compile(r'\br="([A-Z]+)(\d+)"')
+_TYPE_ATTR_RE = re.compile(r'\s+t="[^"]*"')
+
+# Sheet-qualified or plain cell, range, whole-column or whole-row reference
+_REF_RE = re.compile(
+    r"^(?:(?:'((?:[^']|'')+)'|([^'!\[\]]+))!)?"
+    r"(\$?[A-Z]{1,3}\$?\d+(?::\$?[A-Z]{1,3}\$?\d+)?|\$?[A-Z]{1,3}:\$?[A-Z]{1,3}|\$?\d+:\$?\d+)$"
+)
+
+class ExcelError:
+    """An Excel error value such as #DIV/0!."""
+
+    def __init__(self, code: str):
+        self.code = code
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ExcelError) and other.code == self.code
+
+    def __hash__(self) -> int:
+        return hash(self.code)
+
+    def __repr__(self) -> str:
+        return self.code
+
+DIV0 = ExcelError("#DIV/0!")
+VALUE = ExcelError("#VALUE!")
+REF = ExcelError("#REF!")
+NUM = ExcelError("#NUM!")
+
+class UnsupportedFormula(Exception):
+    """The formula uses syntax or a function the recalculation does not cover."""
+
+class _ErrorResult(Exception):
+    """Carries an Excel error value up to the formula that returns it."""
+
+    def __init__(self, error: ExcelError):
+        super().__init__(error.code)
+        self.error = error
+
+# ─────────────────────────── Parsing ────────────────────────────────────────
+# Binary operators by precedence, lowest first. Comparisons and '&' are not
+# covered: no formula of the bundled workbooks uses them (see FUNCTIONS).
+_PRECEDENCE = {
+    "+": 1, "-": 1,
+    "*": 2, "/": 2,
+    "^": 3,
+}
+
+def parse_reference(text: str, sheet: str) -> tuple:
+    """
+    Parse a reference operand into ('ref', sheet, min_col, min_row, max_col, max_row).
+
+    Open ends of whole-column or whole-row references are None.
+    """
+    match = _REF_RE.match(text)
+    if not match:
+        raise UnsupportedFormula(f"reference '{text}'")
+    quoted, plain, address = match.groups()
+    if quoted is not None:
+        sheet = quoted.replace("''", "'")
+    elif plain is not None:
+        sheet = plain
+    min_col, min_row, max_col, max_row = range_boundaries(address.replace("$", ""))
+    return ("ref", sheet, min_col, min_row, max_col, max_row)
+
+class _Parser:
+    """Recursive-descent parser over the tokens of openpyxl's formula tokenizer."""
+
+    def __init__(self, formula: str, sheet: str):
+        self.sheet = sheet
+        self.tokens = [token for token in Tokenizer(formula).items if token.type != Token.WSPACE]
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self):
+        token = self.peek()
+        if token is None:
+            raise UnsupportedFormula("unexpected end of formula")
+        self.pos += 1
+        return token
+
+    def parse(self) -> tuple:
+        node = self.expression(1)
+        if self.peek() is not None:
+            raise UnsupportedFormula(f"unexpected '{self.peek().value}'")
+        return node
+
+    def expression(self, min_precedence: int) -> tuple:
+        left = self.unary()
+        while True:
+            token = self.peek()
+            if token is None or token.type != Token.OP_IN:
+                return left
+            if token.value not in _PRECEDENCE:
+                raise UnsupportedFormula(f"operator {token.value}")
+            precedence = _PRECEDENCE[token.value]
+            if precedence < min_precedence:
+                return left
+            self.take()
+            right = self.expression(precedence + 1)
+            left = ("op", token.value, left, right)
+
+    def unary(self) -> tuple:
+        token = self.peek()
+        if token is not None and token.type == Token.OP_PRE:
+            self.take()
+            operand = self.unary()
+            return ("neg", operand) if token.value == "-" else operand
+        node = self.primary()
+        while self.peek() is not None and self.peek().type == Token.OP_POST:
+            self.take()
+            node = ("percent", node)
+        return node
+
+    def primary(self) -> tuple:
+        token = self.take()
+        if token.type == Token.OPERAND:
+            if token.subtype == Token.NUMBER:
+                return ("value", float(token.value))
+            if token.subtype == Token.TEXT:
+                return ("value", token.value[1:-1].replace('""', '"'))
+            if token.subtype == Token.LOGICAL:
+                return ("value", token.value.upper() == "TRUE")
+            if token.subtype == Token.ERROR:
+                return ("value", ExcelError(token.value))
+            return parse_reference(token.value, self.sheet)
+
+        if token.type == Token.FUNC and token.subtype == Token.OPEN:
+            name = token.value[:-1].upper()
+            if name not in FUNCTIONS:
+                raise UnsupportedFormula(f"function {name}")
+            args = []
+            if self.peek() is not None and self.peek().type == Token.FUNC and self.peek().subtype == Token.CLOSE:
+                self.take()
+                return ("func", name, args)
+            while True:
+                following = self.peek()
+                if following is not None and (following.type == Token.SEP or following.type == Token.FUNC and following.subtype == Token.CLOSE):
+                    args.append(("value", None))  # Omitted argument, e.g. SUM(A1,,2)
+                else:
+                    args.append(self.expression(1))
+                separator = self.take()
+                if separator.type == Token.FUNC and separator.subtype == Token.CLOSE:
+                    return ("func", name, args)
+                if separator.type != Token.SEP or separator.subtype != Token.ARG:
+                    raise UnsupportedFormula(f"unexpected '{separator.value}'")
+
+        if token.type == Token.PAREN and token.subtype == Token.OPEN:
+            node = self.expression(1)
+            closing = self.take()
+            if closing.type != Token.PAREN or closing.subtype != Token.CLOSE:
+                raise UnsupportedFormula(f"unexpected '{closing.value}'")
+            return node
+
+        raise UnsupportedFormula(f"unexpected '{token.value}'")
+
+def parse_formula(formula: str, sheet: str) -> tuple:
+    """
+    Parse a formula ('=...') into a small expression tree.
+
+    Raises:
+        UnsupportedFormula: For structured references, defined names, array
+            constants and functions outside FUNCTIONS.
+    """
+    try:
+        return _Parser(formula, sheet).parse()
+    except UnsupportedFormula:
+        raise
+    except Exception as e:
+        raise UnsupportedFormula(str(e)) from e
+
+def references(node: tuple) -> list[tuple]:
+    """Return every reference node of an expression tree."""
+    if node[0] == "ref":
+        return [node]
+    if node[0] == "value":
+        return []
+    found = []
+    for child in node[1:]:
+        if isinstance(child, tuple):
+            found.extend(references(child))
+        elif isinstance(child, list):
+            for item in child:
+                found.extend(references(item))
+    return found
+
+# ─────────────────────────── Value helpers ──────────────────────────────────
+def _raise_error(value) -> None:
+    if isinstance(value, ExcelError):
+        raise _ErrorResult(value)
+
+def _number(value) -> float:
+    """Coerce a scalar for arithmetic the way Excel does."""
+    _raise_error(value)
+    if value is None:
+        return 0.0
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return float(to_excel(value))
+    if isinstance(value, str):
+        try:
+            return float(value.strip())
+        except ValueError:
+            raise _ErrorResult(VALUE)
+    raise _ErrorResult(VALUE)
+
+def _range_numbers(values: list) -> list[float]:
+    """Numbers of a range argument: text, logicals and blanks are skipped."""
+    numbers = []
+    for value in values:
+        _raise_error(value)
+        if isinstance(value, bool) or value is None or isinstance(value, str):
+            continue
+        numbers.append(_number(value))
+    return numbers
+
+def _numbers(args: list) -> list[float]:
+    """Numbers of SUM-style arguments (ranges filtered, scalars coerced)."""
+    numbers = []
+    for arg in args:
+        if isinstance(arg, list):
+            numbers.extend(_range_numbers(arg))
+        else:
+            numbers.append(_number(arg))
+    return numbers
+
+# Functions the recalculation evaluates, with reference arguments passed as
+# ranges (lists). The subset is what the workbooks of this pipeline contain:
+# Draft_weeklyReport.xlsx has no formulas, Draft_3rdparty.xlsx has constant
+# arithmetic (=20946-5300) and the raw 3rd-party file cell arithmetic
+# (=C3/$H$3) and SUM. Any other function keeps its cached value and Excel
+# recalculates it on open (fullCalcOnLoad).
+FUNCTIONS = {
+    "SUM": lambda args: sum(_numbers(args)),
+}
+
+# ─────────────────────────── Evaluation ─────────────────────────────────────
+class Recalculator:
+    """
+    Recompute the formula cells of a workbook affected by the pipeline's writes.
+
+    A formula is recomputed when one of its references covers a written cell
+    or another recomputed formula, or when it has no cached value yet; every
+    other formula keeps the value Excel cached last time. Formulas outside
+    the supported subset (see FUNCTIONS) keep their cached value too.
+    """
+
+    def __init__(self, wb, cached: dict | None = None, written: dict | None = None):
+        """
+        Args:
+            wb: The workbook (openpyxl, loaded with formulas) holding the new values.
+            cached (dict | None): {(sheet, row, column): value} cached before the run.
+            written (dict | None): Cells written by the pipeline (see
+                column_writer.written_cells); None recomputes every formula.
+        """
+        self.wb = wb
+        self.cached = cached or {}
+        self.written = written
+        self.formulas: dict[tuple, str] = {}
+        self.by_sheet: dict[str, list[tuple[int, int]]] = {}
+        for ws in wb.worksheets:
+            for (row, column), cell in ws._cells.items():
+                if cell.data_type == "f":
+                    self.formulas[(ws.title, row, column)] = cell.value
+                    self.by_sheet.setdefault(ws.title, []).append((row, column))
+        self._trees: dict[tuple, tuple | None] = {}
+        self._dirty: dict[tuple, bool] = {}
+        self._values: dict[tuple, object] = {}
+        self._active: set[tuple] = set()
+        self.unsupported = 0
+        self.unsupported_reasons: set[str] = set()
+
+    # ── Dependencies ────────────────────────────────────────────────────────
+    def tree(self, key: tuple) -> tuple | None:
+        """Parsed formula of a cell, or None when it is outside the subset."""
+        if key not in self._trees:
+            formula = self.formulas[key]
+            try:
+                if not isinstance(formula, str):
+                    raise UnsupportedFormula("array or data table formula")
+                self._trees[key] = parse_formula(formula, key[0])
+            except UnsupportedFormula as e:
+                log.debug(f"Keeping the cached value of {key[0]}!{key[2]},{key[1]}: {e}")
+                self._trees[key] = None
+                self.unsupported += 1
+                self.unsupported_reasons.add(str(e))
+        return self._trees[key]
+
+    def _written_in(self, ref: tuple) -> bool:
+        """True when a reference covers a cell written by the pipeline."""
+        _, sheet, min_col, min_row, max_col, max_row = ref
+        columns = self.written.get(sheet)
+        if not columns:
+            return False
+        if None in columns:
+            return True
+        for column, rows in columns.items():
+            if (min_col is None or min_col <= column <= max_col) and any(
+                (min_row is None or min_row <= row <= max_row) for row in rows
+            ):
+                return True
+        return False
+
+    def _formulas_in(self, ref: tuple):
+        """Keys of the formula cells inside a reference."""
+        _, sheet, min_col, min_row, max_col, max_row = ref
+        if min_col == max_col and min_row == max_row and min_row is not None:
+            key = (sheet, min_row, min_col)
+            if key in self.formulas:
+                yield key
+            return
+        for row, column in self.by_sheet.get(sheet, ()):
+            if (min_col is None or min_col <= column <= max_col) and (min_row is None or min_row <= row <= max_row):
+                yield (sheet, row, column)
+
+    def needs_recalc(self, key: tuple) -> bool:
+        """True when a formula cell's value may differ from its cached one."""
+        if key in self._dirty:
+            return self._dirty[key]
+        if key in self._active:
+            return True  # Circular reference, let evaluation sort it out
+        tree = self.tree(key)
+        if tree is None:
+            dirty = False
+        elif self.written is None or self.cached.get(key) is None:
+            dirty = True
+        else:
+            self._active.add(key)
+            try:
+                dirty = any(
+                    self._written_in(ref) or any(self.needs_recalc(other) for other in self._formulas_in(ref))
+                    for ref in references(tree)
+                )
+            finally:
+                self._active.discard(key)
+        self._dirty[key] = dirty
+        return dirty
+
+    # ── Values ──────────────────────────────────────────────────────────────
+    def value(self, key: tuple):
+        """Current value of a formula cell: recomputed or cached."""
+        if key in self._values:
+            return self._values[key]
+        if not self.needs_recalc(key):
+            return self.cached.get(key)
+        if key in self._active:
+            return self.cached.get(key, 0.0)  # Circular reference
+        self._active.add(key)
+        try:
+            try:
+                result = self._scalar(self.evaluate(self.tree(key)))
+            except _ErrorResult as e:
+                result = e.error
+        except UnsupportedFormula:
+            result = self.cached.get(key)
+        finally:
+            self._active.discard(key)
+        self._values[key] = result
+        return result
+
+    def cell_value(self, sheet: str, row: int, column: int):
+        key = (sheet, row, column)
+        if key in self.formulas:
+            return self.value(key)
+        if sheet not in self.wb.sheetnames:
+            raise _ErrorResult(REF)
+        cell = self.wb[sheet]._cells.get((row, column))
+        return None if cell is None else cell.value
+
+    def range_values(self, ref: tuple) -> list:
+        _, sheet, min_col, min_row, max_col, max_row = ref
+        if sheet not in self.wb.sheetnames:
+            raise _ErrorResult(REF)
+        ws = self.wb[sheet]
+        if min_row is None or min_col is None:
+            # Whole column or row: only the cells that exist
+            keys = sorted(
+                (row, column) for row, column in ws._cells
+                if (min_col is None or min_col <= column <= max_col) and (min_row is None or min_row <= row <= max_row)
+            )
+            return [self.cell_value(sheet, row, column) for row, column in keys]
+        return [
+            self.cell_value(sheet, row, column)
+            for row in range(min_row, max_row + 1)
+            for column in range(min_col, max_col + 1)
+        ]
+
+    def _scalar(self, value):
+        if isinstance(value, list):
+            if len(value) == 1:
+                return value[0]
+            raise _ErrorResult(VALUE)  # Implicit intersection is not supported
+        return value
+
+    def evaluate(self, node: tuple):
+        kind = node[0]
+        if kind == "value":
+            return node[1]
+        if kind == "ref":
+            _, sheet, min_col, min_row, max_col, max_row = node
+            if min_col == max_col and min_row == max_row and min_row is not None:
+                return self.cell_value(sheet, min_row, min_col)
+            return self.range_values(node)
+        if kind == "neg":
+            return -_number(self._scalar(self.evaluate(node[1])))
+        if kind == "percent":
+            return _number(self._scalar(self.evaluate(node[1]))) / 100
+        if kind == "op":
+            return self._operate(node[1], node[2], node[3])
+        if kind == "func":
+            return self._call(node[1], node[2])
+        raise UnsupportedFormula(kind)
+
+    def _operate(self, op: str, left_node: tuple, right_node: tuple):
+        a = _number(self._scalar(self.evaluate(left_node)))
+        b = _number(self._scalar(self.evaluate(right_node)))
+        if op == "+":
+            return a + b
+        if op == "-":
+            return a - b
+        if op == "*":
+            return a * b
+        if op == "/":
+            if b == 0:
+                raise _ErrorResult(DIV0)
+            return a / b
+        try:
+            return a ** b
+        except (OverflowError, ZeroDivisionError):
+            raise _ErrorResult(NUM)
+
+    def _call(self, name: str, arg_nodes: list):
+        # A reference argument is a range even when it is one cell, so its text is skipped, not coerced
+        args = [self.range_values(node) if node[0] == "ref" else self.evaluate(node) for node in arg_nodes]
+        return FUNCTIONS[name](args)
+
+    def results(self) -> dict[tuple, object]:
+        """Value of every formula cell (recomputed or cached)."""
+        return {key: self.value(key) for key in self.formulas}
+
+# ─────────────────────────── Workbook XML ───────────────────────────────────
+def _sheet_cell_key(sheet: str, attrs: str) -> tuple | None:
+    match = _CELL_REF_RE.search(attrs)
+    if not match:
+        return None
+    return (sheet, int(match.group(2)), column_index_from_string(match.group(1)))
+
+def _parse_cached(attrs: str, raw: str | None):
+    """Decode the cached <v> of a formula cell."""
+    if raw is None:
+        return None
+    type_match = re.search(r'\bt="([^"]*)"', attrs)
+    cell_type = type_match.group(1) if type_match else "n"
+    text = raw.replace("&lt;", "<").replace("&gt;", ">").replace("&quot;", '"').replace("&apos;", "'").replace("&amp;", "&")
+    if cell_type == "str":
+        return text
+    if cell_type == "b":
+        return text == "1"
+    if cell_type == "e":
+        return ExcelError(text)
+    if text == "":
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+def read_cached_values(path: str) -> dict[tuple, object]:
+    """
+    Read the values Excel cached for every formula cell of an xlsx file.
+
+    Only the XML of the sheets is scanned; the workbook is not loaded.
+
+    Returns:
+        dict: {(sheet, row, column): cached value}.
+    """
+    cached = {}
+    with zipfile.ZipFile(path) as archive:
+        package = XlsxPackage(archive)
+        for sheet, part in package.sheets.items():
+            xml = archive.read(part).decode("utf-8")
+            if "<f" not in xml:
+                continue
+            for match in _FORMULA_CELL_RE.finditer(xml):
+                attrs, _, raw = match.groups()
+                key = _sheet_cell_key(sheet, attrs)
+                if key is not None:
+                    cached[key] = _parse_cached(attrs, raw)
+    return cached
+
+def _render_cached(attrs: str, formula: str, value) -> str:
+    """Render a formula cell with its cached value."""
+    attrs = _TYPE_ATTR_RE.sub("", attrs)
+    if value is None:
+        return f"<c{attrs}>{formula}<v></v></c>"
+    if isinstance(value, ExcelError):
+        return f'<c{attrs} t="e">{formula}<v>{value.code}</v></c>'
+    if isinstance(value, bool):
+        return f'<c{attrs} t="b">{formula}<v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        number = float(value)
+        if math.isnan(number) or math.isinf(number):
+            return f'<c{attrs} t="e">{formula}<v>{NUM.code}</v></c>'
+        text = str(int(number)) if number.is_integer() and abs(number) < 1e15 else repr(number)
+        return f"<c{attrs}>{formula}<v>{text}</v></c>"
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return f"<c{attrs}>{formula}<v>{to_excel(value)!r}</v></c>"
+    text = str(value).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return f'<c{attrs} t="str">{formula}<v>{text}</v></c>'
+
+def write_cached_values(path: str, values: dict[tuple, object]) -> int:
+    """
+    Store computed values as the cached values of the formula cells of an xlsx file.
+
+    The workbook is also flagged for a full recalculation on load, so Excel
+    recomputes every formula (those outside the supported subset included)
+    when the file is opened.
+
+    Args:
+        path (str): Workbook to update in place (written atomically).
+        values (dict): {(sheet, row, column): value}.
+
+    Returns:
+        int: Number of formula cells updated.
+    """
+    sheets = {key[0] for key in values}
+    updated = 0
+    with zipfile.ZipFile(path) as archive:
+        package = XlsxPackage(archive)
+        infos = archive.infolist()
+        members = {info.filename: archive.read(info.filename) for info in infos}
+
+    for sheet in sheets:
+        part = package.sheets.get(sheet)
+        if part is None:
+            continue
+
+        def replace(match):
+            nonlocal updated
+            attrs, formula, _ = match.groups()
+            key = _sheet_cell_key(sheet, attrs)
+            if key not in values:
+                return match.group(0)
+            updated += 1
+            return _render_cached(attrs, formula, values[key])
+
+        xml = members[part].decode("utf-8")
+        members[part] = _FORMULA_CELL_RE.sub(replace, xml).encode("utf-8")
+
+    if updated:
+        set_full_calc_on_load(members)
+        with io_timer("save"):
+            write_package(infos, members, path)
+        count_cells(written=updated)
+    return updated
+
+def recalculate(wb, path: str, cached: dict | None = None, written: dict | None = None) -> dict:
+    """
+    Recalculate the formulas of a saved workbook and store their values in the file.
+
+    openpyxl writes formulas without cached values, so Power BI (which does
+    not calculate) would read empty cells. This fills them in without Excel
+    for the supported subset (see FUNCTIONS); every other formula keeps its
+    last cached value, and the file is flagged so Excel recalculates it on open.
+
+    Args:
+        wb: The workbook as it was just saved to path (openpyxl, with formulas).
+        path (str): The saved xlsx file.
+        cached (dict | None): Cached values from before the run
+            (read_cached_values of the original file).
+        written (dict | None): Cells the pipeline wrote; None recomputes everything.
+
+    Returns:
+        dict: Statistics: formulas, recomputed, unsupported, cells updated.
+    """
+    calculator = Recalculator(wb, cached, written)
+    if not calculator.formulas:
+        return {"formulas": 0, "recomputed": 0, "unsupported": 0, "unsupported_reasons": [], "updated": 0}
+
+    values = calculator.results()
+    recomputed = sum(1 for key in calculator.formulas if calculator.needs_recalc(key))
+    updated = write_cached_values(path, values)
+    if calculator.unsupported:
+        log.warning(f"{calculator.unsupported} formula(s) use what the recalculation does not cover "
+                    f"({', '.join(sorted(calculator.unsupported_reasons))}): the file keeps their last cached "
+                    "values until Excel recalculates them on open.")
+    return {
+        "formulas": len(calculator.formulas),
+        "recomputed": recomputed,
+        "unsupported": calculator.unsupported,
+        "unsupported_reasons": sorted(calculator.unsupported_reasons),
+        "updated": updated,
+    }
+
+def recalculate_file(path: str) -> dict:
+    """Recalculate every formula of an xlsx file in place (no pipeline writes known)."""
+    cached = read_cached_values(path)
+    wb = load_workbook(path)
+    try:
+        return recalculate(wb, path, cached)
+    finally:
+        wb.close()
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Every logger of the logic package lives under this name
+ROOT_LOGGER = "draft"
+
+# Per-cell trace, off unless a trace file is configured
+TRACE_LOGGER = "draft.trace"
+
+# Lines logged from one call site that reach stdout per run; the rest are
+# dropped so a loop cannot flood the pipe into the GUI log
+REPEAT_LIMIT = 20
+
+# Callbacks receiving every record of the package (see add_listener)
+_listeners: list = []
+
+class RepeatFilter(logging.Filter):
+    """
+    Let at most `limit` records of the same logging call through.
+
+    Records are counted by call site (file and line), not by message: most
+    calls format their message with an f-string, so every record of a loop
+    carries a different text.
+    """
+
+    def __init__(self, limit: int = REPEAT_LIMIT):
+        super().__init__()
+        self.limit = limit
+        self.counts: dict[tuple, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.pathname, record.lineno)
+        count = self.counts.get(key, 0) + 1
+        self.counts[key] = count
+        if count == self.limit + 1:
+            record.msg = f"(further messages like '{record.getMessage()}' suppressed)"
+            record.args = None
+            return True
+        return count <= self.limit
+
+class ListenerHandler(logging.Handler):
+    """Hand every record to the callbacks registered with add_listener()."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        for callback in list(_listeners):
+            try:
+                callback(record)
+            except Exception:
+                self.handleError(record)
+
+def setup_logging(level: str | int = "INFO", trace_file: str | Path | None = None) -> None:
+    """
+    Configure the logic package logging for one run.
+
+    Messages at `level` and above go to stdout (read line by line by the GUI).
+    With a trace file, the per-cell debug trace is written there instead of
+    to stdout.
+
+    Args:
+        level (str | int): Console level, e.g. 'INFO' or 'DEBUG'.
+        trace_file (str | Path | None): File receiving the per-cell trace.
+    """
+    root = logging.getLogger(ROOT_LOGGER)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    root.setLevel(level.upper() if isinstance(level, str) else level)
+    root.propagate = False
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter("%(message)s"))
+    console.addFilter(RepeatFilter())
+    root.addHandler(console)
+    if _listeners:
+        root.addHandler(ListenerHandler())
+
+    trace = logging.getLogger(TRACE_LOGGER)
+    for handler in list(trace.handlers):
+        trace.removeHandler(handler)
+        handler.close()
+    trace.propagate = False
+    if trace_file:
+        handler = logging.FileHandler(trace_file, mode="w", encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        trace.addHandler(handler)
+        trace.setLevel(logging.DEBUG)
+    else:
+        trace.setLevel(logging.CRITICAL + 1)
+
+def setup_from_config(json_data: dict) -> None:
+    """
+    Configure logging from the run config.
+
+    "log_level" sets the console level (INFO by default). "debug_trace" set
+    to true writes the per-cell trace to '<draft>.trace.log' next to the
+    Draft; a string is used as the trace file path.
+    """
+    trace_file = json_data.get("debug_trace")
+    if trace_file is True:
+        draft = Path(json_data["final_file"])
+        trace_file = draft.with_name(f"{draft.stem}.trace.log")
+    setup_logging(json_data.get("log_level", "INFO"), trace_file or None)
+
+def add_listener(callback) -> None:
+    """
+    Call `callback(record)` for every log record of the package.
+
+    Listeners survive setup_logging(), so a long-lived process (the GUI
+    worker) can keep receiving records across runs that reconfigure logging.
+    """
+    _ensure_setup()
+    _listeners.append(callback)
+    root = logging.getLogger(ROOT_LOGGER)
+    if not any(isinstance(handler, ListenerHandler) for handler in root.handlers):
+        root.addHandler(ListenerHandler())
+
+def _ensure_setup() -> None:
+    """Fall back to the default configuration when a module runs on its own."""
+    if not logging.getLogger(ROOT_LOGGER).handlers:
+        setup_logging()
+
+def get_logger(name: str) -> logging.Logger:
+    """Return the logger of a logic module, e.g. get_logger(__name__)."""
+    _ensure_setup()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+def get_tracer() -> logging.Logger:
+    """Return the per-cell trace logger; check tracing() before formatting."""
+    _ensure_setup()
+    return logging.getLogger(TRACE_LOGGER)
+
+def tracing() -> bool:
+    """True when the per-cell trace is being recorded."""
+    return get_tracer().isEnabledFor(logging.DEBUG)
+
+def step_summary(log: logging.Logger, label: str, rows: int, cells: int, started: float) -> None:
+    """
+    Log the one summary line of a step: rows, cells written and elapsed time.
+
+    Args:
+        log: Logger of the step's module.
+        label (str): Step name.
+        rows (int): Rows the step wrote to.
+        cells (int): Cells the step wrote.
+        started (float): time.perf_counter() value taken when the step began.
+    """
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    log.info("%s: %d row(s), %d cell(s) written in %.0f ms", label, rows, cells, elapsed_ms)
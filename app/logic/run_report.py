@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import datetime
+import json
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from run_log import get_logger
+
+log = get_logger("run_report")
+
+# Bump when the layout of the report changes
+REPORT_VERSION = 1
+
+# Report of the run in progress; the hooks below are no-ops without one
+_report: "RunReport | None" = None
+_step: dict | None = None
+
+def report_path(draft_path: str) -> Path:
+    """Return the run report file stored next to a Draft workbook."""
+    draft = Path(draft_path)
+    return draft.with_name(f"{draft.stem}.run_report.json")
+
+def peak_rss_bytes() -> int | None:
+    """Peak resident memory of this process so far, or None when unknown."""
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return int(counters.PeakWorkingSetSize)
+        return None
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+
+class RunReport:
+    """
+    Timing, memory and I/O figures of one pipeline run, step by step.
+
+    Every step records wall and CPU time, the time spent loading and saving
+    workbooks (the rest is compute), the cells read and written and the peak
+    resident memory of the process when the step ended. The report is saved
+    as '<draft>.run_report.json' next to the Draft.
+    """
+
+    def __init__(self, draft_path: str, json_data: dict | None = None):
+        self.draft_path = draft_path
+        self.json_data = json_data or {}
+        self.started_at = datetime.datetime.now().isoformat(timespec="seconds")
+        self.steps: list[dict] = []
+        self.status = "running"
+
+    def totals(self) -> dict:
+        """Sum of the per-step figures (peak RSS is the maximum)."""
+        totals = {"step": "Total"}
+        for key in ("wall_s", "cpu_s", "load_s", "compute_s", "save_s", "cells_read", "cells_written"):
+            totals[key] = sum(step[key] for step in self.steps)
+        peaks = [step["peak_rss_mb"] for step in self.steps if step["peak_rss_mb"] is not None]
+        totals["peak_rss_mb"] = max(peaks) if peaks else None
+        return totals
+
+    def to_dict(self) -> dict:
+        return {
+            "version": REPORT_VERSION,
+            "started_at": self.started_at,
+            "status": self.status,
+            "draft": self.draft_path,
+            "summary_file": self.json_data.get("summary_file"),
+            "selected_week": self.json_data.get("selected_week"),
+            "steps": self.steps,
+            "totals": self.totals(),
+        }
+
+    def save(self) -> Path:
+        """Write the JSON report next to the Draft and return its path."""
+        path = report_path(self.draft_path)
+        path.write_text(json.dumps(self.to_dict(), indent=1), encoding="utf-8")
+        return path
+
+    def table(self) -> list[str]:
+        """The steps as a fixed-width summary table, one string per line."""
+        header = f"{'Step':<30} {'Wall s':>7} {'CPU s':>7} {'Load s':>7} {'Comp s':>7} {'Save s':>7} {'Read':>9} {'Written':>9} {'Peak MB':>8}"
+        lines = [header, "-" * len(header)]
+        for row in [*self.steps, self.totals()]:
+            if row["step"] == "Total":
+                lines.append("-" * len(header))
+            peak = "" if row["peak_rss_mb"] is None else f"{row['peak_rss_mb']:.0f}"
+            lines.append(
+                f"{row['step'][:30]:<30} {row['wall_s']:>7.2f} {row['cpu_s']:>7.2f} {row['load_s']:>7.2f} "
+                f"{row['compute_s']:>7.2f} {row['save_s']:>7.2f} {row['cells_read']:>9} {row['cells_written']:>9} {peak:>8}"
+            )
+        return lines
+
+@contextmanager
+def run(draft_path: str, json_data: dict | None = None):
+    """
+    Collect a run report while the block runs, then save it and log the table.
+
+    The report is written even when a step fails, with status 'failed'.
+    """
+    global _report
+    report = RunReport(draft_path, json_data)
+    _report = report
+    try:
+        yield report
+        report.status = "success"
+    except BaseException:
+        report.status = "failed"
+        raise
+    finally:
+        _report = None
+        try:
+            path = report.save()
+        except OSError as e:
+            log.warning(f"Run report could not be written: {e}")
+        else:
+            for line in report.table():
+                log.info(line)
+            log.info(f"Run report written to {path}")
+
+@contextmanager
+def step(label: str):
+    """Measure one step of the run in progress (no-op outside run())."""
+    global _step
+    if _report is None or _step is not None:
+        yield
+        return
+
+    metrics = {"step": label, "load_s": 0.0, "save_s": 0.0, "cells_read": 0, "cells_written": 0}
+    _step = metrics
+    wall_started, cpu_started = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        _step = None
+        metrics["wall_s"] = round(time.perf_counter() - wall_started, 4)
+        metrics["cpu_s"] = round(time.process_time() - cpu_started, 4)
+        metrics["compute_s"] = round(max(metrics["wall_s"] - metrics["load_s"] - metrics["save_s"], 0.0), 4)
+        metrics["load_s"] = round(metrics["load_s"], 4)
+        metrics["save_s"] = round(metrics["save_s"], 4)
+        peak = peak_rss_bytes()
+        metrics["peak_rss_mb"] = None if peak is None else round(peak / 2**20, 1)
+        _report.steps.append(metrics)
+
+@contextmanager
+def io_timer(kind: str):
+    """Charge the time of the block to the current step's 'load' or 'save' time."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if _step is not None:
+            _step[f"{kind}_s"] += time.perf_counter() - started
+
+def count_cells(read: int = 0, written: int = 0) -> None:
+    """Add cells read from or written to a workbook to the current step."""
+    if _step is not None:
+        _step["cells_read"] += int(read)
+        _step["cells_written"] += int(written)
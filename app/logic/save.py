@@ -1,7 +1,9 @@
-import win32com.client as win32  # Import the win32com.client module to interact with Excel
 import json
 import os
 
+import recalc  # Pure-Python formula recalculation, no Excel instance needed
+from run_log import get_logger
+
 # Class to help with file path management
 class ResourceHelper:
     @staticmethod
@@ -22,27 +24,28 @@ class ResourceHelper:
 # Get the path to the JSON configuration file
 file_path_json = ResourceHelper.get_path('../config/inputan.json')
 
-# Read the JSON configuration file
-with open(file_path_json, 'r') as file:
-    json_data = json.load(file)
+log = get_logger("save")
 
 def main():
+    """
+    Recalculate every formula of the Draft and store the values in the file.
+
+    This used to open and save the Draft in Excel through win32com so that
+    Power BI would read calculated values; the pipeline now recalculates the
+    formulas its writes affect by itself, and this step remains for running
+    a full recalculation of a Draft on its own.
+    """
+    # Read the JSON configuration file
+    with open(file_path_json, 'r') as file:
+        json_data = json.load(file)
+
     # Extract the path to the final Excel file from the JSON data
     file_path = json_data["final_file"]
-    
-    # Start Excel application in the background
-    excel = win32.DispatchEx("Excel.Application")  # Create a new instance of Excel
-    excel.DisplayAlerts = False  # Disable prompts for actions like overwriting files
-    excel.Visible = False        # Keep Excel application hidden from the user
-    
-    # Open the workbook specified in the JSON configuration
-    wb = excel.Workbooks.Open(file_path)  # Open the specified Excel workbook
-    wb.Save()  # Save the workbook (equivalent to pressing Ctrl+S)
-    wb.Close(False)  # Close the workbook without prompting to save changes
-    excel.Quit()  # Quit the Excel application
-
-    print("Excel file saved successfully.")  # Confirmation message
+
+    stats = recalc.recalculate_file(file_path)
+    log.info(f"{stats['formulas']} formula(s) recalculated, {stats['updated']} value(s) stored.")
+    log.info("Excel file saved successfully.")  # Confirmation message
 
 # Run the main function if this script is executed directly
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import argparse
+import datetime
+import importlib.util
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.utils import column_index_from_string, get_column_letter
+from openpyxl.worksheet.table import Table
+
+import add_row
+import copy_data
+import month_engine
+import ongoing_month
+from run_report import peak_rss_bytes
+from summary_reader import SummaryReader
+
+# Total summary data rows of each benchmark size, spread over the month blocks
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000)
+
+MONTHS = 6
+FIRST_HEADER = 2  # pandas-style header row of the first month block (sheet row 3)
+BLOCK_ROWS = 100  # The summary reserves 100 data rows per block; totals follow them
+WEEK = "W4"
+
+# Summary columns in the order of the real 'ITM Summary' sheet: the mapped
+# columns with the product columns (IMM/TCM/BEK/...) after ETD
+_MAPPED = list(ongoing_month.columns_to_update)
+SUMMARY_COLUMNS = _MAPPED[:_MAPPED.index("ETD") + 1] + list(ongoing_month.mapping_boCT.values()) + _MAPPED[_MAPPED.index("ETD") + 1:]
+
+PENALTY_COLUMN = column_index_from_string(copy_data.week_column_map_penalty[WEEK])
+DEMURRAGE_COLUMN = column_index_from_string(copy_data.week_column_map_demurrage[WEEK])
+
+# Draft template: table ranges as in Draft_weeklyReport.xlsx
+ONGOING_LAST_COLUMN = "CS"
+MONTH_LAST_COLUMN = "CK"
+
+# 3rd-party raw and Draft layout read by 3rd_party.move_data
+RAW_SHEET = "YTD"
+THIRD_PARTY_SHEET = "3rd Party"
+THIRD_PARTY_ROWS = 240
+
+def month_rows(total_rows: int, months: int = MONTHS) -> list[int]:
+    """Spread the total data rows over the month blocks (first block gets the rest)."""
+    rows = [total_rows // months] * months
+    rows[0] += total_rows - sum(rows)
+    return rows
+
+def block_headers(rows: list[int]) -> list[int]:
+    """pandas-style header row of every month block for the given block sizes."""
+    headers = []
+    header = FIRST_HEADER
+    for count in rows:
+        headers.append(header)
+        # Data rows (at least the reserved 100), the two total rows and a gap
+        header += max(count, BLOCK_ROWS) + 8
+    return headers
+
+def _summary_row(rng: random.Random, number: int) -> dict:
+    """Values of one synthetic shipment, keyed by summary column name."""
+    port = rng.choice(["BoCT", "SMD Anc", "Bunyut", "Muara Berau"])
+    values = {
+        "No.": number,
+        "Month": "Jan-25",
+        "Company": rng.choice(["IMM", "TCM", "BEK", "KTD"]),
+        "Name of Vessel": rng.choice(["MV Ocean Star", "BG Sinar 12", "Dump Truck 07", "TB Kapuas"]),
+        "Buyer": f"Buyer {number % 9}",
+        "End user": rng.choice(["PLN", "Private", "Cement"]),
+        "Load Port": port,
+        "ETA/ATA": f"{rng.randint(1, 28)}/{rng.randint(1, 12)}",
+        "ETB": datetime.datetime(2025, rng.randint(1, 12), rng.randint(1, 28)),
+        "ETD": None if number % 11 == 0 else datetime.datetime(2025, rng.randint(1, 12), rng.randint(1, 28)),
+        "Total": round(rng.uniform(5_000, 80_000), 2),
+        "Lay": f"{rng.randint(1, 28)}/{rng.randint(1, 12)}",
+        "can": datetime.datetime(2025, rng.randint(1, 12), rng.randint(1, 28)),
+        "%": round(rng.random(), 3),
+        "Status": rng.choice(["Loaded", "Loading", "Waiting"]),
+    }
+    for name in SUMMARY_COLUMNS:
+        if name not in values:
+            values[name] = round(rng.uniform(0, 60), 2)
+    return values
+
+def build_summary(path: str, rows: list[int], seed: int = 1) -> list[int]:
+    """
+    Write a synthetic summary workbook with one 'ITM Summary' block per month.
+
+    Every block has the real header names, the AKC/AKK week columns and the
+    BoCT/Mahakam total rows where copy_data looks for them.
+
+    Returns:
+        list[int]: pandas-style header row of every block.
+    """
+    rng = random.Random(seed)
+    headers = block_headers(rows)
+    width = max(PENALTY_COLUMN, DEMURRAGE_COLUMN)
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("ITM Summary")
+    sheet_row = 1
+    for header, count in zip(headers, rows):
+        # Blank rows up to the header of the block
+        while sheet_row < header + 1:
+            ws.append([])
+            sheet_row += 1
+
+        line = [None] * width
+        line[:len(SUMMARY_COLUMNS)] = SUMMARY_COLUMNS
+        line[PENALTY_COLUMN - 1] = WEEK
+        line[DEMURRAGE_COLUMN - 1] = WEEK
+        ws.append(line)
+        sheet_row += 1
+
+        totals = {header + BLOCK_ROWS + 3: ("(12.5)", "3.5"), header + BLOCK_ROWS + 4: (7.25, 1)}
+        last_row = header + 1 + max(count, BLOCK_ROWS + 4)
+        for number in range(1, last_row - header):
+            line = [None] * width
+            if number <= count:
+                values = _summary_row(rng, number)
+                line[:len(SUMMARY_COLUMNS)] = [values[name] for name in SUMMARY_COLUMNS]
+                line[PENALTY_COLUMN - 1] = round(rng.uniform(0, 10), 2)
+                line[DEMURRAGE_COLUMN - 1] = round(rng.uniform(0, 10), 2)
+            if sheet_row in totals:
+                line[PENALTY_COLUMN - 1], line[DEMURRAGE_COLUMN - 1] = totals[sheet_row]
+            ws.append(line)
+            sheet_row += 1
+    wb.save(path)
+    return headers
+
+def _add_table(ws, name: str, last_column: str) -> None:
+    """Header row 3 and one styled data row, wrapped in an Excel table."""
+    for column in range(1, column_index_from_string(last_column) + 1):
+        ws.cell(row=3, column=column, value=f"Column {get_column_letter(column)}")
+        ws.cell(row=4, column=column).number_format = "#,##0.00"
+    ws.add_table(Table(displayName=name, ref=f"A3:{last_column}4"))
+
+def build_draft(path: str, months: int = MONTHS) -> None:
+    """Write a Draft template with TableOngoing and TableMonth1..N, one data row each."""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "ITM Summary"
+    _add_table(ws, "TableOngoing", ONGOING_LAST_COLUMN)
+    for month in range(1, months + 1):
+        spec = month_engine.month_spec(month)
+        _add_table(wb.create_sheet(spec["sheet"]), spec["table"], MONTH_LAST_COLUMN)
+    wb.save(path)
+
+def build_third_party(raw_path: str, draft_path: str, rows: int, seed: int = 1) -> None:
+    """
+    Write a raw 3rd-party workbook (YTD sheet with Plan/Actual columns D..AA,
+    padded to `rows` rows) and a Draft with the '3rd Party' sheet.
+    """
+    rng = random.Random(seed)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(RAW_SHEET)
+    ws.append(["Company", "Contract"] + [None] * 25)
+    for row in range(2, max(rows, 25) + 1):
+        ws.append([f"Supplier {row}", "FOB", None] + [round(rng.uniform(0, 50_000), 1) for _ in range(24)])
+    wb.save(raw_path)
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = THIRD_PARTY_SHEET
+    for column, title in zip("BCDEF", ("Supplier", "Month", "Product", "Plan", "Actual")):
+        ws[f"{column}2"] = title
+    for row in range(3, 255):
+        ws[f"B{row}"] = f"Supplier {row}"
+    ws.add_table(Table(displayName="Table3", ref="B2:F254"))
+    wb.save(draft_path)
+
+def _load_third_party():
+    """Import 3rd_party.py (not a valid module name) the way the GUI does."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "3rd_party.py")
+    spec = importlib.util.spec_from_file_location("third_party_logic", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def _measure(results: list[dict], step: str, rows: int, func, *args):
+    """Run one step, append its timing figures and the process peak memory so far, return its result."""
+    wall_started, cpu_started = time.perf_counter(), time.process_time()
+    result = func(*args)
+    wall = time.perf_counter() - wall_started
+    peak = peak_rss_bytes()
+    results.append({
+        "step": step,
+        "rows": rows,
+        "wall_s": round(wall, 4),
+        "cpu_s": round(time.process_time() - cpu_started, 4),
+        "rows_per_s": round(rows / wall, 1) if wall else None,
+        "peak_rss_mb": None if peak is None else round(peak / 2**20, 1),
+    })
+    return result
+
+def _run_month(wb, spec: dict, json_data: dict, summary) -> int:
+    """One month as month_engine.process() runs it serially: read its block, compute the patch, apply it."""
+    job = month_engine._month_job(spec, json_data, summary)
+    return month_engine.apply_patch(wb, month_engine.compute_month_patch(*job))
+
+def run_size(total_rows: int, folder: str, seed: int = 1) -> dict:
+    """
+    Generate the synthetic workbooks for one size and time every step on them.
+
+    Runs in a fresh process per size. The peak memory of a step is the peak
+    of that process so far (it never goes down), so it covers the size's
+    steps up to and including that one, not the step alone.
+    """
+    rows = month_rows(total_rows)
+    summary_file = os.path.join(folder, f"summary_{total_rows}.xlsx")
+    final_file = os.path.join(folder, f"draft_{total_rows}.xlsx")
+    raw_file = os.path.join(folder, f"raw_3rdparty_{total_rows}.xlsx")
+    third_party_file = os.path.join(folder, f"draft_3rdparty_{total_rows}.xlsx")
+
+    started = time.perf_counter()
+    headers = build_summary(summary_file, rows, seed)
+    build_draft(final_file)
+    build_third_party(raw_file, third_party_file, total_rows, seed)
+    generate_seconds = time.perf_counter() - started
+
+    json_data = {"summary_file": summary_file, "final_file": final_file, "selected_week": WEEK, "incremental": False}
+    for month, (header, count) in enumerate(zip(headers, rows), start=1):
+        json_data[f"header_month{month}"] = header
+        json_data[f"data_count_month{month}"] = count
+
+    steps: list[dict] = []
+    wb = _measure(steps, "load Draft", 0, load_workbook, final_file)
+    _measure(steps, "add_row", sum(rows) + rows[0], add_row.process, wb, json_data)
+    _measure(steps, "copy_data", rows[0], copy_data.process, wb, json_data)
+    summary = SummaryReader(summary_file, columns={*ongoing_month.summary_columns(), *month_engine.summary_columns()})
+    _measure(steps, "ongoing_month", rows[0], ongoing_month.process, wb, json_data, summary)
+    for spec in month_engine.month_specs(json_data):
+        count = json_data[spec["count_key"]]
+        if count <= 0:
+            continue
+        _measure(steps, f"month_{spec['month']}", count, _run_month, wb, spec, json_data, summary)
+    _measure(steps, "save Draft", sum(rows) + rows[0], wb.save, final_file)
+    wb.close()
+
+    third_party = _load_third_party()
+    _measure(steps, "3rd_party.move_data", THIRD_PARTY_ROWS, third_party.move_data,
+             raw_file, third_party_file, RAW_SHEET, THIRD_PARTY_SHEET)
+
+    return {"rows": total_rows, "month_rows": rows, "generate_s": round(generate_seconds, 2), "steps": steps}
+
+def run(sizes=DEFAULT_SIZES, folder: str | None = None, seed: int = 1) -> list[dict]:
+    """Benchmark every size, each in its own process, and return the results."""
+    folder = folder or tempfile.mkdtemp(prefix="weekly_benchmark_")
+    os.makedirs(folder, exist_ok=True)
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for size in sizes:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            results.append(pool.submit(run_size, size, folder, seed).result())
+        print_table([results[-1]])
+    return results
+
+def print_table(results: list[dict]) -> None:
+    """
+    Print the step figures of every size as a fixed-width table.
+
+    'Proc peak MB' is the process peak after the step (cumulative over the
+    size's steps so far), not the memory used by the step itself.
+    """
+    header = f"{'Rows':>8} {'Step':<22} {'Step rows':>9} {'Wall s':>8} {'CPU s':>8} {'Rows/s':>10} {'Proc peak MB':>12}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        for step in result["steps"]:
+            rate = "" if step["rows_per_s"] is None or not step["rows"] else f"{step['rows_per_s']:.0f}"
+            peak = "" if step["peak_rss_mb"] is None else f"{step['peak_rss_mb']:.0f}"
+            print(f"{result['rows']:>8} {step['step']:<22} {step['rows']:>9} {step['wall_s']:>8.2f} "
+                  f"{step['cpu_s']:>8.2f} {rate:>10} {peak:>12}")
+        print()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the weekly report steps on synthetic data of growing size.")
+    parser.add_argument("--rows", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="total summary data rows per run (default: 100 1000 10000 100000)")
+    parser.add_argument("--folder", help="where the synthetic workbooks are written (default: a temp folder)")
+    parser.add_argument("--output", help="JSON file receiving the results")
+    parser.add_argument("--seed", type=int, default=1, help="random seed of the synthetic data")
+    args = parser.parse_args(argv)
+
+    results = run(args.rows, args.folder, args.seed)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=1)
+        print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
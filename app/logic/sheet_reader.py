@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import codecs
+import re
+import zipfile
+
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+from openpyxl.utils import column_index_from_string, get_column_letter
+from openpyxl.utils.datetime import from_excel
+
+from xml_patcher import SHARED_STRINGS_PART, XlsxPackage, _CELL_RE, _SI_RE, _attrs, _unescape
+
+STYLES_PART = "xl/styles.xml"
+
+# Bytes of sheet XML decompressed by the first read; later reads double, so
+# growing the buffer stays linear in the size actually read
+CHUNK_SIZE = 64 * 1024
+
+_ROW_START_RE = re.compile(r'<row\b([^>]*)>')
+_ROW_NUMBER_RE = re.compile(r'\br="(\d+)"')
+_VALUE_RE = re.compile(r'<v>(.*?)</v>', re.S)
+_TEXT_RE = re.compile(r'<t\b[^>]*>(.*?)</t>', re.S)
+_NUMBER_INT_RE = re.compile(r'^-?\d+$')
+_NUM_FMT_RE = re.compile(r'<numFmt\b([^>]*)/>')
+_CELL_XFS_RE = re.compile(r'<cellXfs\b[^>]*>(.*?)</cellXfs>', re.S)
+_XF_RE = re.compile(r'<xf\b([^>]*?)/?>')
+_COLUMN_RE = re.compile(r'^[A-Z]+')
+
+class SparseSheetReader:
+    """
+    Random access to the cached values of a few cells of one worksheet.
+
+    load_workbook(..., data_only=True) materialises every cell of the wide
+    summary workbook to read two columns. This reader decompresses the sheet
+    XML only up to the last row asked for, keeps a row -> offset index of
+    what it has seen and parses just the requested cells of those rows.
+    Values are the ones Excel cached, typed like openpyxl returns them:
+    numbers, datetimes for date-formatted numbers, text (shared or inline),
+    booleans and error codes.
+    """
+
+    def __init__(self, path: str, sheet_name: str):
+        """
+        Args:
+            path (str): Path to the .xlsx workbook.
+            sheet_name (str): Worksheet to read.
+        """
+        self.path = path
+        self.sheet_name = sheet_name
+        self.cells_read = 0
+        self._archive = zipfile.ZipFile(path)
+        package = XlsxPackage(self._archive)
+        if sheet_name not in package.sheets:
+            self._archive.close()
+            raise KeyError(f"Worksheet {sheet_name} does not exist.")
+        self._part = package.sheets[sheet_name]
+        self._stream = self._archive.open(self._part)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._xml = ""
+        self._scanned = 0  # Offset up to which row tags have been indexed
+        self._rows: dict[int, tuple[int, int]] = {}  # row -> (start, end) of its content
+        self._open_row: tuple[int, int] | None = None  # Last row seen, its end not known yet
+        self._last_row = 0
+        self._done = False
+        self._strings: list[str] | None = None
+        self._string_spans: list | None = None
+        self._date_styles: dict[str, bool] | None = None  # s attribute -> timedelta format?
+        self._epoch = package.epoch
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        self._stream.close()
+        self._archive.close()
+
+    @property
+    def bytes_read(self) -> int:
+        """Characters of sheet XML decompressed so far."""
+        return len(self._xml)
+
+    def _index_more(self) -> bool:
+        """Decompress the next chunk and index the rows it completes."""
+        if self._done:
+            return False
+        chunk = self._stream.read(max(CHUNK_SIZE, len(self._xml)))
+        self._xml += self._decoder.decode(chunk, final=not chunk)
+        if not chunk:
+            self._done = True
+
+        for match in _ROW_START_RE.finditer(self._xml, self._scanned):
+            self._close_open_row(match.start())
+            number = _ROW_NUMBER_RE.search(match.group(1))
+            self._last_row = int(number.group(1)) if number else self._last_row + 1
+            self._scanned = match.end()
+            if not match.group(1).endswith("/"):  # <row .../> carries no cells
+                self._open_row = (self._last_row, match.end())
+
+        # Rows do not nest: the first </row> after an open row ends it
+        if self._open_row is not None:
+            end = self._xml.find("</row>", self._open_row[1])
+            if end != -1:
+                self._close_open_row(end)
+        return True
+
+    def _close_open_row(self, end: int) -> None:
+        if self._open_row is not None:
+            row, start = self._open_row
+            self._rows[row] = (start, end)
+            self._open_row = None
+
+    def _row_xml(self, row: int) -> str:
+        """Return the cell XML of a sheet row ('' for an empty row)."""
+        while row not in self._rows:
+            # Rows are stored in order: once a later row was seen, this one is empty
+            if self._last_row > row:
+                return ""
+            if not self._index_more():
+                self._close_open_row(len(self._xml))
+                if row not in self._rows:
+                    return ""
+        start, end = self._rows[row]
+        return self._xml[start:end]
+
+    def _shared_string(self, index: int) -> str:
+        if self._strings is None:
+            if SHARED_STRINGS_PART in self._archive.namelist():
+                xml = self._archive.read(SHARED_STRINGS_PART).decode("utf-8")
+                self._string_spans = [match.group(1) for match in _SI_RE.finditer(xml)]
+            else:
+                self._string_spans = []
+            self._strings = [None] * len(self._string_spans)
+        if self._strings[index] is None:
+            # Plain and rich text entries alike: the text of every <t> run
+            self._strings[index] = "".join(_unescape(text) for text in _TEXT_RE.findall(self._string_spans[index]))
+        return self._strings[index]
+
+    def _load_date_styles(self) -> dict[str, bool]:
+        """Map the style index of every date format to whether it is a duration."""
+        if self._date_styles is None:
+            self._date_styles = {}
+            if STYLES_PART in self._archive.namelist():
+                xml = self._archive.read(STYLES_PART).decode("utf-8")
+                formats = dict(BUILTIN_FORMATS)
+                for match in _NUM_FMT_RE.finditer(xml):
+                    attrs = _attrs(match.group(1))
+                    formats[int(attrs["numFmtId"])] = _unescape(attrs.get("formatCode", ""))
+                xfs = _CELL_XFS_RE.search(xml)
+                for index, match in enumerate(_XF_RE.finditer(xfs.group(1) if xfs else "")):
+                    code = formats.get(int(_attrs(match.group(1)).get("numFmtId", 0)), "General")
+                    if is_date_format(code):
+                        self._date_styles[str(index)] = is_timedelta_format(code)
+        return self._date_styles
+
+    def _parse_cell(self, head: str, body: str | None):
+        """Value of a cell from its start tag attributes and its content."""
+        if body is None:
+            return None
+        attrs = _attrs(head)
+        kind = attrs.get("t", "n")
+
+        if kind == "inlineStr":
+            return "".join(_unescape(text) for text in _TEXT_RE.findall(body)) or None
+        match = _VALUE_RE.search(body)
+        if match is None:
+            return None
+        raw = match.group(1)
+        if kind == "s":
+            return self._shared_string(int(raw))
+        if kind in ("str", "e"):
+            return _unescape(raw)
+        if kind == "b":
+            return raw == "1"
+        value = int(raw) if _NUMBER_INT_RE.match(raw) else float(raw)
+        style = attrs.get("s")
+        if style is not None:
+            date_styles = self._load_date_styles()
+            if style in date_styles:
+                return from_excel(value, self._epoch, timedelta=date_styles[style])
+        return value
+
+    def _find_cell(self, xml: str, coordinate: str, start: int, end: int):
+        """
+        Locate a cell between offsets start and end of the sheet XML.
+
+        Returns:
+            tuple: (value, offset after the cell), or (None, start) when absent.
+        """
+        position = xml.find(f'r="{coordinate}"', start, end)
+        if position == -1:
+            return None, start
+        tag = xml.rfind("<c", start, position)
+        head_end = xml.find(">", position)
+        if xml[head_end - 1] == "/":
+            return None, head_end + 1
+        close = xml.find("</c>", head_end)
+        return self._parse_cell(xml[tag + 2:head_end], xml[head_end + 1:close]), close + 4
+
+    def _cell_value(self, row_xml: str, coordinate: str):
+        return self._find_cell(row_xml, coordinate, 0, len(row_xml))[0]
+
+    def row(self, row: int) -> dict[int, object]:
+        """Every non-empty cell of a sheet row as {column index: value}."""
+        values = {}
+        for match in _CELL_RE.finditer(self._row_xml(row)):
+            head = match.group(1)
+            value = self._parse_cell(head, match.group(2))
+            if value is not None:
+                coordinate = _attrs(head)["r"]
+                values[column_index_from_string(_COLUMN_RE.match(coordinate).group())] = value
+        self.cells_read += len(values)
+        return values
+
+    def columns(self, columns: list[int], last_row: int | None = None) -> tuple[dict[int, list], int]:
+        """
+        Read whole columns in one pass over the rows.
+
+        Args:
+            columns (list[int]): Column indexes (1-based) to read.
+            last_row (int | None): Last sheet row to read; the whole sheet when None.
+
+        Returns:
+            tuple: ({column index: values of rows 1..n}, n) where n is the last
+            row holding any value in any column of the sheet (or last_row).
+        """
+        order = sorted(set(columns))
+        letters = [get_column_letter(column) for column in order]
+        result = {column: [] for column in order}
+        last_filled = 0
+        row = 1
+        while last_row is None or row <= last_row:
+            if row not in self._rows:
+                if self._last_row > row:
+                    for values in result.values():
+                        values.append(None)
+                    row += 1
+                    continue
+                if not self._index_more():
+                    self._close_open_row(len(self._xml))
+                    if row not in self._rows:
+                        break
+                continue
+            start, end = self._rows[row]
+            xml = self._xml
+            # Cells are stored in column order, so each search starts after the previous cell
+            position = start
+            for column, letter in zip(order, letters):
+                value, position = self._find_cell(xml, f"{letter}{row}", position, end)
+                result[column].append(value)
+            if xml.find("<v>", start, end) != -1 or xml.find("<is>", start, end) != -1:
+                last_filled = row
+            row += 1
+
+        rows = last_row if last_row is not None else last_filled
+        for values in result.values():
+            del values[rows:]
+            values.extend([None] * (rows - len(values)))
+        self.cells_read += rows * len(order)
+        return result, rows
+
+    def value(self, coordinate: str):
+        """Cached value of one cell, e.g. value('AKC236'); None when empty."""
+        row = int(re.search(r"\d+$", coordinate).group())
+        self.cells_read += 1
+        return self._cell_value(self._row_xml(row), coordinate)
+
+    def column(self, column: str, first_row: int, last_row: int) -> list:
+        """Cached values of column rows first_row..last_row (inclusive)."""
+        column_index_from_string(column)  # Validate the letters
+        values = []
+        for row in range(first_row, last_row + 1):
+            values.append(self._cell_value(self._row_xml(row), f"{column}{row}"))
+        self.cells_read += len(values)
+        return values
+
+def read_block(path: str, sheet_name: str, first_row: int, last_row: int, first_column: int, last_column: int) -> list[list]:
+    """
+    Cached values of a rectangular range, row by row.
+
+    A plain function so worker processes can run it on many files at once.
+
+    Args:
+        path (str): Path to the .xlsx workbook.
+        sheet_name (str): Worksheet to read.
+        first_row, last_row (int): Sheet rows of the range (inclusive).
+        first_column, last_column (int): Column indexes (1-based, inclusive).
+
+    Returns:
+        list[list]: One list of values per row; None for empty cells.
+    """
+    with SparseSheetReader(path, sheet_name) as reader:
+        values, _ = reader.columns(list(range(first_column, last_column + 1)), last_row)
+    return [
+        [values[column][row - 1] for column in range(first_column, last_column + 1)]
+        for row in range(first_row, last_row + 1)
+    ]
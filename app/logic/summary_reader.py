@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from openpyxl.cell.cell import ERROR_CODES
+from pandas.io.parsers import TextParser
+
+from run_report import count_cells, io_timer
+from sheet_reader import SparseSheetReader
+
+# Name of the sheet every month step reads from the summary workbook
+SUMMARY_SHEET = 'ITM Summary'
+
+# Declared types of summary columns (stripped names). A conversion is only
+# applied when it keeps every value, so text in a numeric or date column
+# leaves that column as it was parsed.
+SUMMARY_DTYPES = {
+    'Company': 'category',
+    'Buyer': 'category',
+    'Load Port': 'category',
+    'ETA/ATA': 'datetime',
+    'ETB': 'datetime',
+    'ETD': 'datetime',
+    'TM (AR)': 'float',
+    'M (AD)': 'float',
+    'ASH (AD)': 'float',
+    'ASH (AR)': 'float',
+    'TS (AD)': 'float',
+    'TS (AR)': 'float',
+    'CV (AD)': 'float',
+    'CV (AR)': 'float',
+    'CV (NAR)': 'float',
+}
+
+class SummaryReader:
+    """
+    Parse-once access to the 'ITM Summary' sheet of the summary workbook.
+
+    The ongoing month and every month_N step used to call pd.read_excel on the
+    same sheet with their own header row, so one run parsed the wide summary
+    workbook up to seven times. The reader parses the sheet once into a raw
+    grid (no header) and hands each step a DataFrame sliced at its header row,
+    equivalent to pd.read_excel(..., header=header_row).
+
+    Given the column names the steps map, only those columns are parsed
+    (out of ~970 in the sheet): each block's header row is read to find
+    where its columns are, and just those sheet columns are loaded into the
+    grid. Columns then get the SUMMARY_DTYPES types.
+    """
+
+    def __init__(self, summary_file: str, sheet_name: str = SUMMARY_SHEET, columns=None):
+        """
+        Args:
+            summary_file (str): Path to the summary Excel file.
+            sheet_name (str): Sheet to read, 'ITM Summary' by default.
+            columns: Column names (stripped) the frames need; every column
+                is parsed when None.
+        """
+        self.summary_file = summary_file
+        self.sheet_name = sheet_name
+        self.columns = set(columns) if columns is not None else None
+        self.parse_count = 0  # Number of times the workbook was actually parsed
+        self._grid: pd.DataFrame | None = None
+        self._frames: dict[tuple, pd.DataFrame] = {}
+        self._reader: SparseSheetReader | None = None
+        self._rows: int | None = None  # Grid length of the projected read
+
+    @property
+    def grid(self) -> pd.DataFrame:
+        """The whole sheet as a raw grid: row i of the grid is sheet row i + 1."""
+        if self._grid is None:
+            with io_timer("load"):
+                self._grid = pd.read_excel(self.summary_file, sheet_name=self.sheet_name, header=None)
+            self.parse_count += 1
+            count_cells(read=self._grid.size)
+        return self._grid
+
+    def frame(self, header_row: int, rows: int | None = None) -> pd.DataFrame:
+        """
+        Return the sheet as a DataFrame whose column labels come from header_row.
+
+        Args:
+            header_row (int): 0-based header row, same meaning as pd.read_excel(header=...).
+            rows (int | None): Keep only this many data rows (the block), so
+                column types are inferred from the block alone; every row
+                below the header when None.
+
+        Returns:
+            pd.DataFrame: Rows below the header, re-indexed from 0.
+        """
+        key = (header_row, rows)
+        if key not in self._frames:
+            if self.columns is None:
+                grid = self.grid
+                body = grid.iloc[header_row + 1:].reset_index(drop=True)
+                body.columns = _column_labels(grid.iloc[header_row].tolist())
+            else:
+                body = self._projected_frame(header_row)
+            if rows is not None:
+                body = body.iloc[:rows]
+            self._frames[key] = _apply_dtypes(infer_types(body))
+
+        # Shallow copy so a step renaming its columns does not touch the cache
+        return self._frames[key].copy(deep=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def _projected_frame(self, header_row: int) -> pd.DataFrame:
+        """frame() for the wanted columns only, read straight from the sheet XML."""
+        with io_timer("load"):
+            if self._reader is None:
+                self._reader = SparseSheetReader(self.summary_file, self.sheet_name)
+            # Labels come from the whole header row, so 'Unnamed: n' and '.1'
+            # suffixes come out exactly as with the full grid
+            header = self._reader.row(header_row + 1)
+            width = max(header, default=0)
+            labels = _column_labels([_excel_value(header.get(column), np.nan) for column in range(1, width + 1)])
+            positions = [
+                index for index, label in enumerate(labels)
+                if isinstance(label, str) and label.strip() in self.columns
+            ]
+            self._load_columns(positions)
+
+        body = self._grid.loc[header_row + 1:, positions].reset_index(drop=True)
+        body.columns = [labels[index] for index in positions]
+        return body
+
+    def _load_columns(self, positions: list[int]) -> None:
+        """Add the sheet columns at 0-based positions to the projected grid."""
+        missing = [index for index in positions if self._grid is None or index not in self._grid.columns]
+        if not missing and self._grid is not None:
+            return
+        values, rows = self._reader.columns([index + 1 for index in missing], self._rows)
+        self._rows = rows
+        self.parse_count += self._grid is None
+        count_cells(read=rows * len(missing))
+
+        # The same conversions and per-column type inference pd.read_excel applies
+        data = [[_excel_value(values[index + 1][row]) for index in missing] for row in range(rows)]
+        part = TextParser(data, header=None, skip_blank_lines=False).read() if data else pd.DataFrame()
+        part = part.reindex(index=range(rows), columns=range(len(missing)))
+        part.columns = missing
+        self._grid = part if self._grid is None else pd.concat([self._grid, part], axis=1)
+
+def _excel_value(value, empty=""):
+    """A cell value as pandas' openpyxl reader hands it to the parser."""
+    if value is None:
+        return empty
+    if isinstance(value, str) and value in ERROR_CODES:
+        return np.nan
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+def _apply_dtypes(body: pd.DataFrame) -> pd.DataFrame:
+    """Convert the columns named in SUMMARY_DTYPES where no value is lost."""
+    for column in body.columns:
+        kind = SUMMARY_DTYPES.get(column.strip() if isinstance(column, str) else column)
+        if kind is None:
+            continue
+        values = body[column]
+        if kind == 'category' and (values.dtype == object or pd.api.types.is_string_dtype(values)):
+            body[column] = values.astype('category')
+        elif kind == 'float' and pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            body[column] = values.astype(np.float64)
+        elif kind == 'datetime' and values.dtype == object:
+            present = values.dropna()
+            if len(present) and present.map(lambda value: isinstance(value, (pd.Timestamp, np.datetime64)) or hasattr(value, 'year')).all():
+                body[column] = pd.to_datetime(values)
+    return body
+
+def infer_types(body: pd.DataFrame) -> pd.DataFrame:
+    """
+    Give a frame of raw cell values the dtypes pd.read_excel would have inferred for it.
+
+    Used for the sliced summary blocks and for the Draft tables read by
+    export_tables. A raw grid mixes header text and data in every column, so
+    each column is re-inferred; object columns made only of numbers and numeric strings
+    become numeric, just like the parser behind read_excel does.
+    """
+    body = body.infer_objects()
+    for column in body.columns[body.dtypes == object]:
+        try:
+            body[column] = pd.to_numeric(body[column])
+        except (ValueError, TypeError):
+            pass  # Genuinely mixed or text column, keep it as objects
+    return body
+
+def _column_labels(values: list) -> list:
+    """
+    Build column labels the way pd.read_excel does for a header row.
+
+    Empty header cells become 'Unnamed: <index>' and repeated labels get a
+    '.1', '.2', ... suffix.
+    """
+    labels = []
+    seen: dict = {}
+    for index, value in enumerate(values):
+        label = f"Unnamed: {index}" if pd.isna(value) else value
+        if label in seen:
+            seen[label] += 1
+            label = f"{label}.{seen[label]}"
+        else:
+            seen[label] = 0
+        labels.append(label)
+    return labels
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+from column_writer import written_cells
+from run_log import get_logger
+
+log = get_logger("workbook_io")
+
+def is_dirty(wb) -> bool:
+    """
+    Whether anything in a workbook changed since it was loaded.
+
+    Every change the pipeline makes goes through column_writer: cell values
+    (write_columns / write_cell record only values that differ) and table
+    resizes, which mark the whole sheet because they move table refs and
+    stamp row styles.
+    """
+    return any(written_cells(wb).values())
+
+@contextmanager
+def atomic_path(path: str):
+    """
+    Yield a temporary path next to `path` and rename it over `path` on success.
+
+    The temporary file is in the same directory, so the rename is atomic and
+    a crash mid-write leaves the original file untouched. It is removed when
+    the block raises.
+    """
+    folder = os.path.dirname(os.path.abspath(path))
+    suffix = os.path.splitext(path)[1]
+    handle, temp_path = tempfile.mkstemp(prefix=".~", suffix=suffix, dir=folder)
+    os.close(handle)
+    try:
+        if os.path.exists(path):
+            shutil.copymode(path, temp_path)  # mkstemp creates the file owner-only
+        yield temp_path
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def save_workbook(wb, path: str, force: bool = False) -> bool:
+    """
+    Save a workbook atomically, or not at all when nothing changed.
+
+    Args:
+        wb: openpyxl workbook.
+        path (str): File to save to (normally the file it was loaded from).
+        force (bool): Save even when is_dirty(wb) is False.
+
+    Returns:
+        bool: True when the file was written.
+    """
+    if not force and not is_dirty(wb):
+        log.info(f"No changes in '{os.path.basename(path)}', not saved.")
+        return False
+    with atomic_path(path) as temp_path:
+        wb.save(temp_path)
+    return True
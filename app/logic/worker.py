@@ -0,0 +1,211 @@
+# worker.py
+"""
+Long-lived logic process for the GUI.
+
+The GUI starts this script once; it imports the logic modules (pandas,
+openpyxl and every step) a single time and then serves run requests, so a
+run no longer pays for a fresh interpreter and its imports.
+
+Protocol: one JSON object per line. Requests arrive on stdin:
+
+    {"id": 1, "command": "run", "config": "<path to inputan.json>"}
+    {"id": 2, "command": "detect", "summary_file": "<path to the summary>"}
+    {"id": 3, "command": "dry_run", "config": {<run config, as in inputan.json>}}
+    {"id": 4, "command": "ping"}
+    {"command": "shutdown"}
+
+Messages go back on stdout:
+
+    {"type": "ready", "pid": 1234, "version": 1, "import_s": 1.8}
+    {"type": "log", "id": 1, "text": "Running Process add_row..."}
+    {"type": "progress", "id": 1, "step": "Process add_row", "state": "started"}
+    {"type": "done", "id": 1, "exit_code": 0, "elapsed_s": 3.2}
+    {"type": "blocks", "id": 2, "blocks": [{"header": 132, "count": 37}, ...]}
+    {"type": "diff", "id": 3, "diff": {"sheets": {...}, ...}, "text": "Dry run (0.4s): ..."}
+    {"type": "pong", "id": 4}
+
+A failing run is reported with a traceback and a non-zero exit code; the
+worker itself keeps serving requests.
+"""
+from __future__ import annotations
+
+import io
+import json
+import os
+import sys
+import time
+import traceback
+
+# Bump when the message layout changes
+PROTOCOL_VERSION = 1
+
+class ProtocolStream(io.TextIOBase):
+    """Text stream turning every line written to it into a 'log' message."""
+
+    def __init__(self, send, kind: str = "log"):
+        super().__init__()
+        self.send = send
+        self.kind = kind
+        self.request_id = None
+        self.muted = False  # Drop lines instead of sending them
+        self._buffer = ""
+
+    @property
+    def encoding(self) -> str:
+        return "utf-8"
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self._buffer += text
+        *lines, self._buffer = self._buffer.split("\n")
+        if self.muted:
+            return len(text)
+        for line in lines:
+            self.send({"type": self.kind, "id": self.request_id, "text": line})
+        return len(text)
+
+    def flush(self) -> None:
+        if self._buffer and not self.muted:
+            self.send({"type": self.kind, "id": self.request_id, "text": self._buffer})
+            self._buffer = ""
+
+class Worker:
+    """Serve run requests read from `stdin`, answering on `stdout`."""
+
+    def __init__(self, stdin, stdout):
+        self.stdin = stdin
+        self.stdout = stdout
+        self.request_id = None
+        # Anything printed while serving becomes a message instead of corrupting the protocol
+        self.log_stream = ProtocolStream(self.send, "log")
+        self.error_stream = ProtocolStream(self.send, "error")
+
+    def send(self, message: dict) -> None:
+        self.stdout.write(json.dumps(message, ensure_ascii=False) + "\n")
+        self.stdout.flush()
+
+    def on_record(self, record) -> None:
+        """Report the start and end of each pipeline step as a progress message."""
+        state = getattr(record, "state", None)
+        if self.request_id is None or state is None:
+            return
+        message = {"type": "progress", "id": self.request_id, "step": record.step, "state": state}
+        if hasattr(record, "elapsed_ms"):
+            message["elapsed_ms"] = record.elapsed_ms
+        self.send(message)
+
+    def run(self, request: dict) -> int:
+        """Run the pipeline for one request and return its exit code."""
+        import main_logic
+
+        try:
+            return main_logic.main(request.get("config"))
+        except SystemExit as e:
+            return e.code if isinstance(e.code, int) else 1
+        except Exception:
+            # The traceback goes to the GUI log like it did from a one-shot process
+            traceback.print_exc()
+            return 1
+
+    def detect(self, request: dict) -> dict:
+        """Month blocks of a summary file, for prefilling the GUI."""
+        import block_detector
+
+        try:
+            blocks = block_detector.detect_blocks(request["summary_file"])
+        except Exception as e:
+            return {"type": "error", "id": request.get("id"), "text": f"Month blocks could not be detected: {e}"}
+        return {"type": "blocks", "id": request.get("id"), "blocks": blocks}
+
+    def dry_run(self, request: dict) -> dict:
+        """What a run with the given config would change, for the confirmation popup."""
+        import block_detector
+        import dry_run
+
+        config = dict(request["config"])
+        # The steps' own log lines would only clutter the GUI log before the real run
+        self.log_stream.muted = True
+        try:
+            block_detector.fill_config(config)
+            diff = dry_run.dry_run(config)
+        except Exception as e:
+            return {"type": "error", "id": request.get("id"), "text": f"Dry run failed: {e}"}
+        finally:
+            self.log_stream.flush()
+            self.log_stream.muted = False
+        return {"type": "diff", "id": request.get("id"), "diff": diff, "text": dry_run.format_diff(diff)}
+
+    def handle(self, request: dict) -> bool:
+        """Answer one request; returns False once the worker should stop."""
+        command = request.get("command")
+        if command == "shutdown":
+            return False
+        if command == "ping":
+            self.send({"type": "pong", "id": request.get("id")})
+            return True
+        if command == "detect":
+            self.send(self.detect(request))
+            return True
+        if command == "dry_run":
+            self.send(self.dry_run(request))
+            return True
+        if command != "run":
+            self.send({"type": "error", "id": request.get("id"), "text": f"Unknown command: {command!r}"})
+            return True
+
+        self.request_id = request.get("id")
+        self.log_stream.request_id = self.error_stream.request_id = self.request_id
+        started = time.perf_counter()
+        try:
+            exit_code = self.run(request)
+        finally:
+            self.log_stream.flush()
+            self.error_stream.flush()
+        self.send({
+            "type": "done",
+            "id": self.request_id,
+            "exit_code": exit_code,
+            "elapsed_s": round(time.perf_counter() - started, 3),
+        })
+        self.request_id = self.log_stream.request_id = self.error_stream.request_id = None
+        return True
+
+    def serve(self) -> None:
+        """Import the logic modules, announce readiness and serve until shutdown or EOF."""
+        sys.stdout, sys.stderr = self.log_stream, self.error_stream
+
+        started = time.perf_counter()
+        import main_logic  # noqa: F401  (pays every import once, before the first run)
+        from run_log import add_listener
+        add_listener(self.on_record)
+        self.send({
+            "type": "ready",
+            "pid": os.getpid(),
+            "version": PROTOCOL_VERSION,
+            "import_s": round(time.perf_counter() - started, 3),
+        })
+
+        for line in self.stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError:
+                self.send({"type": "error", "id": None, "text": f"Invalid request: {line[:200]}"})
+                continue
+            if not self.handle(request):
+                break
+
+def main() -> None:
+    # The pipes are UTF-8 whatever the console code page is
+    stdin = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+    stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
+    # The logic modules import each other by bare name
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    Worker(stdin, stdout).serve()
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,19 @@
+import time  # Import the time module to measure startup
+STARTED = time.perf_counter()  # Startup reference for the startup probe, taken before the Qt imports
+
+import json  # Import the json module to write the startup probe result
 import sys  # Import the sys module for system-specific parameters and functions
 import os  # Import the os module for interacting with the operating system
-from PyQt6.QtWidgets import QApplication  # Import QApplication from PyQt6 for GUI application
-from gui.main_gui import MyApp  # Import the main application class from the GUI module
+from PyQt6.QtCore import QEvent, QObject, Qt, QTimer  # Import the event and timer classes used by the startup probe
+from PyQt6.QtGui import QPixmap  # Import QPixmap for the splash image
+from PyQt6.QtWidgets import QApplication, QSplashScreen  # Import QApplication and the splash screen from PyQt6
+
+# Set to a file path, the app writes its startup timings there after the first paint and
+# closes (used by gui/startup_benchmark.py)
+PROBE_ENV = "DRAFT_STARTUP_PROBE"
+
+# The startup probe reports after this long even if no paint event reached the window
+PROBE_TIMEOUT_MS = 10000
 
 class ResourceHelper:
     @staticmethod
@@ -22,9 +34,68 @@ class ResourceHelper:
             base_path = os.path.dirname(os.path.abspath(__file__))  # Get the directory of the current script
         return os.path.join(base_path, relative_path)  # Join the base path with the relative path
 
+class StartupProbe(QObject):
+    """
+    Record the first paint of the main window, time the deferred pages, write the timings and close.
+
+    The first Paint event delivered to the window or any of its widgets marks
+    the first paint. Should none arrive within PROBE_TIMEOUT_MS (a platform
+    that never exposes the window), the timings are written anyway with
+    "paint_seen": false, so the benchmark never waits on a probe that cannot fire.
+    """
+
+    def __init__(self, gui, marks: dict, out_path: str):
+        super().__init__(gui)
+        self.gui = gui
+        self.marks = marks
+        self.out_path = out_path
+        self.paint_seen = False
+        self.reported = False
+        QTimer.singleShot(PROBE_TIMEOUT_MS, self.report)
+
+    def eventFilter(self, obj, event):
+        if (event.type() == QEvent.Type.Paint and not self.paint_seen
+                and obj.isWidgetType() and obj.window() is self.gui):
+            self.paint_seen = True
+            self.marks["first_paint"] = time.perf_counter()
+            self.marks["first_paint_epoch"] = time.time()
+            QApplication.instance().removeEventFilter(self)
+            # Report from the event loop, after the paint has finished
+            QTimer.singleShot(0, self.report)
+        return False
+
+    def report(self):
+        if self.reported:
+            return
+        self.reported = True
+        QApplication.instance().removeEventFilter(self)
+        if not self.paint_seen:
+            self.marks["first_paint"] = time.perf_counter()
+            self.marks["first_paint_epoch"] = time.time()
+        result = {f"{name}_ms": round((mark - STARTED) * 1000, 1)
+                  for name, mark in self.marks.items() if name != "first_paint_epoch"}
+        result["first_paint_epoch"] = self.marks["first_paint_epoch"]
+        result["paint_seen"] = self.paint_seen
+        # Cost of the pages left out of startup, paid on their first show
+        for page in (self.gui.page_2, self.gui.page_3, self.gui.page_4):
+            started = time.perf_counter()
+            self.gui.ensure_page(page)
+            result[f"{page.objectName()}_build_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        with open(self.out_path, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        self.gui.close()
+
 def main():
+    marks = {"qt_import": time.perf_counter()}
     app = QApplication(sys.argv)  # Create a QApplication instance
 
+    # Show the splash first, so something is on screen while the main window is built
+    logo = QPixmap(ResourceHelper.get_path('assets/ITM_logo.png'))
+    splash = QSplashScreen(logo.scaledToWidth(360, Qt.TransformationMode.SmoothTransformation))
+    splash.show()
+    app.processEvents()  # Paint the splash before continuing
+    marks["splash"] = time.perf_counter()
+
     # Load the style.qss file using ResourceHelper to get the relative path
     try:
         file_path_qss = ResourceHelper.get_path('style/style.qss')  # Get the path to the stylesheet
@@ -33,8 +104,16 @@ def main():
     except FileNotFoundError:
         print("Style file not found, continuing without stylesheet.")  # Handle missing stylesheet
 
+    from gui.main_gui import MyApp  # Import the main application class once the splash is up
+    marks["gui_import"] = time.perf_counter()
+
     gui = MyApp()  # Create an instance of the main application GUI
+    marks["window"] = time.perf_counter()
+    probe_path = os.environ.get(PROBE_ENV)
+    if probe_path:
+        app.installEventFilter(StartupProbe(gui, marks, probe_path))
     gui.show()  # Show the GUI window
+    splash.finish(gui)  # Close the splash once the window is shown
     sys.exit(app.exec())  # Start the application event loop and exit when done
 
 # Run the main function if this script is executed directly
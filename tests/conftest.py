@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+
+# The logic modules import each other by bare name, as they do when run from app/logic
+LOGIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app", "logic")
+if LOGIC_DIR not in sys.path:
+    sys.path.insert(0, LOGIC_DIR)
+
+@pytest.fixture
+def report_config(tmp_path):
+    """Run config of a small synthetic report set: summary with six month blocks and an empty Draft."""
+    import scaling_benchmark
+
+    rows = scaling_benchmark.month_rows(60)
+    summary_file = str(tmp_path / "summary.xlsx")
+    final_file = str(tmp_path / "draft.xlsx")
+    headers = scaling_benchmark.build_summary(summary_file, rows)
+    scaling_benchmark.build_draft(final_file)
+
+    config = {"summary_file": summary_file, "final_file": final_file, "selected_week": scaling_benchmark.WEEK}
+    for month, (header, count) in enumerate(zip(headers, rows), start=1):
+        config[f"header_month{month}"] = header
+        config[f"data_count_month{month}"] = count
+    return config
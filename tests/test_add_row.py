@@ -0,0 +1,105 @@
+import pytest
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Font, PatternFill
+from openpyxl.worksheet.table import Table
+
+import add_row
+
+SHEET = "ITM Summary"
+YELLOW = PatternFill("solid", fgColor="FFFF00")
+
+def config(rows):
+    """Run config resizing TableOngoing and TableMonth1, which share data_count_month1."""
+    cfg = {"data_count_month1": rows}
+    cfg.update({f"data_count_month{month}": 0 for month in range(2, 7)})
+    return cfg
+
+def add_table(ws, name):
+    """A table over A3:E6: header row 3 and three styled data rows with a custom height."""
+    ws.append(["Report"])
+    ws.append([])
+    ws.append(["No.", "Vessel", "ETA", "Tonnage", "Buyer"])
+    for number in range(1, 4):
+        ws.append([number, f"MV {number}", None, number * 1000, "PLN"])
+        row = ws.max_row
+        for cell in ws[row]:
+            cell.font = Font(bold=True)
+            cell.fill = YELLOW
+        ws.cell(row, 4).number_format = "#,##0.00"
+        ws.row_dimensions[row].height = 21
+    ws.add_table(Table(displayName=name, ref="A3:E6"))
+
+@pytest.fixture
+def draft(tmp_path):
+    """Sheets 'ITM Summary' (TableOngoing, optionally with a note below it) and 'Month 1' (TableMonth1)."""
+    def build(note_below=False):
+        wb = Workbook()
+        ws = wb.active
+        ws.title = SHEET
+        add_table(ws, "TableOngoing")
+        if note_below:
+            ws["A20"] = "Prepared by"
+        add_table(wb.create_sheet("Month 1"), "TableMonth1")
+        path = tmp_path / "draft.xlsx"
+        wb.save(path)
+        return path
+    return build
+
+def resize(path, rows, edit=None):
+    """Run add_row on the Draft, optionally edit the sheet, save and reload it."""
+    wb = load_workbook(path)
+    add_row.process(wb, config(rows))
+    if edit:
+        edit(wb[SHEET])
+    wb.save(path)
+    return load_workbook(path)[SHEET]
+
+def test_grown_rows_take_the_style_of_the_last_row(draft):
+    path = draft()
+
+    def edit(ws):
+        # The new cells own their style: restyling one leaves the template row alone
+        ws["B8"].font = Font(italic=True)
+
+    ws = resize(path, 6, edit)
+
+    assert ws.tables["TableOngoing"].ref == "A3:E9"
+    assert ws.max_row == 9
+    for row in range(7, 10):
+        for cell in ws[row]:
+            assert cell.value is None
+            assert cell.fill.fgColor.rgb == YELLOW.fgColor.rgb
+        assert ws.cell(row, 4).number_format == "#,##0.00"
+        assert ws.cell(row, 1).number_format == "General"
+    assert ws["B8"].font.italic and not ws["B8"].font.bold
+    assert ws["B6"].font.bold and not ws["B6"].font.italic and ws["B9"].font.bold
+    # Existing rows keep their values and heights
+    assert [ws.cell(row, 2).value for row in range(4, 7)] == ["MV 1", "MV 2", "MV 3"]
+    assert ws.row_dimensions[6].height == 21
+
+def test_shrunk_table_drops_its_excess_rows(draft):
+    ws = resize(draft(), 1)
+
+    assert ws.tables["TableOngoing"].ref == "A3:E4"
+    assert ws.max_row == 4
+    assert [cell.value for cell in ws[4]] == [1, "MV 1", None, 1000, "PLN"]
+    assert ws["D4"].number_format == "#,##0.00" and ws["A4"].fill.fgColor.rgb == YELLOW.fgColor.rgb
+    assert ws.row_dimensions[4].height == 21
+    assert 5 not in ws.row_dimensions and 6 not in ws.row_dimensions
+
+def test_shrinking_leaves_the_content_below_the_table_in_place(draft):
+    ws = resize(draft(note_below=True), 2)
+
+    assert ws.tables["TableOngoing"].ref == "A3:E5"
+    assert ws.max_row == 20 and ws["A20"].value == "Prepared by"
+    assert all(cell.value is None and not cell.has_style for cell in ws[6])
+    assert 6 not in ws.row_dimensions
+
+def test_grow_after_shrink_round_trips(draft):
+    path = draft()
+    resize(path, 1)
+    ws = resize(path, 3)
+
+    assert ws.tables["TableOngoing"].ref == "A3:E6"
+    assert ws.max_row == 6
+    assert ws["D6"].number_format == "#,##0.00" and ws["E6"].font.bold and ws["E6"].value is None
@@ -0,0 +1,65 @@
+import pytest
+
+import block_detector
+import month_engine
+import scaling_benchmark
+
+@pytest.fixture(autouse=True)
+def cache_path(tmp_path, monkeypatch):
+    """Keep the block cache of the tests out of app/config."""
+    path = tmp_path / "summary_blocks.json"
+    monkeypatch.setattr(block_detector, "CACHE_PATH", path)
+    return path
+
+def make_summary(path, rows):
+    headers = scaling_benchmark.build_summary(str(path), rows)
+    return [{"header": header, "count": count} for header, count in zip(headers, rows)]
+
+def test_scan_blocks_finds_every_block_in_sheet_order(tmp_path):
+    expected = make_summary(tmp_path / "summary.xlsx", [12, 7, 30, 1, 9, 4])
+    assert block_detector.scan_blocks(str(tmp_path / "summary.xlsx")) == expected
+
+def test_blocks_past_the_sixth_get_their_own_months(tmp_path):
+    rows = [5, 6, 7, 8, 9, 10, 11, 12]
+    expected = make_summary(tmp_path / "summary.xlsx", rows)
+    config = {"summary_file": str(tmp_path / "summary.xlsx")}
+
+    assert block_detector.fill_config(config)
+    for month, block in enumerate(expected, start=1):
+        assert config[f"header_month{month}"] == block["header"]
+        assert config[f"data_count_month{month}"] == block["count"]
+    # The month engine processes exactly the detected months
+    assert [spec["month"] for spec in month_engine.month_specs(config)] == list(range(1, 9))
+
+def test_missing_months_are_disabled():
+    values = block_detector.config_values([{"header": 2, "count": 3}, {"header": 111, "count": 4}])
+    assert len(values) == 2 * block_detector.DEFAULT_MONTHS
+    assert values["header_month2"] == 111 and values["data_count_month2"] == 4
+    assert all(values[f"data_count_month{month}"] == 0 for month in range(3, 7))
+
+def test_cached_blocks_keep_the_sheet_order(tmp_path, monkeypatch):
+    summary_file = tmp_path / "summary.xlsx"
+    expected = make_summary(summary_file, [3, 20, 8, 15, 2, 6, 4])
+    assert block_detector.detect_blocks(str(summary_file)) == expected
+
+    def no_scan(*args):
+        raise AssertionError("the cached blocks should have been used")
+
+    monkeypatch.setattr(block_detector, "scan_blocks", no_scan)
+    config = {"summary_file": str(summary_file)}
+    block_detector.fill_config(config)
+    assert [config[f"header_month{month}"] for month in range(1, 8)] == [block["header"] for block in expected]
+    assert [config[f"data_count_month{month}"] for month in range(1, 8)] == [block["count"] for block in expected]
+
+def test_changed_file_is_scanned_again(tmp_path):
+    summary_file = tmp_path / "summary.xlsx"
+    make_summary(summary_file, [3, 4, 5, 6, 7, 8])
+    block_detector.detect_blocks(str(summary_file))
+
+    expected = make_summary(summary_file, [9, 1, 2])
+    assert block_detector.detect_blocks(str(summary_file)) == expected
+
+def test_configured_months_are_left_alone(tmp_path):
+    config = {"summary_file": str(tmp_path / "missing.xlsx"), "header_month1": 2, "data_count_month1": 5}
+    assert not block_detector.fill_config(config)
+    assert config == {"summary_file": str(tmp_path / "missing.xlsx"), "header_month1": 2, "data_count_month1": 5}
@@ -0,0 +1,49 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from column_writer import same_value, write_cell, write_columns, written_cells
+
+@pytest.mark.parametrize("old, new, same", [
+    (1, 1, True),
+    (1, 1.0, True),          # One number in the file
+    (True, True, True),
+    (True, 1, False),        # TRUE and 1 are different cell values
+    (1, True, False),
+    (0.0, False, False),
+    (None, 0, False),
+    ("1", 1, False),
+    (datetime.datetime(2025, 1, 3), pd.Timestamp(2025, 1, 3), True),
+])
+def test_same_value(old, new, same):
+    assert same_value(old, new) is same
+
+def test_write_columns_rewrites_only_changed_cells(tmp_path):
+    wb = Workbook()
+    ws = wb.active
+    for row, value in enumerate([1, 1, True, 2.5, None], start=1):
+        ws.cell(row, 1, value)
+
+    written = write_columns(ws, 1, {"A": [True, 1.0, True, 2.5, 0]})
+
+    assert written == 2
+    assert written_cells(wb) == {"Sheet": {1: {1, 5}}}
+    path = tmp_path / "book.xlsx"
+    wb.save(path)
+    values = [cell.value for cell in load_workbook(path).active["A"]]
+    assert values == [True, 1, True, 2.5, 0] and values[0] is True
+
+def test_written_floats_are_unchanged_after_a_save(tmp_path):
+    wb = Workbook()
+    write_columns(wb.active, 1, {"A": np.array([5.0, 2.5, 7.0]), "B": pd.Series([True, False, True])})
+    path = tmp_path / "book.xlsx"
+    wb.save(path)
+
+    # 5.0 reads back as the int 5: the next run must not see it as a change
+    wb = load_workbook(path)
+    assert write_columns(wb.active, 1, {"A": np.array([5.0, 2.5, 7.0]), "B": pd.Series([True, False, True])}) == 0
+    assert write_cell(wb.active, 1, 2, 1)
+    assert not write_cell(wb.active, 1, 1, 5.0)
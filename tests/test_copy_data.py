@@ -0,0 +1,36 @@
+import pytest
+from openpyxl import load_workbook
+
+import copy_data
+import sheet_reader
+
+@pytest.fixture
+def open_readers(monkeypatch):
+    """Sheet readers opened and not yet closed during a test."""
+    readers = set()
+    init, close = sheet_reader.SparseSheetReader.__init__, sheet_reader.SparseSheetReader.close
+
+    def tracked_init(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        readers.add(self)
+
+    def tracked_close(self):
+        readers.discard(self)
+        close(self)
+
+    monkeypatch.setattr(sheet_reader.SparseSheetReader, "__init__", tracked_init)
+    monkeypatch.setattr(sheet_reader.SparseSheetReader, "close", tracked_close)
+    return readers
+
+def test_summary_is_closed_after_the_copy(report_config, open_readers):
+    wb = load_workbook(report_config["final_file"])
+    copy_data.process(wb, report_config)
+    assert not open_readers
+
+def test_summary_is_closed_when_a_copy_step_fails(report_config, open_readers):
+    wb = load_workbook(report_config["final_file"])
+    # The header check of the week column fails one row off
+    report_config["header_month1"] += 1
+    with pytest.raises(ValueError, match="Validation failed"):
+        copy_data.process(wb, report_config)
+    assert not open_readers
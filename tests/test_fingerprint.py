@@ -0,0 +1,40 @@
+import json
+
+import fingerprint
+from fingerprint import FingerprintStore, sidecar_path
+
+def test_sidecar_round_trips(tmp_path):
+    draft = tmp_path / "draft.xlsx"
+    draft.write_bytes(b"draft")
+    store = FingerprintStore(str(draft))
+    store.update("Month 1", ["a", "b"])
+    store.save()
+
+    loaded = FingerprintStore.load(str(draft))
+    assert loaded.targets == {"Month 1": ["a", "b"]}
+    assert loaded.changed_rows("Month 1", ["a", "c", "d"]) == {1, 2}
+
+def test_sidecar_of_another_version_is_ignored(tmp_path):
+    draft = tmp_path / "draft.xlsx"
+    draft.write_bytes(b"draft")
+    store = FingerprintStore(str(draft))
+    store.update("Month 1", ["a", "b"])
+    store.save()
+
+    path = sidecar_path(str(draft))
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data["version"] = fingerprint.FINGERPRINT_VERSION - 1
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+    # Hashes of an older scheme cannot be compared with new ones: every row is rewritten
+    assert FingerprintStore.load(str(draft)).targets == {}
+
+def test_sidecar_of_a_changed_draft_is_ignored(tmp_path):
+    draft = tmp_path / "draft.xlsx"
+    draft.write_bytes(b"draft")
+    store = FingerprintStore(str(draft))
+    store.update("Month 1", ["a"])
+    store.save()
+
+    draft.write_bytes(b"edited in Excel")
+    assert FingerprintStore.load(str(draft)).targets == {}
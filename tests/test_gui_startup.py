@@ -0,0 +1,95 @@
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("PyQt6.QtWidgets")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+from PyQt6.QtWidgets import QApplication
+
+from gui import startup_benchmark
+from gui.main_gui import MyApp
+
+@pytest.fixture
+def gui():
+    app = QApplication.instance() or QApplication([])
+    window = MyApp()
+    window.show()
+    app.processEvents()  # First paint; also starts the warm worker
+    yield window
+    window.close()
+    app.processEvents()
+
+def test_only_page_1_is_built_at_startup(gui):
+    assert gui.stackedWidget.currentWidget() is gui.page_1
+    for page in (gui.page_2, gui.page_3, gui.page_4):
+        assert page.children() == []
+    assert not hasattr(gui, "comboBox_week")
+    assert gui.worker.is_alive()
+
+def test_pages_are_built_and_wired_on_first_show(gui):
+    gui.pushButton_Performance.click()
+    assert gui.stackedWidget.currentWidget() is gui.page_2
+    assert gui.pushButton_Performance.isChecked() and not gui.pushButton_Home.isChecked()
+    assert gui.comboBox_week.count() == 6
+    assert gui.label_4.text() == "Complete the Required Data for Weekly Report"
+    assert not gui.spinBox_headerMonth4.isEnabled()
+    gui.checkBox_enableMonth4.setChecked(True)
+    assert gui.spinBox_headerMonth4.isEnabled()
+
+    gui.pushButton_3rdParty.click()
+    assert gui.stackedWidget.currentWidget() is gui.page_4
+    assert gui.page_4.isVisible() and gui.lineEdit_Raw3rdParty.isVisible()
+    gui.lineEdit_Raw3rdParty.setText("raw.xlsx")
+    assert not gui.pushButton_Start3rdParty.isEnabled()
+    gui.lineEdit_Draft3rdParty.setText("draft.xlsx")
+    assert gui.pushButton_Start3rdParty.isEnabled()
+
+    # Building again is a no-op: the connections are not doubled
+    gui.switch_page(gui.page_2, gui.pushButton_Performance)
+    assert gui.comboBox_week.count() == 6
+
+def test_worker_signals_build_their_page(gui):
+    gui.append_log("first line")
+    gui.append_error("bad line")
+    assert gui.textEdit_log.isReadOnly()
+    assert "first line" in gui.textEdit_log.toPlainText() and "bad line" in gui.textEdit_log.toPlainText()
+
+    gui.prefill_month_blocks([{"header": 132, "count": 37}] * 4)
+    assert gui.spinBox_headerMonth1.value() == 132
+    assert gui.checkBox_enableMonth4.isChecked() and not gui.checkBox_enableMonth5.isChecked()
+    assert gui.stackedWidget.currentWidget() is gui.page_1
+
+def test_startup_probe_reports_first_paint():
+    timings = startup_benchmark.run_once([sys.executable, os.path.join(APP_DIR, "main.py")], timeout=60)
+    assert 0 < timings["window_ms"] <= timings["first_paint_ms"]
+    assert timings["launch_to_paint_ms"] >= timings["first_paint_ms"]
+    assert {"page_2_build_ms", "page_3_build_ms", "page_4_build_ms"} <= set(timings)
+
+def test_blocks_past_the_sixth_reach_the_run_config(gui, monkeypatch):
+    from gui import main_gui
+
+    class Popup:
+        def __init__(self, data, on_confirm):
+            pass
+
+        def show_diff(self, text):
+            pass
+
+        def exec(self):
+            return 0
+
+    monkeypatch.setattr(main_gui, "ConfirmationPopup", Popup)
+    blocks = [{"header": 2 + 110 * index, "count": 10 + index} for index in range(8)]
+    gui.prefill_month_blocks(blocks)
+    gui.collect_and_confirm()
+
+    config = gui.new_output_data
+    assert [config[f"header_month{month}"] for month in range(1, 9)] == [block["header"] for block in blocks]
+    assert [config[f"data_count_month{month}"] for month in range(1, 9)] == [block["count"] for block in blocks]
+    assert "header_month9" not in config
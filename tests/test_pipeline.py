@@ -0,0 +1,74 @@
+import os
+
+from openpyxl import load_workbook
+from openpyxl.utils import range_boundaries
+
+import dry_run
+import main_logic
+
+def sheet_values(path):
+    """{sheet: {(row, column): value}} of the non-empty cells of a workbook."""
+    wb = load_workbook(path)
+    values = {ws.title: {(cell.row, cell.column): cell.value
+                         for row in ws.iter_rows() for cell in row if cell.value is not None}
+              for ws in wb.worksheets}
+    # Data rows of every table (its ref less the header row)
+    table_rows = {}
+    for ws in wb.worksheets:
+        for table in ws.tables.values():
+            _, first_row, _, last_row = range_boundaries(table.ref)
+            table_rows[table.name] = last_row - first_row
+    wb.close()
+    return values, table_rows
+
+def changed_cells(before, after):
+    """{sheet: number of cells whose value differs} between two sheet_values() results."""
+    changed = {}
+    for title, cells in after.items():
+        old = before.get(title, {})
+        count = sum(old.get(key) != cells.get(key) for key in old.keys() | cells.keys())
+        if count:
+            changed[title] = count
+    return changed
+
+def test_second_run_does_not_save_the_draft(report_config):
+    main_logic.run_pipeline(report_config)
+    stat = os.stat(report_config["final_file"])
+
+    # With the fingerprints of the first run, and comparing every row
+    main_logic.run_pipeline(report_config)
+    main_logic.run_pipeline({**report_config, "incremental": False})
+
+    assert os.stat(report_config["final_file"]).st_mtime_ns == stat.st_mtime_ns
+    assert os.stat(report_config["final_file"]).st_size == stat.st_size
+
+def test_dry_run_reports_what_the_run_writes(report_config):
+    before, rows_before = sheet_values(report_config["final_file"])
+    diff = dry_run.dry_run(report_config)
+    main_logic.run_pipeline(report_config)
+    after, rows_after = sheet_values(report_config["final_file"])
+
+    assert diff["errors"] == []
+    assert diff["sheets"] == changed_cells(before, after)
+    assert diff["cells"] == sum(diff["sheets"].values()) > 0 and diff["tables"]
+    assert {table["table"]: (table["rows_before"], table["rows_after"]) for table in diff["tables"]} == {
+        name: (rows_before[name], rows) for name, rows in rows_after.items() if rows != rows_before[name]}
+
+def test_dry_run_of_an_edited_draft_reports_the_edits(report_config):
+    main_logic.run_pipeline(report_config)
+    assert dry_run.dry_run(report_config)["cells"] == 0
+
+    wb = load_workbook(report_config["final_file"])
+    ws = wb["Month 2"]
+    edited = next(cell for row in ws.iter_rows(min_row=5) for cell in row if isinstance(cell.value, (int, float)))
+    edited.value += 1
+    wb["ITM Summary"].cell(edited.row, 2).value = "typed over"
+    wb.save(report_config["final_file"])
+
+    before, _ = sheet_values(report_config["final_file"])
+    diff = dry_run.dry_run(report_config)
+    main_logic.run_pipeline({**report_config, "incremental": False})
+    after, _ = sheet_values(report_config["final_file"])
+
+    assert diff["tables"] == []
+    assert diff["sheets"] == changed_cells(before, after) == {"Month 2": 1, "ITM Summary": 1}
@@ -0,0 +1,148 @@
+import os
+import re
+import zipfile
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+import recalc
+from column_writer import write_cell
+from xml_patcher import WORKBOOK_PART, set_full_calc_on_load
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+@pytest.fixture
+def formula_book(tmp_path):
+    """A small Draft-like workbook with formulas, including some outside the supported subset."""
+    wb = Workbook()
+    data = wb.active
+    data.title = "Data"
+    for row, value in enumerate((1, 2, 3), start=1):
+        data.cell(row, 1, value)
+        data.cell(row, 2, f"x{row}")
+    data["C1"] = "=SUM(A1:A3)"
+    data["C2"] = "=A3/$A$2"
+    data["C3"] = "=SUM(A1,2.5)*-2"
+    report = wb.create_sheet("Report")
+    report["A1"] = "=Data!C1*2"
+    report["A2"] = "=VLOOKUP(2,Data!A1:B3,2,FALSE)"
+    report["A3"] = "='Data'!A3&\"-\""
+    report["A4"] = "=IF(Data!A1>1,1,0)"
+    path = tmp_path / "formulas.xlsx"
+    wb.save(path)
+    return str(path)
+
+def test_recalculate_file_stores_values(formula_book):
+    stats = recalc.recalculate_file(formula_book)
+    cached = recalc.read_cached_values(formula_book)
+
+    assert cached[("Data", 1, 3)] == 6
+    assert cached[("Data", 2, 3)] == 1.5
+    assert cached[("Data", 3, 3)] == -7
+    assert cached[("Report", 1, 1)] == 12  # Cross-sheet, through another formula
+    # Outside the subset: no value is made up for them
+    assert [cached[("Report", row, 1)] for row in (2, 3, 4)] == [None, None, None]
+    assert stats["unsupported"] == 3
+    assert stats["unsupported_reasons"] == ["function IF", "function VLOOKUP", "operator &"]
+
+def test_values_match_openpyxl_data_only(formula_book):
+    recalc.recalculate_file(formula_book)
+    wb = load_workbook(formula_book, data_only=True)
+    assert wb["Data"]["C1"].value == 6
+    assert wb["Data"]["C2"].value == 1.5
+    assert wb["Report"]["A1"].value == 12
+
+@pytest.mark.parametrize("name, formulas", [
+    ("Draft_weeklyReport.xlsx", 0),
+    ("Draft_3rdparty.xlsx", 2),
+    ("3rd Party Update 2025_R2 (4).xlsx", 1104),
+])
+def test_bundled_workbooks_match_the_values_excel_cached(name, formulas):
+    path = os.path.join(DATA_DIR, name)
+    cached = recalc.read_cached_values(path)
+    calculator = recalc.Recalculator(load_workbook(path), cached)
+
+    values = calculator.results()
+    assert len(values) == formulas
+    assert calculator.unsupported == 0
+    for key, value in values.items():
+        assert value == pytest.approx(cached[key], rel=1e-12), key
+
+def test_unsupported_formulas_are_recalculated_on_open(formula_book, caplog):
+    # Drop the flag openpyxl writes, to see that the recalculation sets it itself
+    with zipfile.ZipFile(formula_book) as archive:
+        infos = archive.infolist()
+        members = {info.filename: archive.read(info.filename) for info in infos}
+    members[WORKBOOK_PART] = re.sub(rb"<calcPr[^>]*/>", b"", members[WORKBOOK_PART])
+    with zipfile.ZipFile(formula_book, "w") as out:
+        for info in infos:
+            out.writestr(info, members[info.filename])
+
+    recalc.recalculate_file(formula_book)
+
+    workbook = zipfile.ZipFile(formula_book).read(WORKBOOK_PART).decode("utf-8")
+    assert re.search(r'<calcPr[^>]*fullCalcOnLoad="1"', workbook)
+    assert "VLOOKUP" in caplog.text
+
+def test_only_affected_formulas_are_recomputed(formula_book):
+    recalc.recalculate_file(formula_book)
+    cached = recalc.read_cached_values(formula_book)
+
+    wb = load_workbook(formula_book)
+    write_cell(wb["Data"], 3, 1, 10)
+    wb.save(formula_book)
+    stats = recalc.recalculate(wb, formula_book, cached, {"Data": {1: {3}}})
+
+    values = recalc.read_cached_values(formula_book)
+    assert values[("Data", 1, 3)] == 13
+    assert values[("Data", 2, 3)] == 5
+    assert values[("Report", 1, 1)] == 26
+    assert values[("Data", 3, 3)] == -7  # Reads A1 only: cached value kept
+    # SUM, A3/$A$2 and the chained Report!A1 read A3
+    assert stats["recomputed"] == 3
+
+def test_errors_are_stored_as_error_cells(tmp_path):
+    wb = Workbook()
+    ws = wb.active
+    ws["A1"] = 0
+    ws["A2"] = "=1/A1"
+    ws["A3"] = "=A2+1"
+    path = str(tmp_path / "errors.xlsx")
+    wb.save(path)
+
+    recalc.recalculate_file(path)
+
+    assert recalc.read_cached_values(path)[("Sheet", 2, 1)] == recalc.DIV0
+    assert load_workbook(path, data_only=True)["Sheet"]["A3"].value == "#DIV/0!"
+
+@pytest.mark.parametrize("workbook, expected", [
+    ('<workbook><sheets/><calcPr calcId="0" fullCalcOnLoad="0"/></workbook>',
+     '<workbook><sheets/><calcPr calcId="0" fullCalcOnLoad="1"/></workbook>'),
+    ('<workbook><sheets/><calcPr calcId="191029"/></workbook>',
+     '<workbook><sheets/><calcPr calcId="191029" fullCalcOnLoad="1"/></workbook>'),
+    ('<workbook><sheets/><extLst/></workbook>',
+     '<workbook><sheets/><calcPr fullCalcOnLoad="1"/><extLst/></workbook>'),
+    ('<workbook><sheets/></workbook>',
+     '<workbook><sheets/><calcPr fullCalcOnLoad="1"/></workbook>'),
+])
+def test_set_full_calc_on_load(workbook, expected):
+    members = {WORKBOOK_PART: workbook.encode("utf-8")}
+    set_full_calc_on_load(members)
+    assert members[WORKBOOK_PART].decode("utf-8") == expected
+
+def test_text_in_referenced_cells_is_skipped_by_sum(tmp_path):
+    wb = Workbook()
+    ws = wb.active
+    ws["A1"], ws["A2"], ws["A3"] = 5, "-", True
+    ws["B1"] = "=SUM(A1,A2)"
+    ws["B2"] = "=SUM(A2)"
+    ws["B3"] = "=SUM(A1:A3,A3)"
+    ws["B4"] = "=A1+A2"  # Arithmetic still coerces text
+    path = str(tmp_path / "text.xlsx")
+    wb.save(path)
+
+    recalc.recalculate_file(path)
+
+    cached = recalc.read_cached_values(path)
+    assert [cached[("Sheet", row, 2)] for row in range(1, 4)] == [5, 0, 5]
+    assert cached[("Sheet", 4, 2)] == recalc.VALUE
@@ -0,0 +1,42 @@
+import io
+import logging
+
+import pytest
+
+from run_log import RepeatFilter
+
+@pytest.fixture
+def capture():
+    """A logger writing through a RepeatFilter with a limit of 3 into a buffer."""
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.addFilter(RepeatFilter(limit=3))
+    logger = logging.getLogger("draft.test_run_log")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    yield logger, stream
+    logger.removeHandler(handler)
+
+def test_repeated_f_string_calls_are_capped(capture):
+    log, stream = capture
+    for row in range(10):
+        log.info(f"Row {row} written")
+    assert stream.getvalue().splitlines() == [
+        "Row 0 written", "Row 1 written", "Row 2 written",
+        "(further messages like 'Row 3 written' suppressed)",
+    ]
+
+def test_repeated_percent_style_calls_are_capped(capture):
+    log, stream = capture
+    for row in range(5):
+        log.info("Row %d written", row)
+    assert stream.getvalue().splitlines()[-1] == "(further messages like 'Row 3 written' suppressed)"
+    assert len(stream.getvalue().splitlines()) == 4
+
+def test_each_call_site_has_its_own_count(capture):
+    log, stream = capture
+    for row in range(3):
+        log.info(f"Row {row} written")
+        log.info(f"Row {row} written")
+    assert len(stream.getvalue().splitlines()) == 6
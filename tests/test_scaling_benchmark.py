@@ -0,0 +1,23 @@
+import time
+
+import month_engine
+import scaling_benchmark
+
+def test_month_steps_time_compute_and_apply(tmp_path, monkeypatch, capsys):
+    compute = month_engine.compute_month_patch
+
+    def slow_compute(*args):
+        time.sleep(0.05)
+        return compute(*args)
+
+    monkeypatch.setattr(month_engine, "compute_month_patch", slow_compute)
+    result = scaling_benchmark.run_size(60, str(tmp_path))
+
+    steps = {step["step"]: step for step in result["steps"]}
+    assert [name for name in steps if name.startswith("month_")] == [f"month_{month}" for month in range(1, 7)]
+    for month, count in enumerate(result["month_rows"], start=1):
+        assert steps[f"month_{month}"]["rows"] == count
+        assert steps[f"month_{month}"]["wall_s"] >= 0.05
+
+    scaling_benchmark.print_table([result])
+    assert "Proc peak MB" in capsys.readouterr().out
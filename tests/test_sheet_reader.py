@@ -0,0 +1,119 @@
+import datetime
+import re
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from sheet_reader import SparseSheetReader, read_block
+from xlsx_helpers import SHEET_PART, make_shared_formula, read_members, rewrite_member, use_shared_strings
+
+def add_cached_cells(xml):
+    """A shared formula over E1:E3 and an error value in G3, with the values Excel caches for them."""
+    xml = make_shared_formula(xml)
+    return re.sub(r'(<row r="3"[^>]*>.*?)</row>', r'\1<c r="G3" t="e"><v>#DIV/0!</v></c></row>', xml, count=1, flags=re.S)
+
+def use_rich_text(xml):
+    """Store 'MV Beta' as rich text runs, as Excel does once part of a cell is formatted."""
+    return xml.replace("<si><t>MV Beta</t></si>", "<si><r><t>MV </t></r><r><rPr><b/></rPr><t>Beta</t></r></si>")
+
+@pytest.fixture(params=["shared", "inline"])
+def workbook(request, tmp_path):
+    """
+    Sheet 'Data' with text, numbers, dates, booleans, cached formula and
+    error values, an empty row 4 and a lone cell in row 8; its text stored as
+    shared strings (like Excel, including rich text) or inline (like openpyxl).
+    """
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Data"
+    ws.append(["Vessel", "Tonnage", "Loaded", "Done"])
+    ws.append(["MV Alpha", 5500, datetime.datetime(2025, 1, 31), True])
+    ws.append(["MV Beta", 7250.5, datetime.datetime(2025, 2, 1, 6, 30), False])
+    ws["A5"], ws["B5"], ws["D5"] = "Q&A <1>", -12, "MV Alpha"
+    ws["F8"] = 3
+    wb.create_sheet("Other")
+    path = tmp_path / "book.xlsx"
+    wb.save(path)
+    rewrite_member(path, SHEET_PART, add_cached_cells)
+    if request.param == "shared":
+        use_shared_strings(path)
+        rewrite_member(path, "xl/sharedStrings.xml", use_rich_text)
+    return path
+
+def openpyxl_grid(path):
+    """{row: {column: value}} of the non-empty cached values, as openpyxl reads them."""
+    wb = load_workbook(path, data_only=True)
+    grid = {}
+    for row in wb["Data"].iter_rows():
+        for cell in row:
+            if cell.value is not None:
+                grid.setdefault(cell.row, {})[cell.column] = cell.value
+    wb.close()
+    return grid
+
+def test_fixture_has_every_kind_of_value(workbook):
+    grid = openpyxl_grid(workbook)
+    assert grid[2][5] == 11000 and grid[3][7] == "#DIV/0!" and grid[3][1] == "MV Beta"
+    assert 4 not in grid and grid[8] == {6: 3}
+
+def test_rows_match_openpyxl(workbook):
+    grid = openpyxl_grid(workbook)
+    with SparseSheetReader(str(workbook), "Data") as reader:
+        for row in range(1, 10):
+            assert reader.row(row) == grid.get(row, {}), f"row {row}"
+        assert reader.cells_read == sum(len(cells) for cells in grid.values())
+
+def test_columns_match_openpyxl(workbook):
+    grid = openpyxl_grid(workbook)
+    with SparseSheetReader(str(workbook), "Data") as reader:
+        values, rows = reader.columns([7, 1, 3, 5, 2])
+    assert rows == 8
+    assert sorted(values) == [1, 2, 3, 5, 7]
+    for column, cells in values.items():
+        assert cells == [grid.get(row, {}).get(column) for row in range(1, 9)], f"column {column}"
+
+def test_columns_up_to_a_given_row(workbook):
+    with SparseSheetReader(str(workbook), "Data") as reader:
+        values, rows = reader.columns([1, 6], last_row=10)
+    assert rows == 10
+    assert values[1] == ["Vessel", "MV Alpha", "MV Beta", None, "Q&A <1>", None, None, None, None, None]
+    assert values[6] == [None] * 7 + [3, None, None]
+
+def test_single_cells_and_column_ranges(workbook):
+    with SparseSheetReader(str(workbook), "Data") as reader:
+        assert reader.value("C3") == datetime.datetime(2025, 2, 1, 6, 30)
+        assert reader.value("D2") is True and reader.value("D3") is False
+        assert reader.value("E2") == 11000 and reader.value("G3") == "#DIV/0!"
+        assert reader.value("A4") is None and reader.value("A40") is None
+        assert reader.column("B", 1, 6) == ["Tonnage", 5500, 7250.5, None, -12, None]
+
+def test_read_block_matches_pandas(workbook):
+    frame = pd.read_excel(workbook, sheet_name="Data", header=None, dtype=object)
+    expected = [[None if pd.isna(value) else value for value in row] for row in frame.values.tolist()]
+    block = read_block(str(workbook), "Data", 1, 8, 1, 7)
+    # Error values are kept as openpyxl returns them; pandas turns them into NaN
+    assert block[2][6] == "#DIV/0!" and expected[2][6] is None
+    block[2][6] = None
+    assert block == expected
+    # A window of the sheet
+    assert read_block(str(workbook), "Data", 2, 3, 2, 4) == [row[1:4] for row in expected[1:3]]
+
+def test_reads_the_sheet_only_up_to_the_rows_asked_for(tmp_path):
+    wb = Workbook()
+    ws = wb.active
+    for number in range(1, 20001):
+        ws.append([number, f"vessel {number}", number * 1.5])
+    path = tmp_path / "long.xlsx"
+    wb.save(path)
+    size = len(read_members(path)[1]["xl/worksheets/sheet1.xml"])
+
+    with SparseSheetReader(str(path), "Sheet") as reader:
+        assert reader.row(3) == {1: 3, 2: "vessel 3", 3: 4.5}
+        assert reader.bytes_read < size / 4
+        assert reader.value("B20000") == "vessel 20000"
+        assert reader.bytes_read == size
+
+def test_missing_sheet(workbook):
+    with pytest.raises(KeyError, match="Missing"):
+        SparseSheetReader(str(workbook), "Missing")
@@ -0,0 +1,96 @@
+import datetime
+import re
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+import month_engine
+import ongoing_month
+import scaling_benchmark
+import summary_reader
+from summary_reader import SUMMARY_SHEET, SummaryReader
+from xlsx_helpers import SHEET_PART, rewrite_member, use_shared_strings
+
+COLUMNS = {"No.", "Vessel", "ETA/ATA", "TM (AR)", "Buyer"}
+
+def read_excel_frame(path, header, rows=None, columns=None):
+    """
+    pd.read_excel of a block (types inferred from the block alone), with the
+    declared summary types. pandas drops blank rows at the end of an nrows
+    read, so the blocks compared here end on a data row.
+    """
+    frame = pd.read_excel(path, sheet_name=SUMMARY_SHEET, header=header, nrows=rows)
+    if columns is not None:
+        frame = frame[[label for label in frame.columns if isinstance(label, str) and label.strip() in columns]]
+    return summary_reader._apply_dtypes(frame)
+
+def add_cached_cells(xml):
+    """Cached values of a shared formula in column F and an error value in A7."""
+    xml = re.sub(r'<c r="F4"[^>]*?(?:/>|>.*?</c>)', '<c r="F4"><f t="shared" ref="F4:F5" si="0">B4*0</f><v>9.5</v></c>', xml, count=1)
+    xml = re.sub(r'<c r="F5"[^>]*?(?:/>|>.*?</c>)', '<c r="F5"><f t="shared" si="0"/><v>11</v></c>', xml, count=1)
+    return re.sub(r'<c r="A7"[^>]*?(?:/>|>.*?</c>)', '<c r="A7" t="e"><v>#N/A</v></c>', xml, count=1)
+
+@pytest.fixture(params=["shared", "inline"])
+def small_summary(request, tmp_path):
+    """
+    One block under a title: repeated and blank header cells, an empty row
+    inside the block, dates, numbers stored as text, cached formula and error
+    values; text as shared strings (like Excel) or inline (like openpyxl).
+    """
+    wb = Workbook()
+    ws = wb.active
+    ws.title = SUMMARY_SHEET
+    ws["A1"] = "ITM shipments"
+    ws.append([])
+    ws.append(["No.", " Vessel ", None, "Vessel", "ETA/ATA", "TM (AR)", "Buyer", "Remarks"])
+    ws.append([1, "MV Alpha", "x", "dup", datetime.datetime(2025, 1, 3), 0, "PLN", "ok"])
+    ws.append([2, "MV Beta", None, None, datetime.datetime(2025, 1, 9, 12), 0, "Tata", None])
+    ws.append([])
+    ws.append([0, "MV Gamma", None, None, "TBA", "12.5", "PLN", 7])
+    ws.append([4, "MV Delta", None, None, None, 14, None, "late"])
+    path = tmp_path / "summary.xlsx"
+    wb.save(path)
+    rewrite_member(path, SHEET_PART, add_cached_cells)
+    if request.param == "shared":
+        use_shared_strings(path)
+    return path
+
+def test_small_summary_matches_read_excel(small_summary):
+    reader = SummaryReader(str(small_summary), columns=COLUMNS)
+    for rows in (None, 2, 5):
+        frame = reader.frame(2, rows)
+        pd.testing.assert_frame_equal(frame, read_excel_frame(small_summary, 2, rows, COLUMNS))
+    assert reader.parse_count == 1
+    reader.close()
+
+def test_every_column_matches_read_excel(small_summary):
+    reader = SummaryReader(str(small_summary))
+    pd.testing.assert_frame_equal(reader.frame(2), read_excel_frame(small_summary, 2))
+    pd.testing.assert_frame_equal(reader.frame(2, 4), read_excel_frame(small_summary, 2, 4))
+
+def test_declared_types(small_summary):
+    frame = SummaryReader(str(small_summary), columns=COLUMNS).frame(2, 2)
+    assert list(frame.columns) == ["No.", " Vessel ", "Vessel", "ETA/ATA", "TM (AR)", "Buyer"]
+    assert frame["Buyer"].dtype == "category"
+    assert frame["TM (AR)"].tolist() == [9.5, 11.0] and frame["TM (AR)"].dtype == "float64"
+    assert pd.api.types.is_datetime64_any_dtype(frame["ETA/ATA"])
+    # 'TBA' keeps the date column of the whole sheet as objects
+    assert SummaryReader(str(small_summary), columns=COLUMNS).frame(2)["ETA/ATA"].dtype == object
+
+@pytest.fixture
+def benchmark_summary(tmp_path):
+    rows = scaling_benchmark.month_rows(90)
+    path = tmp_path / "summary.xlsx"
+    headers = scaling_benchmark.build_summary(str(path), rows)
+    return path, list(zip(headers, rows))
+
+def test_month_blocks_match_read_excel(benchmark_summary):
+    path, blocks = benchmark_summary
+    columns = {*ongoing_month.summary_columns(), *month_engine.summary_columns()}
+    reader = SummaryReader(str(path), columns=columns)
+    for header, count in blocks:
+        pd.testing.assert_frame_equal(reader.frame(header, count), read_excel_frame(path, header, count, columns))
+    # Every block comes from the one parse of the sheet
+    assert reader.parse_count == 1
+    reader.close()
@@ -0,0 +1,143 @@
+import importlib
+import json
+import os
+import re
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from xlsx_helpers import SHEET_PART, rewrite_member
+
+third_party = importlib.import_module("3rd_party")
+
+# Two raw rows over two months: raw D/F are Plan, E/G Actual
+MAPPING = {
+    "version": 1,
+    "source_sheet": "YTD",
+    "target_sheet": "3rd Party",
+    "plan_columns": ["D", "F"],
+    "actual_columns": ["E", "G"],
+    "target_column_plan": "E",
+    "target_column_actual": "F",
+    "rows": [{"source_row": 5, "target_start_row": 3}, {"source_row": 6, "target_start_row": 15}],
+}
+
+def make_raw(path, rows):
+    """Raw update file: {raw row: [D, E, F, G]} on sheet 'YTD'."""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "YTD"
+    ws["A1"] = "3rd Party Update"
+    for row, values in rows.items():
+        for column, value in enumerate(values, start=4):
+            ws.cell(row=row, column=column, value=value)
+    wb.save(path)
+    return str(path)
+
+def make_draft(path, cells=None):
+    """Draft with sheet '3rd Party', labels in column D and the given {coordinate: value}."""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "3rd Party"
+    for row in range(3, 17):
+        ws.cell(row=row, column=4, value=f"line {row}")
+    for coordinate, value in (cells or {}).items():
+        ws[coordinate] = value
+    wb.save(path)
+    return str(path)
+
+def cache_formula(path, coordinate, value):
+    """Give the formula openpyxl wrote in a cell the value Excel would have cached for it."""
+    rewrite_member(path, SHEET_PART, lambda xml: re.sub(rf'(<c r="{coordinate}"><f>[^<]*</f>)<v ?/>', rf"\g<1><v>{value}</v>", xml))
+
+def draft_cells(path):
+    ws = load_workbook(path)["3rd Party"]
+    return {f"{column}{row}": ws[f"{column}{row}"].value for column in "EF" for row in (3, 4, 15, 16)}
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_batch_merges_the_cells_each_raw_file_fills(tmp_path, workers):
+    first = make_raw(tmp_path / "update 1.xlsx", {5: [10, 11, 12, 13]})
+    # The later file fills row 6 and only the first month Plan of row 5
+    second = make_raw(tmp_path / "update 2.xlsx", {5: [20, None, None, None], 6: [30, 31, 32, 33]})
+    draft = make_draft(tmp_path / "draft.xlsx")
+
+    stats = third_party.move_data_batch([first, second], [draft], workers=workers, mapping=MAPPING)
+
+    assert draft_cells(draft) == {"E3": 20, "E4": 12, "E15": 30, "E16": 32,
+                                  "F3": 11, "F4": 13, "F15": 31, "F16": 33}
+    assert stats["cells"] == 8 and stats["saved"] == 1
+
+def test_batch_fills_0_where_no_raw_file_has_data(tmp_path):
+    first = make_raw(tmp_path / "update 1.xlsx", {5: [10, None, 12, None]})
+    second = make_raw(tmp_path / "update 2.xlsx", {6: [None, 31, None, None]})
+    draft = make_draft(tmp_path / "draft.xlsx")
+
+    third_party.move_data_batch([first, second], [draft], workers=1, mapping=MAPPING)
+
+    assert draft_cells(draft) == {"E3": 10, "E4": 12, "E15": 0, "E16": 0,
+                                  "F3": 0, "F4": 0, "F15": 31, "F16": 0}
+
+def write_mapping(path, **changes):
+    path.write_text(json.dumps({**MAPPING, **changes}), encoding="utf-8")
+    return path
+
+def test_bundled_mapping_loads():
+    mapping = third_party.load_mapping()
+    assert mapping["version"] == third_party.MAPPING_VERSION
+    assert len(list(third_party.cell_pairs(mapping))) == 480
+
+def test_mapping_of_another_version_is_refused(tmp_path):
+    assert third_party.load_mapping(write_mapping(tmp_path / "mapping.json")) == MAPPING
+    with pytest.raises(ValueError, match="mapping version 2, expected 1"):
+        third_party.load_mapping(write_mapping(tmp_path / "mapping.json", version=2))
+    with pytest.raises(ValueError, match="mapping version None"):
+        third_party.load_mapping(write_mapping(tmp_path / "mapping.json", version=None))
+    with pytest.raises(ValueError, match="differ in length"):
+        third_party.load_mapping(write_mapping(tmp_path / "mapping.json", actual_columns=["E"]))
+
+def test_extract_cells_reads_the_values_excel_cached(tmp_path):
+    raw = make_raw(tmp_path / "update.xlsx", {5: ["=20946-5300", 11, None, 13], 6: [30, 31, 32.5, None]})
+    cache_formula(raw, "D5", 15646)
+    # Sheet and mapping as the raw file has them; a formula is read as its cached value, an empty cell as 0
+    assert third_party.extract_cells(raw, mapping=MAPPING) == {
+        "E3": 15646, "E4": 0, "E15": 30, "E16": 32.5,
+        "F3": 11, "F4": 13, "F15": 31, "F16": 0,
+    }
+
+def test_diff_cells_keeps_only_the_changed_cells(tmp_path):
+    draft = make_draft(tmp_path / "draft.xlsx", {"E3": 10, "E4": 12, "F3": "11", "F4": "=6+7", "E15": True, "F15": 31.0})
+    cells = {"E3": 10, "E4": 0, "E15": 1, "E16": 0, "F3": 11, "F4": 13, "F15": 31, "F16": 0}
+
+    # An empty Draft cell differs from 0, text or TRUE from a number, a formula
+    # without a cached value from anything; 31.0 and 31 are the same number
+    assert third_party.diff_cells(draft, "3rd Party", cells, MAPPING) == {
+        "E4": 0, "E15": 1, "E16": 0, "F3": 11, "F4": 13, "F16": 0,
+    }
+
+    cache_formula(draft, "F4", 13)
+    assert "F4" not in third_party.diff_cells(draft, "3rd Party", cells, MAPPING)
+
+def test_update_draft_writes_only_the_changed_cells(tmp_path):
+    draft = make_draft(tmp_path / "draft.xlsx", {"E3": 10, "F3": 11})
+    cells = {"E3": 10, "E4": 12, "E15": 30, "E16": 32, "F3": 11, "F4": 13, "F15": 31, "F16": 33}
+
+    assert third_party.update_draft(draft, "3rd Party", cells, MAPPING) == 6
+    assert draft_cells(draft) == cells
+    # The rest of the sheet is kept
+    assert load_workbook(draft)["3rd Party"]["D16"].value == "line 16"
+
+def test_unchanged_draft_is_neither_loaded_nor_saved(tmp_path, monkeypatch):
+    raw = make_raw(tmp_path / "update.xlsx", {5: [10, 11, 12, 13], 6: [30, 31, 32, 33]})
+    draft = make_draft(tmp_path / "draft.xlsx")
+    assert third_party.move_data(raw, draft, mapping=MAPPING) == 8
+    modified = os.stat(draft).st_mtime_ns
+
+    def fail(*args, **kwargs):
+        raise AssertionError("an unchanged Draft should not be loaded or saved")
+
+    monkeypatch.setattr(third_party, "load_workbook", fail)
+    monkeypatch.setattr(third_party, "save_workbook", fail)
+    assert third_party.move_data(raw, draft, mapping=MAPPING) == 0
+    stats = third_party.move_data_batch([raw, raw], [draft, draft], workers=1, mapping=MAPPING)
+    assert stats["cells"] == 0 and stats["saved"] == 0
+    assert os.stat(draft).st_mtime_ns == modified
@@ -0,0 +1,123 @@
+import json
+import os
+import sys
+import time
+
+import pytest
+
+pytest.importorskip("PyQt6.QtCore")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+from PyQt6.QtCore import QCoreApplication, QProcess
+from PyQt6.QtTest import QTest
+
+from gui.process import WarmProcessWorker
+
+WORKER_SCRIPT = os.path.join(APP_DIR, "logic", "worker.py")
+
+def wait_until(condition, timeout: float = 120):
+    """Run the Qt event loop until condition() holds."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for the worker"
+        QTest.qWait(20)
+
+@pytest.fixture
+def worker():
+    app = QCoreApplication.instance() or QCoreApplication([])
+    worker = WarmProcessWorker(WORKER_SCRIPT)
+    events = {"log": [], "error": [], "progress": [], "finished": [], "ready": 0, "diff": []}
+    worker.log.connect(events["log"].append)
+    worker.error.connect(events["error"].append)
+    worker.progress.connect(lambda step, state: events["progress"].append((step, state)))
+    worker.finished.connect(events["finished"].append)
+    worker.diff.connect(events["diff"].append)
+    worker.ready.connect(lambda: events.__setitem__("ready", events["ready"] + 1))
+    worker.events = events
+    worker.start()
+    wait_until(lambda: events["ready"] == 1)
+    yield worker
+    worker.stop()
+    app.processEvents()
+
+def _config_file(config: dict, tmp_path) -> str:
+    path = tmp_path / "inputan.json"
+    path.write_text(json.dumps(config), encoding="utf-8")
+    return str(path)
+
+def test_run_streams_logs_and_progress(worker, report_config, tmp_path):
+    worker.run(_config_file(report_config, tmp_path))
+    assert worker.busy
+    wait_until(lambda: worker.events["finished"])
+
+    assert worker.events["finished"] == [0]
+    assert not worker.busy
+    assert ("Process add_row", "started") in worker.events["progress"]
+    assert ("Process add_row", "finished") in worker.events["progress"]
+    assert any("Execution completed" in line for line in worker.events["log"])
+    # A second run reuses the same process
+    pid = worker.process.processId()
+    worker.run(_config_file(report_config, tmp_path))
+    wait_until(lambda: len(worker.events["finished"]) == 2)
+    assert worker.events["finished"] == [0, 0]
+    assert worker.process.processId() == pid
+
+def test_dry_run_answers_with_a_diff(worker, report_config):
+    worker.dry_run(report_config)
+    wait_until(lambda: worker.events["diff"])
+    assert worker.events["diff"][0].startswith("Dry run")
+    assert "cell(s) would change" in worker.events["diff"][0]
+    assert not worker.events["finished"]  # A dry run is not a run
+
+def test_only_the_latest_dry_run_is_answered(worker, report_config, tmp_path):
+    worker.dry_run(report_config)
+    worker.dry_run(report_config)
+    # Requests are served in order: once the run is done, both dry runs have been answered
+    worker.run(_config_file(report_config, tmp_path))
+    wait_until(lambda: worker.events["finished"])
+    assert len(worker.events["diff"]) == 1
+
+def test_cancelled_dry_run_is_dropped(worker, report_config, tmp_path):
+    worker.dry_run(report_config)
+    worker.cancel_dry_run()  # The popup was closed before the answer came
+    worker.run(_config_file(report_config, tmp_path))
+    wait_until(lambda: worker.events["finished"])
+    assert worker.events["diff"] == []
+
+def test_busy_worker_refuses_a_second_run(worker, report_config, tmp_path):
+    config_path = _config_file(report_config, tmp_path)
+    worker.run(config_path)
+    worker.run(config_path)
+    assert "Process is still running." in worker.events["error"]
+    wait_until(lambda: worker.events["finished"])
+    assert worker.events["finished"] == [0]
+
+def test_crash_mid_run_fails_the_run_and_restarts(worker, report_config, tmp_path):
+    config_path = _config_file(report_config, tmp_path)
+    crashed_pid = worker.process.processId()
+    worker.progress.connect(lambda step, state: worker.process.kill() if worker.process.processId() == crashed_pid else None)
+    worker.run(config_path)
+    wait_until(lambda: worker.events["finished"])
+
+    assert worker.events["finished"] == [-1]
+    assert any("stopped unexpectedly" in line for line in worker.events["error"])
+    assert not worker.busy
+    # A fresh worker was started and serves the next run
+    wait_until(lambda: worker.events["ready"] == 2)
+    assert worker.process.processId() != crashed_pid
+    worker.run(config_path)
+    wait_until(lambda: len(worker.events["finished"]) == 2)
+    assert worker.events["finished"] == [-1, 0]
+
+def test_shutdown_stops_without_a_restart(worker):
+    process = worker.process
+    worker.stop()
+    assert process.state() == QProcess.ProcessState.NotRunning
+    assert process.exitStatus() == QProcess.ExitStatus.NormalExit and process.exitCode() == 0
+    QTest.qWait(200)
+    assert worker.process is process and not worker.is_alive()
+    assert not worker.events["finished"] and not worker.events["error"]
@@ -0,0 +1,113 @@
+import datetime
+import re
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook, load_workbook
+
+import xml_patcher
+from xlsx_helpers import SHEET_PART, has_shared_strings, make_shared_formula, read_members, rewrite_member, use_shared_strings
+
+@pytest.fixture(params=["shared", "inline"])
+def workbook(request, tmp_path):
+    """
+    Sheet 'Data' with text, numbers, a dated cell and sparse rows 1, 2 and 6,
+    its text stored as shared strings (like Excel) or inline (like openpyxl).
+    """
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Data"
+    ws["A1"], ws["B1"], ws["C1"] = "Vessel", "Tonnage", "Loaded"
+    ws["A2"], ws["B2"] = "MV Alpha", 5500
+    ws["C2"].number_format = "yyyy-mm-dd"
+    ws["D6"] = "far"
+    path = tmp_path / "book.xlsx"
+    wb.save(path)
+    if request.param == "shared":
+        use_shared_strings(path)
+    return path
+
+def cell_values(path, sheet="Data"):
+    wb = load_workbook(path)
+    values = {cell.coordinate: cell.value for row in wb[sheet].iter_rows() for cell in row if cell.value is not None}
+    wb.close()
+    return values
+
+PATCH = {
+    (1, 4): "Remarks",                       # New string in an existing row
+    (2, 1): "MV Beta",                       # Replaces a string
+    (2, 3): datetime.datetime(2025, 3, 14),  # Dated cell keeps its number format
+    (4, 2): 7250.5,                          # New row between sparse rows
+    (6, 1): "Vessel",                        # Reuses an existing string
+    (9, 2): 12,                              # New row after the last one
+}
+
+EXPECTED = {
+    "A1": "Vessel", "B1": "Tonnage", "C1": "Loaded", "D1": "Remarks",
+    "A2": "MV Beta", "B2": 5500, "C2": datetime.datetime(2025, 3, 14),
+    "B4": 7250.5,
+    "A6": "Vessel", "D6": "far",
+    "B9": 12,
+}
+
+def test_fixture_reads_back(workbook):
+    assert cell_values(workbook) == {"A1": "Vessel", "B1": "Tonnage", "C1": "Loaded",
+                                     "A2": "MV Alpha", "B2": 5500, "D6": "far"}
+
+def test_patch_round_trips_through_openpyxl_and_pandas(workbook, tmp_path):
+    out = tmp_path / "out.xlsx"
+    stats = xml_patcher.patch_workbook(str(workbook), str(out), {"Data": PATCH})
+
+    assert stats == {"sheets": 1, "cells": len(PATCH), "tables": 0}
+    assert cell_values(out) == EXPECTED
+
+    frame = pd.read_excel(out, sheet_name="Data", header=None)
+    assert frame.shape == (9, 4)
+    assert frame.iloc[1, 0] == "MV Beta" and frame.iloc[0, 3] == "Remarks"
+    assert frame.iloc[3, 1] == 7250.5 and frame.iloc[8, 1] == 12
+    assert frame.iloc[1, 2] == pd.Timestamp(2025, 3, 14)
+    assert frame.iloc[[2, 4, 6, 7]].isna().all().all()
+
+def test_shared_strings_are_extended_not_rewritten(workbook, tmp_path):
+    if not has_shared_strings(workbook):
+        pytest.skip("text is stored inline")
+    out = tmp_path / "out.xlsx"
+    xml_patcher.patch_workbook(str(workbook), str(out), {"Data": PATCH})
+    _, before = read_members(workbook)
+    _, after = read_members(out)
+    old = xml_patcher.SharedStrings(before[xml_patcher.SHARED_STRINGS_PART].decode("utf-8"))
+    new = xml_patcher.SharedStrings(after[xml_patcher.SHARED_STRINGS_PART].decode("utf-8"))
+    sheet = after[SHEET_PART].decode("utf-8")
+
+    # Existing indexes stay valid; only the new texts are appended
+    assert new.items[:len(old.items)] == old.items
+    assert [text for text in new.index if text not in old.index] == ["Remarks", "MV Beta"]
+    assert "inlineStr" not in sheet
+    references = sheet.count('t="s"')
+    assert re.search(rf'\bcount="{references}"', new.xml)
+    assert re.search(rf'\buniqueCount="{len(new.items)}"', new.xml)
+
+def test_text_stays_inline_without_a_shared_string_table(workbook, tmp_path):
+    if has_shared_strings(workbook):
+        pytest.skip("text is stored as shared strings")
+    out = tmp_path / "out.xlsx"
+    xml_patcher.patch_workbook(str(workbook), str(out), {"Data": PATCH})
+    assert not has_shared_strings(out)
+    assert 't="s"' not in read_members(out)[1][SHEET_PART].decode("utf-8")
+
+def test_shared_formula_master_is_not_overwritten(workbook, tmp_path):
+    rewrite_member(workbook, SHEET_PART, make_shared_formula)
+    assert load_workbook(workbook)["Data"]["E2"].value == "=B2*2"
+
+    out = tmp_path / "out.xlsx"
+    with pytest.raises(ValueError, match=r"'Data'.*E1 .*E1:E3"):
+        xml_patcher.patch_workbook(str(workbook), str(out), {"Data": {(2, 1): "MV Beta", (1, 5): 1}})
+    assert not out.exists()
+
+def test_shared_formula_dependents_can_be_overwritten(workbook, tmp_path):
+    rewrite_member(workbook, SHEET_PART, make_shared_formula)
+    out = tmp_path / "out.xlsx"
+    xml_patcher.patch_workbook(str(workbook), str(out), {"Data": {(2, 5): 99}})
+
+    ws = load_workbook(out)["Data"]
+    assert ws["E1"].value == "=B1*2" and ws["E2"].value == 99
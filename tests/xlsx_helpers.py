@@ -0,0 +1,58 @@
+"""Helpers that edit the parts of generated xlsx fixtures the way Excel would have written them."""
+import re
+import zipfile
+
+import xml_patcher
+
+SHEET_PART = "xl/worksheets/sheet1.xml"
+
+def read_members(path):
+    with zipfile.ZipFile(path) as archive:
+        infos = archive.infolist()
+        return infos, {info.filename: archive.read(info.filename) for info in infos}
+
+def rewrite_member(path, part, change):
+    """Apply change(text) -> text to one member of an xlsx file."""
+    infos, members = read_members(path)
+    members[part] = change(members[part].decode("utf-8")).encode("utf-8")
+    xml_patcher.write_package(infos, members, str(path))
+
+def use_shared_strings(path):
+    """Move the inline strings openpyxl writes into a shared string table, the way Excel stores text."""
+    infos, members = read_members(path)
+    texts = []
+
+    def shared(match):
+        if match.group(3) not in texts:
+            texts.append(match.group(3))
+        return f'<c r="{match.group(1)}"{match.group(2) or ""} t="s"><v>{texts.index(match.group(3))}</v></c>'
+
+    sheet = re.sub(r'<c r="([A-Z]+\d+)"( s="\d+")? t="inlineStr"><is><t>([^<]*)</t></is></c>', shared,
+                   members[SHEET_PART].decode("utf-8"))
+    references = sheet.count('t="s"')
+    members[SHEET_PART] = sheet.encode("utf-8")
+    members[xml_patcher.SHARED_STRINGS_PART] = (
+        '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        f'count="{references}" uniqueCount="{len(texts)}">'
+        + "".join(f"<si><t>{text}</t></si>" for text in texts) + "</sst>"
+    ).encode("utf-8")
+    infos.append(zipfile.ZipInfo(xml_patcher.SHARED_STRINGS_PART))
+    members[xml_patcher.WORKBOOK_RELS_PART] = members[xml_patcher.WORKBOOK_RELS_PART].replace(
+        b"</Relationships>",
+        b'<Relationship Id="rIdStrings" Target="sharedStrings.xml" '
+        b'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings"/></Relationships>')
+    members[xml_patcher.CONTENT_TYPES_PART] = members[xml_patcher.CONTENT_TYPES_PART].replace(
+        b"</Types>",
+        b'<Override PartName="/xl/sharedStrings.xml" '
+        b'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/></Types>')
+    xml_patcher.write_package(infos, members, str(path))
+
+def has_shared_strings(path):
+    return xml_patcher.SHARED_STRINGS_PART in read_members(path)[1]
+
+def make_shared_formula(xml):
+    """Share the formula of E1 (=B1*2) over E1:E3, as Excel writes a filled-down column."""
+    xml = re.sub(r'(<row r="1"[^>]*>.*?)</row>',
+                 r'\1<c r="E1"><f t="shared" ref="E1:E3" si="0">B1*2</f><v>0</v></c></row>', xml, count=1, flags=re.S)
+    return re.sub(r'(<row r="2"[^>]*>.*?)</row>',
+                  r'\1<c r="E2"><f t="shared" si="0"/><v>11000</v></c></row>', xml, count=1, flags=re.S)